@@ -0,0 +1,23 @@
+import os
+import numpy as np
+import pytest
+
+from tsp_solver.distance import DistanceMatrix
+from tsp_solver.loader import nodesFromCoordinates, read_tsp
+
+TSP_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "TSP_files")
+
+
+def randomCoordinates(city_count,seed=0):
+    return np.random.default_rng(seed).uniform(0, 1000, (city_count, 2))
+
+@pytest.fixture
+def small_instance():
+    # 9 random cities, small enough to check every move of a route.
+    coordinates = randomCoordinates(9)
+    return nodesFromCoordinates(coordinates),DistanceMatrix.from_coordinates(coordinates)
+
+@pytest.fixture(scope="session")
+def kroA100():
+    node_list = read_tsp(os.path.join(TSP_DIR, "kroA100.tsp"))
+    return node_list,DistanceMatrix(node_list)
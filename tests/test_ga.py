@@ -0,0 +1,65 @@
+import random
+import numpy as np
+import pytest
+
+from tsp_solver.ga import generate_GA, initiatePopulation
+from tsp_solver.generational import generate_generational_GA
+from tsp_solver.recorder import ConvergenceRecorder
+from tsp_solver.routes import calculateFitness
+from tsp_solver.stopping import StoppingCondition
+
+
+def population(kroA100,seed=1,size=12):
+    node_list,distance_matrix = kroA100
+    random.seed(seed)
+    return initiatePopulation(0.2,size,node_list,distance_matrix)
+
+@pytest.mark.parametrize("crossover_operator,mutation_operator", [("OX", "IVM"), ("OX", "RM"), ("SCX", "ISM"), ("SCX", "SM")])
+def test_generational_ga(kroA100,crossover_operator,mutation_operator):
+    node_list,distance_matrix = kroA100
+    routes,distances = population(kroA100)
+    random.seed(2)
+    df,history,route = generate_generational_GA(routes,distances,crossover_operator,mutation_operator,30,distance_matrix,
+                                                return_route=True)
+    assert sorted(route.tolist()) == list(range(len(node_list)))
+    assert calculateFitness(route,distance_matrix) == history["best_solution"].iloc[-1] <= min(distances)
+    # Truncation selection keeps the best individual, the best solution never gets worse.
+    assert (np.diff(history["best_solution"].to_numpy()) <= 0).all()
+    assert history["iteration"].tolist() == list(range(31))
+
+def test_generational_ga_processes(kroA100):
+    node_list,distance_matrix = kroA100
+    routes,distances = population(kroA100)
+    results = []
+    for processes in (1, 2):
+        random.seed(3)
+        df,history,route = generate_generational_GA(routes,distances,"OX","IVM",20,distance_matrix,chunk_size=4,
+                                                    processes=processes,return_route=True)
+        results.append((history["best_solution"].tolist(),route.tolist()))
+    assert results[0] == results[1]
+
+def test_generational_ga_stopping(kroA100):
+    node_list,distance_matrix = kroA100
+    routes,distances = population(kroA100)
+    stopping = StoppingCondition(max_evaluations=50)
+    df,history = generate_generational_GA(routes,distances,"OX","IVM",None,distance_matrix,offspring_count=10,
+                                          stopping=stopping)
+    assert stopping.reason == "evaluations"
+    assert history["iteration"].iloc[-1] == 4
+    with pytest.raises(ValueError):
+        generate_generational_GA(routes,distances,"OX","IVM",None,distance_matrix)
+
+def test_ga_without_history(kroA100):
+    # With a recorder the history is off by default and the tables are NumPy arrays.
+    node_list,distance_matrix = kroA100
+    routes,distances = population(kroA100)
+    records = []
+    random.seed(4)
+    df,history = generate_GA(list(routes),list(distances),"OX","IVM",1200,distance_matrix,
+                             recorder=ConvergenceRecorder(callback=records.append,interval=100))
+    assert isinstance(history, np.ndarray) and history.shape == (1, 4)
+    assert df.tolist() == [[1000, records[10][3]]]
+    random.seed(4)
+    df,full_history = generate_GA(list(routes),list(distances),"OX","IVM",1200,distance_matrix)
+    assert len(full_history) == 1201
+    assert full_history["best_solution"].iloc[-1] == history[0, 1]
@@ -0,0 +1,75 @@
+import math
+import os
+import shutil
+import numpy as np
+import pytest
+
+from tsp_solver.loader import load_tsp, load_tsp_arrays, parse_tsp
+
+from .conftest import TSP_DIR
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def test_display_data_after_node_coordinates():
+    # The display data is read past (it has no -1) and the later sections are still parsed.
+    header,coordinates,explicit_matrix = parse_tsp(os.path.join(FIXTURES, "coords_display.tsp"))
+    assert header["DIMENSION"] == "5"
+    assert coordinates.tolist() == [[0, 0], [30, 0], [30, 40], [0, 40], [15, 20]]
+    assert explicit_matrix is not None
+    assert explicit_matrix[0].tolist() == [0, 30, 50, 40, 25]
+    assert (explicit_matrix == explicit_matrix.T).all()
+    assert np.diag(explicit_matrix).tolist() == [0] * 5
+
+def explicitSection(matrix,edge_weight_format):
+    # The numbers of the EDGE_WEIGHT_SECTION in the order of the format, written from their definition.
+    n = len(matrix)
+    orders = {"FULL_MATRIX": [(i, j) for i in range(n) for j in range(n)],
+              "UPPER_ROW": [(i, j) for i in range(n) for j in range(i+1, n)],
+              "LOWER_ROW": [(i, j) for i in range(n) for j in range(i)],
+              "UPPER_DIAG_ROW": [(i, j) for i in range(n) for j in range(i, n)],
+              "LOWER_DIAG_ROW": [(i, j) for i in range(n) for j in range(i+1)],
+              "UPPER_COL": [(i, j) for j in range(n) for i in range(j)],
+              "LOWER_COL": [(i, j) for j in range(n) for i in range(j+1, n)],
+              "UPPER_DIAG_COL": [(i, j) for j in range(n) for i in range(j+1)],
+              "LOWER_DIAG_COL": [(i, j) for j in range(n) for i in range(j, n)]}
+    return [int(matrix[i, j]) for i,j in orders[edge_weight_format]]
+
+def writeExplicitFile(file_name,matrix,edge_weight_format):
+    numbers = explicitSection(matrix,edge_weight_format)
+    with open(file_name, "w") as file:
+        file.write(f"NAME : explicit\nTYPE : TSP\nDIMENSION : {len(matrix)}\nEDGE_WEIGHT_TYPE : EXPLICIT\n")
+        file.write(f"EDGE_WEIGHT_FORMAT : {edge_weight_format}\nEDGE_WEIGHT_SECTION\n")
+        # 4 numbers per line, so the lines don't follow the rows of the matrix.
+        for start in range(0, len(numbers), 4):
+            file.write(" ".join(map(str, numbers[start:start+4])) + "\n")
+        file.write("EOF\n")
+
+@pytest.mark.parametrize("edge_weight_format", ["FULL_MATRIX", "UPPER_ROW", "LOWER_ROW", "UPPER_DIAG_ROW", "LOWER_DIAG_ROW",
+                                                "UPPER_COL", "LOWER_COL", "UPPER_DIAG_COL", "LOWER_DIAG_COL"])
+def test_explicit_formats(tmp_path,edge_weight_format):
+    rng = np.random.default_rng(3)
+    matrix = rng.integers(1, 1000, (7, 7))
+    matrix = np.triu(matrix, 1) + np.triu(matrix, 1).T
+    file_name = str(tmp_path / "explicit.tsp")
+    writeExplicitFile(file_name,matrix,edge_weight_format)
+    header,coordinates,explicit_matrix = parse_tsp(file_name)
+    assert coordinates is None
+    assert explicit_matrix.tolist() == matrix.tolist()
+
+def test_cached_load(tmp_path):
+    # The second load comes from the .npy caches, including the coordinates of the EXPLICIT file.
+    file_name = str(tmp_path / "coords_display.tsp")
+    shutil.copy(os.path.join(FIXTURES, "coords_display.tsp"), file_name)
+    first = load_tsp_arrays(file_name)
+    assert os.path.exists(file_name + ".EXPLICIT.npy")
+    second = load_tsp_arrays(file_name)
+    assert first[0] == second[0] == "EXPLICIT"
+    assert np.array_equal(first[1], second[1])
+    assert np.array_equal(first[2], second[2])
+
+def test_euclidean_distances():
+    node_list,distance_matrix = load_tsp(os.path.join(TSP_DIR, "kroA100.tsp"))
+    for i,j in [(0, 1), (5, 70), (99, 42)]:
+        a,b = node_list[i],node_list[j]
+        assert distance_matrix.distance(i, j) == round(math.hypot(a.x - b.x, a.y - b.y))
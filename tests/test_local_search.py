@@ -0,0 +1,22 @@
+import itertools
+import numpy as np
+import pytest
+
+from tsp_solver.distance import DistanceMatrix
+from tsp_solver.local_search import localSearch
+from tsp_solver.routes import calculateFitness, twoOptDelta
+
+from .conftest import randomCoordinates
+
+
+@pytest.mark.parametrize("tour_structure", ["array", "two_level"])
+def test_two_opt_local_optimum(tour_structure):
+    # With all cities as candidates the result has no improving 2-opt move.
+    city_count = 40
+    distance_matrix = DistanceMatrix.from_coordinates(randomCoordinates(city_count,seed=7))
+    route = np.random.default_rng(7).permutation(city_count).astype(np.int32)
+    route,route_length = localSearch(route,distance_matrix,neighbor_count=city_count-1,tour_structure=tour_structure)
+    assert sorted(route.tolist()) == list(range(city_count))
+    assert route_length == calculateFitness(route,distance_matrix)
+    for i,j in itertools.combinations(range(city_count+1), 2):
+        assert twoOptDelta(route,i,j,distance_matrix) >= 0
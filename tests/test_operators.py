@@ -0,0 +1,79 @@
+import random
+import numpy as np
+import pytest
+
+from tsp_solver.operators import orderedCrossover, sequentialConstructiveCrossover
+from tsp_solver.rng import RandomStream
+
+
+# The operators of the original source_code.py, on lists of city indices instead of Node lists.
+
+def baselineOrderedCrossover(parent1,parent2):
+    child1 = [None for i in range(len(parent1))]
+    child2 = [None for i in range(len(parent2))]
+    orderA = int(random.random() * len(parent1))
+    orderB = int(random.random() * len(parent1))
+    start_order = min(orderA, orderB)
+    end_order = max(orderA, orderB)
+    for i in range(start_order, end_order):
+        child1[i] = parent1[i]
+        child2[i] = parent2[i]
+    for child,parent in ((child1,parent2), (child2,parent1)):
+        child_indice = end_order
+        parent_indice = end_order
+        while None in child:
+            if parent[parent_indice] not in child:
+                child[child_indice] = parent[parent_indice]
+                child_indice = child_indice+1
+            parent_indice = parent_indice+1
+            if parent_indice == len(parent):
+                parent_indice = 0
+            if child_indice == len(child):
+                child_indice = 0
+    return (child1,child2)
+
+def baselineSequentialConstructiveCrossover(parent1,parent2,distance):
+    child = [parent1[0]]
+    while len(child) < len(parent1):
+        candidates = []
+        for parent in (parent1, parent2):
+            candidate_indice = (parent.index(child[-1]) + 1) % len(parent)
+            if parent[candidate_indice] in child:
+                # No legitimate node: the node with the smallest number which is not in the child.
+                for node in range(len(parent)):
+                    if node not in child:
+                        candidate_indice = parent.index(node)
+                        break
+            candidates.append(parent[candidate_indice])
+        if distance(child[-1], candidates[0]) < distance(child[-1], candidates[1]):
+            child.append(candidates[0])
+        else:
+            child.append(candidates[1])
+    return child
+
+
+def parents(city_count,seed):
+    rng = np.random.default_rng(seed)
+    return rng.permutation(city_count).astype(np.int32),rng.permutation(city_count).astype(np.int32)
+
+@pytest.mark.parametrize("seed", range(20))
+def test_ordered_crossover(seed):
+    parent1,parent2 = parents(30,seed)
+    random.seed(seed)
+    expected = baselineOrderedCrossover(parent1.tolist(),parent2.tolist())
+    random.seed(seed)
+    children = orderedCrossover(parent1,parent2)
+    assert [child.tolist() for child in children] == list(expected)
+
+def test_ordered_crossover_stream():
+    # With a RandomStream the cut points are drawn from the stream, the children are the same for the same cuts.
+    parent1,parent2 = parents(30,1)
+    assert ([child.tolist() for child in orderedCrossover(parent1,parent2,RandomStream(4))]
+            == [child.tolist() for child in orderedCrossover(parent1,parent2,RandomStream(4))])
+
+@pytest.mark.parametrize("seed", range(20))
+def test_sequential_constructive_crossover(seed,kroA100):
+    node_list,distance_matrix = kroA100
+    parent1,parent2 = parents(len(node_list),seed)
+    expected = baselineSequentialConstructiveCrossover(parent1.tolist(),parent2.tolist(),distance_matrix.distance)
+    assert sequentialConstructiveCrossover(parent1,parent2,distance_matrix).tolist() == expected
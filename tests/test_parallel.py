@@ -0,0 +1,47 @@
+# The results of the parallel runners only depend on the seed, not on the number of worker processes.
+
+import numpy as np
+
+from tsp_solver.decomposition import generate_decomposed
+from tsp_solver.islands import runIslandGA
+from tsp_solver.parallel import createRestartSeeds, runParallelGA, runParallelSA
+from tsp_solver.routes import calculateFitness
+
+
+def test_restart_seeds():
+    assert createRestartSeeds(1,5) == createRestartSeeds(1,5)
+    assert createRestartSeeds(1,5)[:3] == createRestartSeeds(1,3)
+    assert len(set(createRestartSeeds(1,5))) == 5
+
+def test_parallel_sa(kroA100):
+    node_list,distance_matrix = kroA100
+    for rng_streams in (False, True):
+        results = [runParallelSA(distance_matrix,1000,10,50,0.9,run_count=4,seed=3,processes=processes,
+                                 rng_streams=rng_streams)[:2] for processes in (1, 2)]
+        assert results[0] == results[1]
+
+def test_parallel_ga(kroA100):
+    node_list,distance_matrix = kroA100
+    for rng_streams in (False, True):
+        results = [runParallelGA(distance_matrix,0.2,10,"OX","IVM",100,0.1,3,run_count=3,seed=3,processes=processes,
+                                 rng_streams=rng_streams)[:2] for processes in (1, 2)]
+        assert results[0] == results[1]
+
+def test_island_ga(kroA100):
+    node_list,distance_matrix = kroA100
+    runs = [runIslandGA(distance_matrix,0.2,10,"OX","IVM",120,0.1,3,island_count=2,migration_interval=20,seed=5)
+            for run in range(2)]
+    assert runs[0][0] == runs[1][0]
+    assert runs[0][2] == runs[1][2]
+    assert np.array_equal(runs[0][1], runs[1][1])
+    assert calculateFitness(runs[0][1],distance_matrix) == runs[0][0]
+
+def test_decomposition(kroA100):
+    node_list,distance_matrix = kroA100
+    results = [generate_decomposed(node_list,cluster_size=30,distance_matrix=distance_matrix,processes=processes,seed=2,
+                                   solver_arguments={"moves_per_temperature": 30})
+               for processes in (1, 2)]
+    assert results[0][0] == results[1][0]
+    assert np.array_equal(results[0][1], results[1][1])
+    assert sorted(results[0][1].tolist()) == list(range(len(node_list)))
+    assert calculateFitness(results[0][1],distance_matrix) == results[0][0]
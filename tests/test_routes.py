@@ -0,0 +1,46 @@
+import itertools
+import numpy as np
+
+from tsp_solver.routes import calculateFitness, insertionDelta, swapDelta, twoOptDelta
+from tsp_solver.sa import swapDeltaBatch
+
+
+def routes(city_count,count=5,seed=1):
+    rng = np.random.default_rng(seed)
+    return [rng.permutation(city_count).astype(np.int32) for i in range(count)]
+
+def test_swap_delta(small_instance):
+    node_list,distance_matrix = small_instance
+    for route in routes(len(node_list)):
+        length = calculateFitness(route,distance_matrix)
+        for i,j in itertools.product(range(len(route)), repeat=2):
+            moved = route.copy()
+            moved[[i,j]] = moved[[j,i]]
+            assert swapDelta(route,i,j,distance_matrix) == calculateFitness(moved,distance_matrix) - length
+
+def test_two_opt_delta(small_instance):
+    node_list,distance_matrix = small_instance
+    for route in routes(len(node_list)):
+        length = calculateFitness(route,distance_matrix)
+        for i,j in itertools.combinations(range(len(route)+1), 2):
+            moved = route.copy()
+            moved[i:j] = route[i:j][::-1]
+            assert twoOptDelta(route,i,j,distance_matrix) == calculateFitness(moved,distance_matrix) - length
+
+def test_insertion_delta(small_instance):
+    node_list,distance_matrix = small_instance
+    for route in routes(len(node_list)):
+        length = calculateFitness(route,distance_matrix)
+        for node_indice,insertion_indice in itertools.product(range(len(route)), repeat=2):
+            moved = np.insert(np.delete(route, node_indice), insertion_indice, route[node_indice])
+            assert (insertionDelta(route,node_indice,insertion_indice,distance_matrix)
+                    == calculateFitness(moved,distance_matrix) - length)
+
+def test_swap_delta_batch(small_instance):
+    node_list,distance_matrix = small_instance
+    batch = np.stack(routes(len(node_list),count=40))
+    rng = np.random.default_rng(2)
+    first = rng.integers(0, len(node_list), len(batch))
+    second = rng.integers(0, len(node_list), len(batch))
+    expected = [swapDelta(route,i,j,distance_matrix) for route,i,j in zip(batch, first, second)]
+    assert swapDeltaBatch(batch,first,second,distance_matrix).tolist() == expected
@@ -0,0 +1,54 @@
+import random
+import numpy as np
+import pytest
+
+from tsp_solver.acceptance import acceptanceTable, calculate_acceptance_probability
+from tsp_solver.routes import calculateFitness
+from tsp_solver.sa import generate_SA, generate_batch_SA
+from tsp_solver.stopping import StoppingCondition
+
+
+def test_acceptance_table():
+    # The table entries are bit-identical to the probabilities calculated for every move.
+    temperature = 10000.0
+    for level in range(200):
+        table,complete_table = acceptanceTable(temperature,600)
+        assert table == [calculate_acceptance_probability(delta_E,temperature) for delta_E in range(len(table))]
+        temperature = temperature * 0.95
+
+@pytest.mark.parametrize("arguments", [{}, {"neighbor_count": 8}, {"move": "two_opt"}, {"move": "two_opt", "neighbor_count": 8}])
+def test_final_route(kroA100,arguments):
+    node_list,distance_matrix = kroA100
+    random.seed(1)
+    best_result,total_num_of_generations,running_time,route = generate_SA(node_list,1000,10,200,0.9,distance_matrix,
+                                                                           return_route=True,**arguments)
+    assert sorted(route.tolist()) == list(range(len(node_list)))
+    # best_result also counts the route after the last accepted move.
+    assert best_result <= calculateFitness(route,distance_matrix)
+
+def test_numba_backend(kroA100):
+    pytest.importorskip("numba")
+    node_list,distance_matrix = kroA100
+    random.seed(1)
+    best_result,total_num_of_generations,running_time,route = generate_SA(node_list,1000,10,200,0.9,distance_matrix,
+                                                                           backend="numba",return_route=True)
+    assert sorted(route.tolist()) == list(range(len(node_list)))
+    assert best_result <= calculateFitness(route,distance_matrix)
+
+def test_max_evaluations(kroA100):
+    node_list,distance_matrix = kroA100
+    for check_interval in (1, 100):
+        random.seed(1)
+        stopping = StoppingCondition(max_evaluations=1234,check_interval=check_interval)
+        assert generate_SA(node_list,1000,1,500,0.99,distance_matrix,stopping=stopping)[1] == 1234
+        assert stopping.reason == "evaluations"
+        stopping = StoppingCondition(max_evaluations=1234,check_interval=check_interval)
+        assert generate_batch_SA(node_list,1000,1,500,0.99,4,distance_matrix,seed=1,stopping=stopping)[2] == 1234
+
+def test_batch_sa(kroA100):
+    node_list,distance_matrix = kroA100
+    best_results,best_routes,total_num_of_generations,running_time = generate_batch_SA(node_list,1000,10,20,0.9,6,
+                                                                                       distance_matrix,seed=2)
+    assert [calculateFitness(route,distance_matrix) for route in best_routes] == best_results.tolist()
+    again = generate_batch_SA(node_list,1000,10,20,0.9,6,distance_matrix,seed=2)
+    assert np.array_equal(again[0], best_results)
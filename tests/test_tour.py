@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from tsp_solver.tour import TwoLevelTour
+
+
+def cycle(route):
+    # The cyclic tour without its start and direction: rotated to city 0 and read towards its smaller neighbor.
+    route = np.roll(np.asarray(route), -int(np.flatnonzero(np.asarray(route) == 0)[0])).tolist()
+    if route[1] > route[-1]:
+        route = route[:1] + route[:0:-1]
+    return route
+
+def checkConsistent(tour):
+    route = tour.route().tolist()
+    n = len(route)
+    for position,city in enumerate(route):
+        assert tour.position(city) == position
+        assert tour.city(position) == city
+        assert tour.next(city) == route[(position+1) % n]
+        assert tour.prev(city) == route[position-1]
+
+def reverseModel(route,start_position,end_position):
+    n = len(route)
+    places = [(start_position + k) % n for k in range((end_position - start_position) % n + 1)]
+    route = route.copy()
+    route[places] = route[places[::-1]]
+    return route
+
+@pytest.mark.parametrize("city_count,segment_size", [(10, 3), (37, 4), (100, 8)])
+def test_reverse(city_count,segment_size):
+    rng = np.random.default_rng(city_count)
+    route = rng.permutation(city_count)
+    tour = TwoLevelTour(route, segment_size)
+    for move in range(300):
+        start_position,end_position = rng.integers(0, city_count, 2).tolist()
+        # The tour may reverse the rest of the tour instead, so the positions are taken from its current route.
+        route = reverseModel(tour.route(),start_position,end_position)
+        tour.reverse(start_position,end_position)
+        assert cycle(tour.route()) == cycle(route)
+        checkConsistent(tour)
+
+def test_two_opt_move():
+    rng = np.random.default_rng(5)
+    city_count = 50
+    tour = TwoLevelTour(rng.permutation(city_count), 5)
+    for move in range(300):
+        a,c = rng.integers(0, city_count, 2).tolist()
+        b,d = tour.next(a),tour.next(c)
+        if a == c or b == c or a == d:
+            continue
+        # Model: reverse the path b..c of the array route, which replaces (a,b) and (c,d) with (a,c) and (b,d).
+        route = tour.route()
+        route = reverseModel(route,int(np.flatnonzero(route == b)[0]),int(np.flatnonzero(route == c)[0]))
+        tour.two_opt_move(a,b,c,d)
+        assert cycle(tour.route()) == cycle(route)
+        checkConsistent(tour)
+
+def test_move_segment():
+    rng = np.random.default_rng(6)
+    city_count = 40
+    tour = TwoLevelTour(rng.permutation(city_count), 5)
+    for move in range(200):
+        route = tour.route().tolist()
+        segment_position = int(rng.integers(0, city_count))
+        segment_length = int(rng.integers(1, 4))
+        segment = [route[(segment_position + k) % city_count] for k in range(segment_length)]
+        rest = route[(segment_position + segment_length) % city_count:] + route[:(segment_position + segment_length) % city_count]
+        rest = [city for city in rest if city not in segment]
+        # As in localSearch the target is not the city before the segment (rest[-1]), that is the place of the segment.
+        target = rest[int(rng.integers(0, len(rest) - 1))]
+        reverse = bool(rng.integers(0, 2))
+        # Model: the segment is put between target and its successor.
+        place = rest.index(target) + 1
+        expected = rest[:place] + (segment[::-1] if reverse else segment) + rest[place:]
+        tour.move_segment(segment_position,segment_length,target,reverse)
+        assert cycle(tour.route()) == cycle(expected)
+        checkConsistent(tour)
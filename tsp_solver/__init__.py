@@ -0,0 +1,28 @@
+# Simulated annealing and genetic algorithm solvers for the Travelling Salesman Problem.
+# Importing the package does not run the experiments (see tsp_solver.experiments) and does not import pandas or
+# matplotlib; pandas is only imported by the GAs for their history report (not with history_interval=None).
+
+from .loader import Node, nodesFromCoordinates, read_tsp, load_tsp, load_tsp_arrays, parse_tsp
+from .distance import DistanceMatrix, SpatialGrid, calculateDistances
+from .routes import (createRandomRoute, createNearestNeighborRoute, createPositionIndex, calculateFitness,
+                     routeToNodes, swapDelta, twoOptDelta, insertionDelta)
+from .operators import (orderedCrossover, sequentialConstructiveCrossover, insertionMutation, swapMutation,
+                        inversionMutation, randomMutation, twoOptOperator)
+from .tour import TwoLevelTour
+from .local_search import localSearch
+from .fitness_cache import FitnessCache
+from .population import Population
+from .ga import initiatePopulation, generate_GA
+from .generational import generate_generational_GA
+from .cooling import (GeometricCooling, LinearCooling, LogarithmicCooling, LundyMeesCooling, AdaptiveCooling,
+                      createCoolingSchedule)
+from .stopping import StoppingCondition
+from .calibration import Calibration
+from .profiler import Profiler
+from .rng import RandomStream, spawnStreams
+from .recorder import ConvergenceRecorder, CSVSink, BinarySink, readRecords, followRecords
+from .sa import generate_SA, generate_batch_SA, runBatchSA
+from .tempering import generate_parallel_tempering
+from .parallel import runParallelSA, runParallelGA
+from .islands import runIslandGA
+from .decomposition import generate_decomposed
@@ -0,0 +1,34 @@
+# Metropolis acceptance: An uphill move is accepted with the probability e^(-delta_E / T).
+# All distances are integers, so delta_E is an integer too. Instead of calculating the exponential for every uphill move,
+# the probabilities of the deltas 0,1,2,... are calculated once per temperature level (acceptanceTable) and the moves of
+# the level only look them up.
+# The entries are calculated with the same expression as calculate_acceptance_probability (the base 2.71828 and Python's
+# float power), so they are bit-identical to it; a vectorized np.power differs from it in the last bit for some deltas,
+# which can flip a decision. The only other difference is a delta beyond a complete table, which is rejected even when
+# random.random() returns exactly 0.0 (probability 2^-53 per draw).
+
+E = 2.71828
+# Above DELTA_LIMIT * T the probability is below 2.71828^-40 = 4e-18, smaller than the smallest non-zero number that
+# random.random() returns (2^-53 = 1.1e-16), so these moves can be rejected without calculating it.
+DELTA_LIMIT = 40
+
+def calculate_acceptance_probability(delta_E,temperature):
+    return E ** (-delta_E/temperature) # e^(-delta_E / temperature)
+
+def acceptanceTable(temperature,max_size):
+    # Returns the list of the acceptance probabilities of the deltas 0..size-1 and whether the table is complete, which
+    # means every larger delta has a negligible probability. The size is capped with max_size, so the table of a very
+    # hot level does not cost more than the moves of the level. Deltas beyond an incomplete table have to be calculated
+    # with calculate_acceptance_probability.
+    if max_size == 0:
+        return [], False
+    size = min(int(DELTA_LIMIT * temperature) + 1, max_size)
+    table = [E ** (-delta_E/temperature) for delta_E in range(size)]
+    return table, size < max_size
+
+def acceptanceTableSize(moves_per_temperature,max_size=4096):
+    # Building an entry of the table is about as expensive as one exponential in the loop, so the table of a level is
+    # kept within a small multiple of the moves of the level. Levels with only a few moves don't use a table.
+    if moves_per_temperature < 16:
+        return 0
+    return min(max_size, 16 * moves_per_temperature)
@@ -0,0 +1,230 @@
+# Benchmarks of the solver: throughput (moves per second of SA, generations per second of GA, microbenchmarks of the
+# operators) and quality (gap to the known optimum) on kroA100 and a280 and on random instances of 1k - 100k cities.
+# The results are written to a JSON file, which can be used as the baseline of a later run:
+#     python -m tsp_solver.benchmark run --output baseline.json
+#     python -m tsp_solver.benchmark run --output new.json --baseline baseline.json    # Run and compare.
+#     python -m tsp_solver.benchmark compare new.json baseline.json
+# A result is a regression when it is worse than the baseline by more than the tolerance (10% by default), or for the gaps
+# to the known optimum, when the gap grows by more than the gap tolerance (0.5 percent points by default). The compare
+# exits with status 1 if there is a regression.
+# All runs are seeded, so the quality results only change when the algorithms change.
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import sys
+import time
+import numpy as np
+
+from . import kernels
+from .distance import DistanceMatrix
+from .ga import generate_GA, initiatePopulation
+from .loader import nodesFromCoordinates, read_tsp
+from .local_search import localSearch
+from .operators import (insertionMutation, inversionMutation, orderedCrossover, randomMutation,
+                        sequentialConstructiveCrossover, swapMutation, twoOptOperator)
+from .routes import calculateFitness, createNearestNeighborRoute, createRandomRoute
+from .sa import generate_SA
+from .stopping import StoppingCondition
+
+KNOWN_OPTIMA = {"kroA100.tsp": 21282, "a280.tsp": 2579}
+# Above this size localSearch takes minutes (about 4 minutes for 100k cities), too long for a benchmark run.
+LOCAL_SEARCH_MAX_CITIES = 20000
+
+
+class Results:
+    # name -> {"value", "unit", "higher_is_better"}
+    def __init__(self):
+        self.results = {}
+
+    def add(self, name, value, unit, higher_is_better):
+        self.results[name] = {"value": float(value), "unit": unit, "higher_is_better": higher_is_better}
+        print(f"{name:<55} {value:>14.6g} {unit}", flush=True)
+
+
+def timePerCall(function, min_time=0.2):
+    # Calls the function until min_time has passed and returns the time of one call (best of 3 such rounds).
+    best = float("inf")
+    for repetition in range(3):
+        calls = 0
+        t1 = time.perf_counter()
+        while True:
+            function()
+            calls = calls + 1
+            elapsed = time.perf_counter() - t1
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / calls)
+    return best
+
+def randomInstance(city_count, seed=0):
+    coordinates = np.random.default_rng(seed).uniform(0, 1000000, (city_count, 2))
+    node_list = nodesFromCoordinates(coordinates)
+    return node_list,coordinates
+
+
+def benchmarkOperators(results, name, node_list, distance_matrix):
+    random.seed(1)
+    parent1 = createRandomRoute(node_list)
+    parent2 = createRandomRoute(node_list)
+    operators = {"calculateFitness": lambda: calculateFitness(parent1,distance_matrix),
+                 "orderedCrossover": lambda: orderedCrossover(parent1,parent2),
+                 "sequentialConstructiveCrossover": lambda: sequentialConstructiveCrossover(parent1,parent2,distance_matrix),
+                 "insertionMutation": lambda: insertionMutation(parent1,1),
+                 "swapMutation": lambda: swapMutation(parent1,1),
+                 "inversionMutation": lambda: inversionMutation(parent1,1),
+                 "randomMutation": lambda: randomMutation(parent1,1),
+                 "twoOptOperator(n=100)": lambda: twoOptOperator(parent1,100,distance_matrix)}
+    for operator_name, operator in operators.items():
+        results.add(f"{name}/operator/{operator_name}", timePerCall(operator) * 1e6, "us/call", False)
+
+def benchmarkSA(results, name, node_list, distance_matrix, moves, backend="numpy"):
+    if backend == "numba":
+        generate_SA(node_list,1,0.5,10,0.5,distance_matrix,backend=backend)   # Compiles the kernel.
+    random.seed(1)
+    stopping = StoppingCondition(max_evaluations=moves, check_interval=1024)
+    best_result,total_num_of_generations,running_time = generate_SA(node_list,10000,0.01,max(moves // 300, 1),0.98,
+                                                                    distance_matrix,stopping=stopping,backend=backend)
+    results.add(f"{name}/sa/{backend}/moves_per_second", total_num_of_generations / running_time, "moves/s", True)
+
+def benchmarkGA(results, name, node_list, distance_matrix, generation_count):
+    random.seed(1)
+    population,population_distances = initiatePopulation(0,50,node_list,distance_matrix)
+    generate_GA(list(population),list(population_distances),"OX","IVM",1,distance_matrix)   # Imports pandas.
+    df,df_best_rank_for_all_iterations = generate_GA(population,population_distances,"OX","IVM",generation_count,
+                                                     distance_matrix,history_interval=100)
+    # generate_GA runs generation_count+1 generations. The time of the last history row is the time of the GA loop,
+    # without the set up and the DataFrames of the report.
+    loop_time = df_best_rank_for_all_iterations["time"].iloc[-1]
+    results.add(f"{name}/ga/generations_per_second", (generation_count + 1) / loop_time, "generations/s", True)
+
+def benchmarkQuality(results, name, node_list, distance_matrix, optimum=None):
+    # Nearest neighbor tour, the tour after localSearch, and SA followed by localSearch.
+    random.seed(1)
+    t1 = time.perf_counter()
+    route = createNearestNeighborRoute(node_list,distance_matrix)
+    t2 = time.perf_counter()
+    results.add(f"{name}/construction/nearest_neighbor_seconds", t2-t1, "s", False)
+    lengths = {"nearest_neighbor": calculateFitness(route,distance_matrix)}
+    if distance_matrix.city_count <= LOCAL_SEARCH_MAX_CITIES:
+        t1 = time.perf_counter()
+        route,lengths["local_search"] = localSearch(route,distance_matrix)
+        t2 = time.perf_counter()
+        results.add(f"{name}/local_search/seconds", t2-t1, "s", False)
+    if distance_matrix.city_count <= 1000:
+        random.seed(1)
+        lengths["sa_local_search"] = generate_SA(node_list,10000,0.01,1000,0.95,distance_matrix,local_search=True)[0]
+    for method, length in lengths.items():
+        if optimum is None:
+            results.add(f"{name}/quality/{method}/length", length, "length", False)
+        else:
+            results.add(f"{name}/quality/{method}/gap", 100 * (length - optimum) / optimum, "%", False)
+
+
+def runBenchmarks(tsp_dir="TSP_files", sizes=(1000, 10000, 100000), quick=False):
+    results = Results()
+    backends = ["numpy"] + (["numba"] if kernels.numba is not None else [])
+    for file_name, optimum in KNOWN_OPTIMA.items():
+        node_list = read_tsp(os.path.join(tsp_dir, file_name))
+        distance_matrix = DistanceMatrix(node_list)
+        name = os.path.splitext(file_name)[0]
+        benchmarkOperators(results, name, node_list, distance_matrix)
+        for backend in backends:
+            benchmarkSA(results, name, node_list, distance_matrix, 30000 if quick else 300000, backend)
+        benchmarkGA(results, name, node_list, distance_matrix, 300 if quick else 3000)
+        benchmarkQuality(results, name, node_list, distance_matrix, optimum)
+    for city_count in sizes:
+        name = f"random{city_count}"
+        node_list,coordinates = randomInstance(city_count)
+        t1 = time.perf_counter()
+        distance_matrix = DistanceMatrix.from_coordinates(coordinates)
+        t2 = time.perf_counter()
+        results.add(f"{name}/distance_matrix_seconds", t2-t1, "s", False)
+        t1 = time.perf_counter()
+        distance_matrix.neighbor_lists(10)
+        t2 = time.perf_counter()
+        results.add(f"{name}/neighbor_lists_seconds", t2-t1, "s", False)
+        benchmarkSA(results, name, node_list, distance_matrix, 30000 if quick else 100000)
+        benchmarkQuality(results, name, node_list, distance_matrix)
+    return results.results
+
+def environment():
+    return {"time": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "numba": None if kernels.numba is None else kernels.numba.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor()}
+
+
+def compareResults(results, baseline, tolerance=0.1, gap_tolerance=0.5):
+    # Returns the names of the results which are worse than the baseline by more than the tolerance (relative change).
+    # The quality results of the random instances are lengths, the others are gaps to the optimum in percent. A gap can be
+    # 0, so a gap is a regression when it grows by more than gap_tolerance percent points.
+    regressions = []
+    print(f"{'benchmark':<55} {'baseline':>12} {'new':>12} {'change':>9}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old = baseline[name]["value"]
+        new = result["value"]
+        if result["unit"] == "%":
+            change = new - old
+            worse = change > gap_tolerance
+            change_text = f"{change:+.2f}pp"
+        else:
+            change = (new - old) / old if old else 0.0
+            worse = -change > tolerance if result["higher_is_better"] else change > tolerance
+            change_text = f"{100 * change:+.1f}%"
+        flag = "  REGRESSION" if worse else ""
+        print(f"{name:<55} {old:>12.6g} {new:>12.6g} {change_text:>9}{flag}")
+        if worse:
+            regressions.append(name)
+    return regressions
+
+def loadResults(file_name):
+    with open(file_name) as file:
+        return json.load(file)["results"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tsp_solver.benchmark", description="Benchmarks of the TSP solver.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="Run the benchmarks.")
+    run.add_argument("--output", default="benchmark.json", help="JSON file of the results.")
+    run.add_argument("--baseline", help="Compare the results with this JSON file.")
+    run.add_argument("--tsp-dir", default="TSP_files", help="Directory of the tsp files.")
+    run.add_argument("--sizes", default="1000,10000,100000", help="City counts of the random instances.")
+    run.add_argument("--quick", action="store_true", help="Shorter runs, e.g. for a quick check.")
+    run.add_argument("--tolerance", type=float, default=0.1,
+                     help="Allowed relative change before a regression (not for the gaps).")
+    run.add_argument("--gap-tolerance", type=float, default=0.5,
+                     help="Allowed growth of a gap to the optimum in percent points before a regression.")
+    compare = commands.add_parser("compare", help="Compare two result files.")
+    compare.add_argument("results", help="JSON file of the new results.")
+    compare.add_argument("baseline", help="JSON file of the baseline.")
+    compare.add_argument("--tolerance", type=float, default=0.1,
+                         help="Allowed relative change before a regression (not for the gaps).")
+    compare.add_argument("--gap-tolerance", type=float, default=0.5,
+                         help="Allowed growth of a gap to the optimum in percent points before a regression.")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        sizes = [int(size) for size in args.sizes.split(",") if size]
+        results = runBenchmarks(args.tsp_dir, sizes, args.quick)
+        with open(args.output, "w") as file:
+            json.dump({"environment": environment(), "results": results}, file, indent=2)
+        if args.baseline is None:
+            return 0
+        regressions = compareResults(results, loadResults(args.baseline), args.tolerance, args.gap_tolerance)
+    else:
+        regressions = compareResults(loadResults(args.results), loadResults(args.baseline), args.tolerance,
+                                     args.gap_tolerance)
+    print(f"{len(regressions)} regression(s)")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
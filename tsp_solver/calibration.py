@@ -0,0 +1,73 @@
+# Calibration of the SA parameters from the instance. generate_SA takes "auto" for Tmax, Tmin and moves_per_temperature;
+# then before the annealing it samples the deltas of samples neighbor moves of the initial route and a Calibration sets:
+#   Tmax : The temperature at which the uphill moves of the sample are accepted with the average probability
+#          initial_acceptance, mean(e^(-delta/Tmax)) = initial_acceptance over the positive deltas. The mean grows with the
+#          temperature, so Tmax is found by bisection. (Literature reference: "Computing the Initial Temperature of
+#          Simulated Annealing", Walid Ben-Ameur, Computational Optimization and Applications 29, 2004.)
+#   Tmin : The temperature at which the smallest positive delta of the sample is accepted with the probability
+#          final_acceptance. Below it almost no uphill move is accepted anymore.
+#   moves_per_temperature : Adaptive level length (Kirkpatrick, Gelatt, Vecchi, "Optimization by Simulated Annealing",
+#          Science 220, 1983). A level has at most moves_per_city * N moves and ends as soon as accepted_fraction of
+#          them were accepted. The hot levels, where most moves are accepted (a random walk), end early and the cold levels
+#          get the full length. (The numba backend always runs the full length.)
+# The same configuration can be used for instances of all sizes, the deltas and the length of the levels follow the
+# instance. The calibrated values are kept in Tmax, Tmin, moves and accepted_limit.
+
+import math
+import numpy as np
+
+from .acceptance import E
+
+
+def calibrateTmax(deltas,initial_acceptance=0.8,iterations=100):
+    uphill = np.asarray(deltas, dtype=np.float64)
+    uphill = uphill[uphill > 0]
+    if len(uphill) == 0:
+        return None
+    low,high = math.log(uphill.min() / 1000), math.log(uphill.max() * 1000)
+    for iteration in range(iterations):
+        middle = (low + high) / 2
+        if np.power(E, -uphill / math.exp(middle)).mean() < initial_acceptance:
+            low = middle
+        else:
+            high = middle
+    return math.exp(high)
+
+def calibrateTmin(deltas,final_acceptance=0.01):
+    deltas = np.asarray(deltas)
+    uphill = deltas[deltas > 0]
+    if len(uphill) == 0:
+        return None
+    return float(uphill.min()) / -math.log(final_acceptance, E)
+
+
+class Calibration:
+    def __init__(self, samples=1000, initial_acceptance=0.8, final_acceptance=0.01, moves_per_city=30,
+                 accepted_fraction=0.1):
+        for name, probability in (("initial_acceptance", initial_acceptance), ("final_acceptance", final_acceptance),
+                                  ("accepted_fraction", accepted_fraction)):
+            if not 0 < probability < 1:
+                raise ValueError(f"{name} must be between 0 and 1, not {probability}")
+        self.samples = samples
+        self.initial_acceptance = initial_acceptance
+        self.final_acceptance = final_acceptance
+        self.moves_per_city = moves_per_city
+        self.accepted_fraction = accepted_fraction
+        self.Tmax = None
+        self.Tmin = None
+        self.moves = None
+        self.accepted_limit = None
+
+    def calibrate(self, deltas, city_count, Tmax="auto", Tmin="auto", moves_per_temperature="auto"):
+        # Returns Tmax, Tmin and moves_per_temperature with the "auto" ones calibrated. Without an uphill move in the
+        # sample (e.g. less than 4 cities) there is nothing to anneal, the temperatures are set to 1.
+        if Tmax == "auto":
+            Tmax = calibrateTmax(deltas,self.initial_acceptance) or 1.0
+        if Tmin == "auto":
+            Tmin = calibrateTmin(deltas,self.final_acceptance) or 1.0
+        self.accepted_limit = None
+        if moves_per_temperature == "auto":
+            moves_per_temperature = max(int(self.moves_per_city * city_count), 1)
+            self.accepted_limit = max(int(self.accepted_fraction * moves_per_temperature), 1)
+        self.Tmax,self.Tmin,self.moves = Tmax,Tmin,moves_per_temperature
+        return Tmax,Tmin,moves_per_temperature
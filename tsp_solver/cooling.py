@@ -0,0 +1,77 @@
+# Cooling schedules of SA. A schedule gives the temperature of the next level from the temperature T of the level just
+# finished, the number of finished levels and the rate of the accepted moves in that level. SA stops when the
+# temperature is not above Tmin anymore.
+#
+#   "geometric"   : T = T * cooling_rate
+#   "linear"      : T = T - cooling_rate                        (cooling_rate is the decrement of every level)
+#   "logarithmic" : T = Tmax / (1 + cooling_rate * ln(1 + level))
+#   "lundy_mees"  : T = T / (1 + cooling_rate * T)              (Lundy & Mees, cooling_rate is the beta parameter)
+#   "adaptive"    : Geometric cooling with reheating. When the acceptance rate of a level drops below
+#                   min_acceptance_rate the search is stuck, so the temperature is raised again (at most max_reheats times).
+#
+# Literature reference: "Convergence of an annealing algorithm", M. Lundy, A. Mees, Mathematical Programming 34, 1986.
+
+import math
+
+
+class GeometricCooling:
+    def __init__(self, cooling_rate):
+        self.cooling_rate = cooling_rate
+
+    def start(self, Tmax):
+        # Called at the start of every run, so a schedule object can be reused.
+        self.Tmax = Tmax
+        return Tmax
+
+    def next_temperature(self, T, level, acceptance_rate):
+        return T * self.cooling_rate
+
+
+class LinearCooling(GeometricCooling):
+    def next_temperature(self, T, level, acceptance_rate):
+        return T - self.cooling_rate
+
+
+class LogarithmicCooling(GeometricCooling):
+    def next_temperature(self, T, level, acceptance_rate):
+        return self.Tmax / (1 + self.cooling_rate * math.log(1 + level))
+
+
+class LundyMeesCooling(GeometricCooling):
+    def next_temperature(self, T, level, acceptance_rate):
+        return T / (1 + self.cooling_rate * T)
+
+
+class AdaptiveCooling(GeometricCooling):
+    # reheat_factor : The n th reheat sets the temperature to Tmax * reheat_factor^n.
+    def __init__(self, cooling_rate, min_acceptance_rate=0.001, reheat_factor=0.5, max_reheats=3):
+        self.cooling_rate = cooling_rate
+        self.min_acceptance_rate = min_acceptance_rate
+        self.reheat_factor = reheat_factor
+        self.max_reheats = max_reheats
+
+    def start(self, Tmax):
+        self.Tmax = Tmax
+        self.reheats = 0
+        return Tmax
+
+    def next_temperature(self, T, level, acceptance_rate):
+        if acceptance_rate < self.min_acceptance_rate and self.reheats < self.max_reheats:
+            self.reheats = self.reheats + 1
+            return self.Tmax * self.reheat_factor ** self.reheats
+        return T * self.cooling_rate
+
+
+COOLING_SCHEDULES = {"geometric": GeometricCooling,
+                     "linear": LinearCooling,
+                     "logarithmic": LogarithmicCooling,
+                     "lundy_mees": LundyMeesCooling,
+                     "adaptive": AdaptiveCooling}
+
+def createCoolingSchedule(cooling_schedule, cooling_rate):
+    # cooling_schedule is either one of the names above or a schedule object, which is returned as it is.
+    if not isinstance(cooling_schedule, str):
+        return cooling_schedule
+    if cooling_schedule not in COOLING_SCHEDULES:
+        raise ValueError(f"Unknown cooling schedule {cooling_schedule}, supported: {', '.join(COOLING_SCHEDULES)}")
+    return COOLING_SCHEDULES[cooling_schedule](cooling_rate)
@@ -0,0 +1,240 @@
+# Decomposition of large instances. generate_SA and generate_GA search the permutation of all cities, which does not
+# scale past a few thousand cities. generate_decomposed cuts the instance into clusters of about cluster_size cities,
+# solves every cluster with SA or GA in a process pool and joins the sub-tours into one tour:
+#   1. Partition of the coordinates:
+#        "grid"   : A square grid of about N / cluster_size cells over the bounding box (the clusters of a non uniform
+#                   instance have very different sizes).
+#        "kmeans" : Lloyd's k-means with ceil(N / cluster_size) centers (seeded, the distances to the centers are
+#                   calculated in chunks).
+#        "karp"   : Karp's partitioning: the cities are split at the median of the longer side of their bounding box,
+#                   recursively until a part has at most cluster_size cities.
+#   2. Every cluster is solved as its own instance (a DistanceMatrix of its cities) with generate_SA (2-opt moves with
+#      candidate lists, annealed at a low temperature from a nearest neighbor route improved by localSearch, and a final
+#      localSearch by default) or generate_GA. Only the coordinates of the cluster are sent to
+#      the worker. The cluster gets its own seed from the seed of the run (createRestartSeeds), so the tour does not
+#      depend on the number of processes.
+#   3. The clusters are visited in the order of a tour over their centroids (nearest neighbor and localSearch). A sub-tour
+#      is opened at the city which is nearest to the last city of the previous cluster and it is walked in the direction
+#      whose last city is nearer to the centroid of the next cluster.
+#   4. Repair: localSearch on the whole tour with neighbor_count candidates.
+#        "full"     : Started from every city. The borders of the clusters are repaired and the moves between cities of
+#                     different clusters which are not neighbors in the cluster order are found as well.
+#        "boundary" : Started only from the boundary cities (the cities which have a city of another cluster in their
+#                     candidate list, and the cities at the junctions). The edges inside the clusters are already local
+#                     optima, so the search stays near the borders. Faster, the tour is a little longer.
+# solver_arguments overrides the default parameters of the cluster solver (the keyword parameters of generate_SA, or of
+# initiatePopulation and generate_GA, see clusterArguments).
+
+import math
+import multiprocessing
+import time
+import numpy as np
+
+from .distance import DistanceMatrix, calculateDistances
+from .ga import generate_GA, initiatePopulation
+from .loader import nodesFromCoordinates
+from .local_search import localSearch
+from .parallel import createRestartSeeds, restartRandom
+from .rng import RandomStream
+from .routes import calculateFitness, createNearestNeighborRoute
+from .sa import generate_SA
+
+PARTITIONS = ("grid", "kmeans", "karp")
+SOLVERS = ("SA", "GA")
+REPAIRS = ("full", "boundary")
+GA_POPULATION_ARGUMENTS = ("nearest_neighbor_routes_rate", "population_size")
+
+
+def labelGroups(labels):
+    # The city indices of every label, the labels in increasing order.
+    order = np.argsort(labels, kind="stable")
+    boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+    return np.split(order, boundaries)
+
+def gridPartition(coordinates,cluster_size):
+    cell_count = max(int(round(math.sqrt(len(coordinates) / cluster_size))), 1)
+    lower = coordinates.min(axis=0)
+    span = np.maximum(coordinates.max(axis=0) - lower, 1e-12)
+    cells = np.minimum(((coordinates - lower) / span * cell_count).astype(np.int64), cell_count - 1)
+    # Boustrophedon order of the cells, so neighboring labels are neighboring cells.
+    rows = np.where(cells[:, 0] % 2 == 0, cells[:, 1], cell_count - 1 - cells[:, 1])
+    return labelGroups(cells[:, 0] * cell_count + rows)
+
+def nearestCenters(coordinates,centers,chunk_size=4096):
+    labels = np.empty(len(coordinates), dtype=np.int64)
+    for start in range(0, len(coordinates), chunk_size):
+        chunk = coordinates[start:start+chunk_size]
+        labels[start:start+chunk_size] = ((chunk[:, None, :] - centers[None, :, :]) ** 2).sum(axis=-1).argmin(axis=1)
+    return labels
+
+def kmeansPartition(coordinates,cluster_size,seed=1,max_iterations=20):
+    center_count = max(int(math.ceil(len(coordinates) / cluster_size)), 1)
+    rng = np.random.default_rng(seed)
+    centers = coordinates[rng.choice(len(coordinates), center_count, replace=False)].astype(np.float64)
+    for iteration in range(max_iterations):
+        labels = nearestCenters(coordinates,centers)
+        counts = np.bincount(labels, minlength=center_count)
+        sums = np.stack([np.bincount(labels, weights=coordinates[:, axis], minlength=center_count) for axis in (0, 1)], axis=1)
+        new_centers = centers.copy()
+        filled = counts > 0
+        new_centers[filled] = sums[filled] / counts[filled, None]
+        if np.allclose(new_centers, centers):
+            break
+        centers = new_centers
+    return labelGroups(nearestCenters(coordinates,centers))
+
+def karpPartition(coordinates,cluster_size):
+    clusters = []
+    parts = [np.arange(len(coordinates))]
+    while parts:
+        cities = parts.pop()
+        if len(cities) <= cluster_size:
+            clusters.append(cities)
+            continue
+        points = coordinates[cities]
+        axis = int(np.argmax(np.ptp(points, axis=0)))
+        order = np.argsort(points[:, axis], kind="stable")
+        half = len(cities) // 2
+        parts.append(cities[order[half:]])
+        parts.append(cities[order[:half]])
+    return clusters
+
+def partitionCities(coordinates,cluster_size,partition="karp",seed=1):
+    # Returns the clusters as arrays of city indices.
+    if cluster_size < 1:
+        raise ValueError(f"The cluster size must be at least 1, not {cluster_size}")
+    if partition == "grid":
+        return gridPartition(coordinates,cluster_size)
+    if partition == "kmeans":
+        return kmeansPartition(coordinates,cluster_size,seed)
+    if partition == "karp":
+        return karpPartition(coordinates,cluster_size)
+    raise ValueError(f"Unknown partition {partition}, supported: {', '.join(PARTITIONS)}")
+
+
+def clusterArguments(solver,distance_matrix,solver_arguments):
+    # Default parameters of the cluster solver. SA: Tmax is the average distance to the nearest city (a typical 2-opt
+    # delta), Tmin is a hundredth of it and every temperature level has one move per city. start="local_search" anneals
+    # a local optimum (nearest neighbor route and localSearch), "random" a random route. A random start at this
+    # temperature ends above the local optimum.
+    city_count = distance_matrix.city_count
+    if solver == "SA":
+        nearest = distance_matrix.neighbor_lists(1)[:, 0]
+        Tmax = max(float(calculateDistances(distance_matrix.coordinates, distance_matrix.coordinates[nearest],
+                                            distance_matrix.edge_weight_type).mean()), 1.0)
+        arguments = {"Tmax": Tmax, "Tmin": Tmax / 100, "moves_per_temperature": city_count, "cooling_rate": 0.9,
+                     "move": "two_opt", "neighbor_count": min(8, city_count - 1), "local_search": True,
+                     "start": "local_search"}
+    else:
+        arguments = {"nearest_neighbor_routes_rate": 0.2, "population_size": 20, "crossover_operator": "OX",
+                     "mutation_operator": "IVM", "generation_count": 1000, "local_search": True, "history_interval": None}
+    arguments.update(solver_arguments)
+    return arguments
+
+def solveCluster(arguments):
+    # Solves one cluster and returns its tour as global city indices.
+    cities,coordinates,edge_weight_type,solver,solver_arguments,restart_seed,rng_streams = arguments
+    if len(cities) < 5:
+        return cities
+    distance_matrix = DistanceMatrix.from_coordinates(coordinates, edge_weight_type=edge_weight_type)
+    node_list = nodesFromCoordinates(coordinates)
+    rng = restartRandom(restart_seed,rng_streams)
+    arguments = clusterArguments(solver,distance_matrix,solver_arguments)
+    if solver == "SA":
+        initial_route = None
+        if arguments.pop("start") == "local_search":
+            initial_route,initial_distance = localSearch(createNearestNeighborRoute(node_list,distance_matrix,rng=rng),
+                                                         distance_matrix)
+        route = generate_SA(node_list,distance_matrix=distance_matrix,rng=rng,return_route=True,initial_route=initial_route,
+                            **arguments)[-1]
+        # The annealing can end above its start route, then the start route is kept.
+        if initial_route is not None and calculateFitness(route,distance_matrix) > initial_distance:
+            route = initial_route
+    else:
+        population_arguments = {name: arguments.pop(name) for name in GA_POPULATION_ARGUMENTS}
+        population,population_distances = initiatePopulation(population_arguments["nearest_neighbor_routes_rate"],
+                                                             population_arguments["population_size"],node_list,
+                                                             distance_matrix,arguments["local_search"],rng)
+        route = generate_GA(population,population_distances,distance_matrix=distance_matrix,rng=rng,return_route=True,
+                            **arguments)[-1]
+        if arguments["local_search"]:
+            route,route_distance = localSearch(route,distance_matrix)
+    return cities[route]
+
+def solveClusters(task_arguments,processes=None):
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    processes = min(processes, len(task_arguments))
+    if processes <= 1:
+        return [solveCluster(arguments) for arguments in task_arguments]
+    with multiprocessing.Pool(processes) as pool:
+        return pool.map(solveCluster, task_arguments, chunksize=1)
+
+
+def clusterOrder(centroids,edge_weight_type):
+    # Order of the clusters: a tour over their centroids.
+    if len(centroids) < 3:
+        return list(range(len(centroids)))
+    distance_matrix = DistanceMatrix.from_coordinates(centroids, edge_weight_type=edge_weight_type)
+    node_list = nodesFromCoordinates(centroids)
+    route = createNearestNeighborRoute(node_list,distance_matrix,rng=RandomStream(0))
+    route,route_distance = localSearch(route,distance_matrix)
+    return route.tolist()
+
+def stitchTours(sub_tours,order,coordinates,centroids,edge_weight_type):
+    # Joins the sub-tours in the given cluster order. Returns the tour and the cities at the junctions.
+    tour = []
+    junctions = []
+    previous_point = centroids[order[-1]]
+    for rank,cluster in enumerate(order):
+        sub_tour = sub_tours[cluster]
+        next_point = centroids[order[(rank + 1) % len(order)]]
+        entry = int(np.argmin(calculateDistances(coordinates[sub_tour], previous_point, edge_weight_type)))
+        sub_tour = np.roll(sub_tour, -entry)
+        backward = np.concatenate((sub_tour[:1], sub_tour[:0:-1]))
+        exits = coordinates[[sub_tour[-1], backward[-1]]]
+        if len(sub_tour) > 2 and np.argmin(calculateDistances(exits, next_point, edge_weight_type)) == 1:
+            sub_tour = backward
+        tour.append(sub_tour)
+        junctions.extend((int(sub_tour[0]), int(sub_tour[-1])))
+        previous_point = coordinates[sub_tour[-1]]
+    return np.concatenate(tour).astype(np.int32),junctions
+
+
+def generate_decomposed(node_list,cluster_size=1000,partition="karp",solver="SA",solver_arguments=None,distance_matrix=None,
+                        processes=None,seed=1,repair="full",neighbor_count=10,rng_streams=False):
+    # Returns the length of the tour, the tour (city indices) and the running time (wall clock time in seconds).
+    # processes : Size of the process pool (None: cpu_count), with one process the clusters are solved in this process.
+    # repair : "full", "boundary" or None, the localSearch pass over the joined tour (neighbor_count candidates).
+    # rng_streams : If True every cluster draws from its own RandomStream, otherwise the random module is seeded.
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver {solver}, supported: {', '.join(SOLVERS)}")
+    if repair is not None and repair not in REPAIRS:
+        raise ValueError(f"Unknown repair {repair}, supported: {', '.join(REPAIRS)} or None")
+    t1 = time.perf_counter()
+    if distance_matrix is None:
+        distance_matrix = DistanceMatrix(node_list)
+    if distance_matrix.edge_weight_type == "EXPLICIT":
+        raise ValueError("The decomposition needs the coordinates of the cities, EXPLICIT edge weights are not supported")
+    coordinates = distance_matrix.coordinates
+    edge_weight_type = distance_matrix.edge_weight_type
+    clusters = partitionCities(coordinates,cluster_size,partition,seed)
+    task_arguments = [(cities,coordinates[cities],edge_weight_type,solver,dict(solver_arguments or {}),restart_seed,rng_streams)
+                      for cities,restart_seed in zip(clusters, createRestartSeeds(seed,len(clusters)))]
+    sub_tours = solveClusters(task_arguments,processes)
+    centroids = np.stack([coordinates[cities].mean(axis=0) for cities in clusters])
+    tour,junctions = stitchTours(sub_tours,clusterOrder(centroids,edge_weight_type),coordinates,centroids,edge_weight_type)
+    if repair == "full" and len(clusters) > 1:
+        tour,tour_length = localSearch(tour,distance_matrix,neighbor_count)
+    elif repair == "boundary" and len(clusters) > 1:
+        labels = np.empty(len(coordinates), dtype=np.int64)
+        for label,cities in enumerate(clusters):
+            labels[cities] = label
+        neighbor_lists = distance_matrix.neighbor_lists(neighbor_count)
+        boundary = np.flatnonzero((labels[neighbor_lists] != labels[:, None]).any(axis=1))
+        boundary = np.union1d(boundary, junctions)
+        tour,tour_length = localSearch(tour,distance_matrix,neighbor_count,nodes=boundary)
+    else:
+        tour_length = calculateFitness(tour,distance_matrix)
+    t2 = time.perf_counter()
+    return tour_length,tour,t2-t1
@@ -0,0 +1,259 @@
+# Distances between the cities and the spatial index over the coordinates.
+
+import collections
+import math
+import numpy as np
+
+# All distances between the nodes are calculated once and kept in an integer NumPy matrix which is indexed by the compact
+# city IDs (Node.index). The distances are calculated as in TSPLIB for the edge weight type: EUC_2D is the 2D Euclidean
+# distance with NINT rounding (NINT(x) = int(x + 0.5)), CEIL_2D is rounded up, ATT is the pseudo-Euclidean distance and GEO
+# is the geographical distance. For EXPLICIT the given matrix is used.
+# For large instances an N x N matrix does not fit in memory. If the city count is bigger than max_matrix_cities then the
+# rows are calculated on demand from the coordinates and only the last used cache_rows rows are kept in a LRU cache.
+
+MATRIX_BLOCK_ROWS = 512
+
+def calculateDistances(coordinates1,coordinates2,edge_weight_type="EUC_2D"):
+    # Vectorized distances between the coordinates (broadcasted on the leading axes, the last axis is (x, y)).
+    if edge_weight_type == "GEO":
+        # x is the latitude and y is the longitude in DDD.MM format.
+        def radians(values):
+            degrees = np.trunc(values)
+            return 3.141592 * (degrees + 5.0 * (values - degrees) / 3.0) / 180.0
+        latitude1,longitude1 = radians(coordinates1[..., 0]),radians(coordinates1[..., 1])
+        latitude2,longitude2 = radians(coordinates2[..., 0]),radians(coordinates2[..., 1])
+        q1 = np.cos(longitude1 - longitude2)
+        q2 = np.cos(latitude1 - latitude2)
+        q3 = np.cos(latitude1 + latitude2)
+        cosine = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+        return (6378.388 * np.arccos(cosine) + 1.0).astype(np.int32)
+    squared = ((coordinates1 - coordinates2) ** 2).sum(axis=-1)
+    if edge_weight_type == "ATT":
+        pseudo = np.sqrt(squared / 10.0)
+        rounded = np.floor(pseudo + 0.5)
+        return np.where(rounded < pseudo, rounded + 1, rounded).astype(np.int32)
+    if edge_weight_type == "CEIL_2D":
+        return np.ceil(np.sqrt(squared)).astype(np.int32)
+    return np.floor(np.sqrt(squared) + 0.5).astype(np.int32)
+
+class DistanceMatrix:
+    def __init__(self, nodeList, max_matrix_cities=10000, cache_rows=256, edge_weight_type="EUC_2D", explicit_matrix=None):
+        coordinates = np.zeros((len(nodeList), 2), dtype=np.float64)
+        for node in nodeList:
+            coordinates[node.index] = (node.x, node.y)
+        self.initialize(coordinates, max_matrix_cities, cache_rows, edge_weight_type, explicit_matrix)
+
+    def initialize(self, coordinates, max_matrix_cities, cache_rows, edge_weight_type, explicit_matrix):
+        self.city_count = len(coordinates)
+        self.coordinates = coordinates
+        self.edge_weight_type = edge_weight_type
+        self.cache_rows = cache_rows
+        self.row_cache = collections.OrderedDict()
+        self.grid = None
+        self.neighbor_cache = {}
+        self.coordinate_list = None
+        if explicit_matrix is not None:
+            self.matrix = explicit_matrix
+        elif edge_weight_type == "EXPLICIT":
+            raise ValueError("EXPLICIT edge weight type needs the explicit matrix")
+        elif self.city_count <= max_matrix_cities:
+            # The matrix is filled in blocks of rows, so the float temporaries of calculate_rows stay small.
+            self.matrix = np.empty((self.city_count, self.city_count), dtype=np.int32)
+            for start in range(0, self.city_count, MATRIX_BLOCK_ROWS):
+                rows = np.arange(start, min(start + MATRIX_BLOCK_ROWS, self.city_count))
+                self.matrix[rows] = self.calculate_rows(rows)
+        else:
+            self.matrix = None
+
+    @classmethod
+    def from_coordinates(cls, coordinates, max_matrix_cities=10000, cache_rows=256, edge_weight_type="EUC_2D",
+                         explicit_matrix=None):
+        distance_matrix = cls.__new__(cls)
+        distance_matrix.initialize(coordinates, max_matrix_cities, cache_rows, edge_weight_type, explicit_matrix)
+        return distance_matrix
+
+    @classmethod
+    def from_arrays(cls, coordinates, matrix=None, cache_rows=256, edge_weight_type="EUC_2D"):
+        # Creates a DistanceMatrix on already calculated arrays without copying them. (e.g. arrays in shared memory)
+        return cls.from_coordinates(coordinates, 0, cache_rows, edge_weight_type, matrix)
+
+    def spatial_grid(self):
+        # The spatial index over the coordinates is created on first use. It is only used for the Euclidean edge weight
+        # types, for the others None is returned.
+        if self.edge_weight_type not in ("EUC_2D", "CEIL_2D"):
+            return None
+        if self.grid is None:
+            self.grid = SpatialGrid(self.coordinates, edge_weight_type=self.edge_weight_type)
+        return self.grid
+
+    def neighbor_lists(self, k):
+        # Returns the (N, k) array of the k nearest cities of every city. (Candidate lists) Without a spatial grid the rows
+        # of the matrix are sorted.
+        if k not in self.neighbor_cache:
+            if self.spatial_grid() is not None:
+                self.neighbor_cache[k] = self.spatial_grid().k_nearest(k)
+            else:
+                self.neighbor_cache[k] = self.sorted_rows(k)
+        return self.neighbor_cache[k]
+
+    def sorted_rows(self, k):
+        k = min(k, self.city_count - 1)
+        neighbors = np.zeros((self.city_count, max(k, 0)), dtype=np.int32)
+        for i in range(self.city_count if k > 0 else 0):
+            row = self.row(i).astype(np.int64)
+            row[i] = np.iinfo(np.int64).max
+            neighbors[i] = np.argsort(row, kind='stable')[:k]
+        return neighbors
+
+    def calculate_rows(self, indices):
+        # Calculates the distances from the given cities to all cities. The output shape is (len(indices), N).
+        return calculateDistances(self.coordinates[indices, np.newaxis, :], self.coordinates[np.newaxis, :, :],
+                                  self.edge_weight_type)
+
+    def row(self, i):
+        # Returns the distances from city i to all cities.
+        if self.matrix is not None:
+            return self.matrix[i]
+        row = self.row_cache.get(i)
+        if row is None:
+            row = self.calculate_rows(np.array([i]))[0]
+            self.row_cache[i] = row
+            if len(self.row_cache) > self.cache_rows:
+                self.row_cache.popitem(last=False)
+        else:
+            self.row_cache.move_to_end(i)
+        return row
+
+    def distance(self, i, j):
+        if self.matrix is not None:
+            return int(self.matrix[i, j])
+        if self.edge_weight_type in ("EUC_2D", "CEIL_2D"):
+            # Same arithmetic as calculateDistances on Python floats, a NumPy call costs more than the distance itself.
+            if self.coordinate_list is None:
+                self.coordinate_list = self.coordinates.tolist()
+            x1,y1 = self.coordinate_list[i]
+            x2,y2 = self.coordinate_list[j]
+            length = math.sqrt((x1 - x2) * (x1 - x2) + (y1 - y2) * (y1 - y2))
+            return math.ceil(length) if self.edge_weight_type == "CEIL_2D" else math.floor(length + 0.5)
+        return int(calculateDistances(self.coordinates[i], self.coordinates[j], self.edge_weight_type))
+
+    def distances(self, i, j):
+        # Vectorized distance lookup for the city index arrays i and j.
+        if self.matrix is not None:
+            return self.matrix[i, j]
+        return calculateDistances(self.coordinates[i], self.coordinates[j], self.edge_weight_type)
+
+    def tour_length(self, indices):
+        # Calculates the total cyclic distance of the given city indices with one vectorized operation.
+        indices = np.asarray(indices)
+        next_indices = np.roll(indices, -1)
+        return int(self.distances(indices, next_indices).sum())
+
+
+# Spatial index: The coordinates are placed in a uniform grid with about points_per_cell cities per cell. The cities of a
+# cell are stored contiguously (sorted by city index) so the cities of a cell are a slice of self.points. The nearest
+# cities are searched ring by ring around the cell of a city. The cities are ordered by the rounded distance and then by
+# the city index, which is the same order in which a full scan with argmin selects them. A city in a cell of ring r+1 is at
+# least r*cell_size far away, so the search stops when the rounded distance of the found city is surely smaller than that.
+
+class SpatialGrid:
+    def __init__(self, coordinates, points_per_cell=2, edge_weight_type="EUC_2D"):
+        self.coordinates = coordinates
+        self.edge_weight_type = edge_weight_type
+        city_count = len(coordinates)
+        self.origin = coordinates.min(axis=0)
+        extent = coordinates.max(axis=0) - self.origin
+        cell_count = max(city_count / points_per_cell, 1)
+        # Square cells of about points_per_cell cities. The cells are at least extent.max() / cell_count wide, so a thin
+        # (nearly collinear) instance gets a row of cells instead of far too many cells with a tiny cell size.
+        self.cell_size = float(max(extent.max() / cell_count, 1e-9))
+        if extent[0] > 0 and extent[1] > 0:
+            self.cell_size = max(float(np.sqrt(extent[0] * extent[1] / cell_count)), self.cell_size)
+        self.grid_x = int(extent[0] // self.cell_size) + 1
+        self.grid_y = int(extent[1] // self.cell_size) + 1
+        self.cell_count = self.grid_x * self.grid_y
+        cell_xy = ((coordinates - self.origin) // self.cell_size).astype(np.int64)
+        self.cell_x = np.minimum(cell_xy[:, 0], self.grid_x - 1)
+        self.cell_y = np.minimum(cell_xy[:, 1], self.grid_y - 1)
+        self.cell_of_point = self.cell_x * self.grid_y + self.cell_y
+        self.points = np.argsort(self.cell_of_point, kind='stable').astype(np.int32)
+        self.cell_start = np.zeros(self.cell_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.cell_of_point, minlength=self.cell_count), out=self.cell_start[1:])
+
+    def rounded_distances(self, points, candidates):
+        # Rounded distances between all points and all candidates. Output shape: (len(points), len(candidates))
+        return calculateDistances(self.coordinates[points][:, np.newaxis, :], self.coordinates[candidates][np.newaxis, :, :],
+                                  self.edge_weight_type).astype(np.int64)
+
+    def cell_points(self, cell):
+        return self.points[self.cell_start[cell]:self.cell_start[cell+1]]
+
+    def block_points(self, cell_x, cell_y, r):
+        # All cities in the cells which are at most r cells away from the given cell, sorted by city index.
+        xs = np.arange(max(cell_x - r, 0), min(cell_x + r + 1, self.grid_x))
+        ys = np.arange(max(cell_y - r, 0), min(cell_y + r + 1, self.grid_y))
+        cells = (xs[:, np.newaxis] * self.grid_y + ys[np.newaxis, :]).ravel()
+        return np.sort(np.concatenate([self.cell_points(cell) for cell in cells]))
+
+    def ring_cells(self, cell_x, cell_y, r):
+        # The cells which are exactly r cells away from the given cell.
+        if r == 0:
+            return [cell_x * self.grid_y + cell_y]
+        cells = []
+        for x in range(max(cell_x - r, 0), min(cell_x + r + 1, self.grid_x)):
+            if x == cell_x - r or x == cell_x + r:
+                ys = range(max(cell_y - r, 0), min(cell_y + r + 1, self.grid_y))
+            else:
+                ys = [y for y in (cell_y - r, cell_y + r) if 0 <= y < self.grid_y]
+            for y in ys:
+                cells.append(x * self.grid_y + y)
+        return cells
+
+    def k_nearest(self, k):
+        # The k nearest cities of every city. The cities of a cell are processed together.
+        city_count = len(self.coordinates)
+        k = min(k, city_count - 1)
+        neighbors = np.zeros((city_count, max(k, 0)), dtype=np.int32)
+        if k <= 0:
+            return neighbors
+        max_ring = max(self.grid_x, self.grid_y)
+        for cell in np.flatnonzero(np.diff(self.cell_start)):
+            points = self.cell_points(cell)
+            cell_x, cell_y = divmod(int(cell), self.grid_y)
+            r = 1
+            while True:
+                candidates = self.block_points(cell_x, cell_y, r)
+                distances = self.rounded_distances(points, candidates)
+                distances[candidates[np.newaxis, :] == points[:, np.newaxis]] = np.iinfo(np.int64).max
+                order = np.argsort(distances, axis=1, kind='stable')[:, :k]
+                if len(candidates) > k:
+                    kth_distances = distances[np.arange(len(points)), order[:, -1]]
+                    if (kth_distances + 0.5 < r * self.cell_size).all():
+                        break
+                if r >= max_ring:
+                    break
+                r = r + 1
+            neighbors[points] = candidates[order]
+        return neighbors
+
+    def nearest_unvisited(self, point, visited, cell_unvisited):
+        # The nearest not visited city to the given city. cell_unvisited keeps the number of not visited cities of every
+        # cell so the empty cells are skipped.
+        cell_x = int(self.cell_x[point])
+        cell_y = int(self.cell_y[point])
+        best = None
+        best_distance = None
+        for r in range(max(self.grid_x, self.grid_y) + 1):
+            for cell in self.ring_cells(cell_x, cell_y, r):
+                if cell_unvisited[cell] == 0:
+                    continue
+                candidates = self.cell_points(cell)
+                candidates = candidates[~visited[candidates]]
+                distances = self.rounded_distances([point], candidates)[0]
+                for candidate, distance in zip(candidates.tolist(), distances.tolist()):
+                    if best is None or (distance, candidate) < (best_distance, best):
+                        best = candidate
+                        best_distance = distance
+            if best is not None and best_distance + 0.5 < r * self.cell_size:
+                break
+        return best
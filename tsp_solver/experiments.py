@@ -0,0 +1,119 @@
+# The experiments of the paper. Run them from the command line:
+#     python -m tsp_solver 1            # Experiment 1: SA with different cooling schedules.
+#     python -m tsp_solver 2            # Experiment 2: GA - SA comparison.
+# Nothing is run at import time; the solver itself can be imported without the experiments.
+# The SA restarts are seeded generate_SA runs (runParallelSA): the SA of the paper with the random module and the 2.71828
+# base (the seeds of the restarts are derived per restart, see parallel.py, and the best result also counts the route
+# after the last accepted move, which the loop of the paper missed). With
+# --batch-sa they are run as the chains of one batch SA (runBatchSA) instead. That is faster, but it draws from a NumPy
+# Generator, accepts with np.exp and returns the best-ever length of every chain, so its results are different.
+
+import argparse
+import os
+
+from .distance import DistanceMatrix
+from .loader import read_tsp
+from .parallel import runParallelGA, runParallelSA
+from .sa import runBatchSA
+
+# (file name, number of cities, number of GA generations of experiment 2)
+TOPOLOGIES = [('kroA100.tsp', 100, 2970),     # Num of cities:100, Best ratig: 21282
+              ('a280.tsp', 280, 2274)]        # Num of cities:280, Best ratig: 2579
+
+def runSACase(distance_matrix,Tmax,Tmin,moves_per_temperature,cooling_rate,run_count,seed_counter,process_count,batch_sa):
+    if batch_sa:
+        return runBatchSA(distance_matrix,Tmax,Tmin,moves_per_temperature,cooling_rate,run_count,seed_counter)
+    return runParallelSA(distance_matrix,Tmax,Tmin,moves_per_temperature,cooling_rate,run_count,seed_counter,process_count)
+
+
+# ## Experiment 1
+
+# Experiment 1: Performance of SA with Respect to different cooling schedules.
+def experiment1(file_name,city_count,run_count=100,seed_counter=1,process_count=None,batch_sa=False):
+    node_list = read_tsp(file_name,city_count)
+    distance_matrix = DistanceMatrix(node_list)
+
+    # SA CASE 1:
+
+    # SA Parameters
+    Tmax = 10000                          # Initial Temperature.
+    Tmin = 0.01                           # For the stopping condition.
+    moves_per_temperature = 10            # For the equilibrium state.
+    cooling_rate = 0.95                   # For the cooling schedule.
+
+    best_res_1,average_result_1,total_run_time_1 = runSACase(distance_matrix,Tmax,Tmin,moves_per_temperature,cooling_rate,
+                                                             run_count,seed_counter,process_count,batch_sa)
+
+    # SA CASE 2:
+
+    # SA Parameters
+    Tmax = 10000                         # Initial Temperature.
+    Tmin = 0.01                          # For the stopping condition.
+    moves_per_temperature = 2            # For the equilibrium state.
+    cooling_rate = 0.995                 # For the cooling schedule.
+
+    best_res_2,average_result_2,total_run_time_2 = runSACase(distance_matrix,Tmax,Tmin,moves_per_temperature,cooling_rate,
+                                                             run_count,seed_counter,process_count,batch_sa)
+
+    print("Case 1, Total Run Time: ",total_run_time_1,", Best Result: ",best_res_1,", Average Result: ",average_result_1)
+    print("Case 2, Total Run Time: ",total_run_time_2,", Best Result: ",best_res_2,", Average Result: ",average_result_2)
+
+
+# ## Experiment 2
+
+# Experiment 2: GA - SA comparison. The GA restarts are run in parallel with runParallelGA.
+# (process_count = None uses all cores.)
+def experiment2(file_name,city_count,generation_count,run_count=100,seed_counter=1,process_count=None,batch_sa=False):
+    node_list = read_tsp(file_name,city_count)
+    distance_matrix = DistanceMatrix(node_list)
+
+    # GA Case:
+
+    # GA Parameters:
+    mutation_probability = 0.1            # The rate of mutation applied to a route.
+    nearest_neighbor_routes_rate = 0      # The rate of routes that created with the nearest neighbors within the population.
+    population_size = 50                  # Number of individuals in the population.
+    mating_pool_individuals_count = 5     # Number of individuals in a single mating pool
+    crossover_operator = "OX"             # "OX" for Ordered Crossover Operator, "SCX" Sequential Constructive Crossover.
+    mutation_operator = "IVM"             # "ISM":Insertion Mutation, "IVM":Inversion Mutation, "SM":Swap Mutation,
+                                          # "RM":Random mutation
+
+    best_solution_GA,average_solution_GA,running_time_GA = runParallelGA(distance_matrix,nearest_neighbor_routes_rate,population_size,
+                                                                         crossover_operator,mutation_operator,generation_count,
+                                                                         mutation_probability,mating_pool_individuals_count,
+                                                                         run_count,seed_counter,process_count)
+
+    # SA CASE:
+
+    # SA Parameters
+    Tmax = 10000                         # Initial Temperature.
+    Tmin = 0.01                          # For the stopping condition.
+    moves_per_temperature = 2            # For the equilibrium state.
+    cooling_rate = 0.995                 # For the cooling schedule.
+
+    best_res_2,average_result_2,total_run_time_2 = runSACase(distance_matrix,Tmax,Tmin,moves_per_temperature,cooling_rate,
+                                                             run_count,seed_counter,process_count,batch_sa)
+
+    print("Case GA, Total Run Time: ",running_time_GA,", Best Result: ",best_solution_GA,", Average Result: ",average_solution_GA)
+    print("Case SA, Total Run Time: ",total_run_time_2,", Best Result: ",best_res_2,", Average Result: ",average_result_2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="tsp_solver", description="Runs the SA / GA experiments on the TSP topologies.")
+    parser.add_argument("experiment", nargs="?", choices=["1","2","all"], default="all",
+                        help="Experiment to run (default: all).")
+    parser.add_argument("--tsp-dir", default="TSP_files", help="Directory of the tsp files.")
+    parser.add_argument("--runs", type=int, default=100, help="Number of restarts of every case.")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the restarts.")
+    parser.add_argument("--processes", type=int, default=None, help="Number of worker processes (default: all cores).")
+    parser.add_argument("--batch-sa", action="store_true",
+                        help="Run the SA restarts as one batch SA (faster, does not reproduce the published results).")
+    args = parser.parse_args(argv)
+
+    for experiment in (["1","2"] if args.experiment == "all" else [args.experiment]):
+        for file_name,city_count,generation_count in TOPOLOGIES:
+            file_name = os.path.join(args.tsp_dir,file_name)
+            if experiment == "1":
+                experiment1(file_name,city_count,args.runs,args.seed,args.processes,args.batch_sa)
+            else:
+                experiment2(file_name,city_count,generation_count,args.runs,args.seed,args.processes,args.batch_sa)
@@ -0,0 +1,56 @@
+# Fitness cache of the GA: The tour lengths are memoized in a bounded LRU cache keyed by a hash of the tour.
+# A tour is the same tour when it is rotated or read backwards, so the hash is calculated from the set of its undirected
+# edges (Zobrist-style): every city has a random 64 bit key, the key of the edge (a,b) is mix(key[a] ^ key[b]) and the
+# hash of the tour is the sum of its edge keys (mod 2^64). mix is a bit mixer (the finalizer of splitmix64), without it
+# the keys of the cities would cancel out.
+# The hash is calculated with one vectorized pass over the route, about the cost of calculateFitness with a distance
+# matrix, so with a matrix the cache does not make the evaluation faster. It pays off when the distances are calculated
+# from the coordinates (instances above max_matrix_cities) and for finding duplicate individuals in the population
+# (reject_duplicates of generate_GA), which uses the same hash.
+
+import collections
+import numpy as np
+
+from .routes import calculateFitness
+
+
+class FitnessCache:
+    def __init__(self, distance_matrix, size=10000, seed=0):
+        self.distance_matrix = distance_matrix
+        self.size = size
+        self.city_keys = np.random.default_rng(seed).integers(0, 1 << 63, distance_matrix.city_count, dtype=np.uint64,
+                                                              endpoint=True)
+        self.cache = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.rejected_duplicates = 0    # Counted by the GA when it drops a child that is already in the population.
+
+    def tour_hash(self, route):
+        keys = self.city_keys[route]
+        x = keys ^ np.roll(keys, -1)
+        # mix: the splitmix64 finalizer, with the wrapping arithmetic of uint64.
+        with np.errstate(over="ignore"):
+            x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+            x = x ^ (x >> np.uint64(31))
+        return int(x.sum(dtype=np.uint64))
+
+    def fitness(self, route, route_hash=None):
+        # Returns the length of the route from the cache or calculates it (and caches it).
+        if route_hash is None:
+            route_hash = self.tour_hash(route)
+        length = self.cache.get(route_hash)
+        if length is not None:
+            self.hits = self.hits + 1
+            self.cache.move_to_end(route_hash)
+            return length
+        self.misses = self.misses + 1
+        length = calculateFitness(route,self.distance_matrix)
+        self.cache[route_hash] = length
+        if len(self.cache) > self.size:
+            self.cache.popitem(last=False)
+        return length
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
@@ -0,0 +1,299 @@
+# Steady-state genetic algorithm.
+
+import functools
+import itertools
+import random
+import time
+
+from .distance import DistanceMatrix
+from . import kernels, operators
+from .kernels import resolveBackend, seedKernels
+from .local_search import localSearch
+from .operators import twoOptOperator
+from .population import History, Population, historyResults
+from .routes import calculateFitness, createNearestNeighborRoute, createRandomRoute
+
+# Initialization: 80% of the population is initialized randomly. For the remaining part, we 
+# consider nearest-neighbor strategy, a very simple and intuitive way for initialization. In 
+# this strategy, first a city x is selected randomly. Then, it selects the city that is closest to 
+# city x and that has not been selected yet; now the new city becomes the base and this 
+# step is repeated until all cities are selected. Note that it will prevent duplicates of 
+# selecting the first city “x”.
+
+def initiatePopulation(nearest_neighbor_routes_rate,population_size,nodeList,distance_matrix=None,local_search=False,
+                       rng=random):
+    # Poplution is initialized with random selected routes and with the routes created with nearest neighbor nodes.
+    # The rate between these two types of routes is determined by nearest_neighbor_routes_rate parameter.
+    # If local_search is True every individual is improved with localSearch (2-opt and Or-opt) before it is added.
+    population = []
+    population_distances = []
+    if distance_matrix is None:
+        distance_matrix = DistanceMatrix(nodeList)
+    # First initiate the individuals that is created with nearest neighbor nodes. A temporary list is used and 
+    # all selected first nodes is saved in this list in order to memorize for further selections. If the newly
+    # selected node exists in the temp list then the random selection process will repeat. 
+    tmp_list = []
+    for i in range(int(nearest_neighbor_routes_rate*population_size)):
+        individual = createNearestNeighborRoute(nodeList,distance_matrix,rng=rng)
+        while (individual[0] in tmp_list) and (len(tmp_list) < len(individual)):
+            individual = createNearestNeighborRoute(nodeList,distance_matrix,rng=rng)
+        tmp_list.append(int(individual[0]))
+        if len(tmp_list) == len(individual)+1:
+            break
+        population.append(individual)
+        
+    # Second initiate the individuals that is created with randomly selected nodes.
+    for i in range(population_size - int(nearest_neighbor_routes_rate*population_size)):
+        individual = createRandomRoute(nodeList,rng)
+        population.append(individual)
+    
+    # Calculate all distances of all routes in the population for later use.
+    for i in range(len(population)):
+        if local_search:
+            population[i],route_distance = localSearch(population[i],distance_matrix)
+            population_distances.append(route_distance)
+        else:
+            population_distances.append(calculateFitness(population[i],distance_matrix))
+        
+    return population,population_distances
+
+
+def calculateBestFitness(population_distances):
+    return min(population_distances)
+
+def calculateAverageFitness(population_distances):
+    return sum(population_distances) / len(population_distances)
+
+
+def parentSelection(population,population_distances,mating_pool_individuals_count,rng=random):
+    # This function create a mating pool with 5 individuals selected randomly from the population.
+    mating_pool = []
+    for individual in range(mating_pool_individuals_count):
+        mating_pool.append(int(rng.random() * len(population)))
+    
+    # After the mating pool which includes parent indices taken randomly from population is created, the two parents that have
+    # minimum total distance will be elected as mating parents.
+    # Selection of first parent:
+    minimum_distance = 1000000000
+    elected_parent1 = None
+    for route_indice in mating_pool:
+        total_distance = population_distances[route_indice]
+        if total_distance < minimum_distance:
+            minimum_distance = total_distance
+            elected_parent1 = route_indice
+    mating_pool.remove(elected_parent1)
+    # Selection of second parent:
+    minimum_distance = 1000000000
+    elected_parent2 = None
+    for route_indice in mating_pool:
+        total_distance = population_distances[route_indice]
+        if total_distance < minimum_distance:
+            minimum_distance = total_distance
+            elected_parent2 = route_indice        
+    
+    return (population[elected_parent1],population[elected_parent2])
+
+def survivorSelection(child,population,population_distances,distance_matrix,reject_duplicates=False):
+    # Since the algorithm is a steady-state GA in each iteration, only a part of the population is replaced by the offsprings.
+    # The offsprings will be written in place of two worst individuals of the population
+    # A Population store finds the worst individual with its heap instead of scanning the distances. If it has a
+    # FitnessCache the fitness is taken from the cache and, with reject_duplicates, a child which is already in the
+    # population is dropped instead of taking the place of another individual.
+    if isinstance(population,Population):
+        fitness_cache = population.fitness_cache
+        if fitness_cache is None:
+            population.replace(population.worst_indice(),child,calculateFitness(child,distance_matrix))
+            return population,population.distances
+        child_hash = fitness_cache.tour_hash(child)
+        if reject_duplicates and population.contains(child_hash):
+            fitness_cache.rejected_duplicates = fitness_cache.rejected_duplicates + 1
+            return population,population.distances
+        population.replace(population.worst_indice(),child,fitness_cache.fitness(child,child_hash),child_hash)
+        return population,population.distances
+    
+    #Get worst individual from the population for replacing with the child.
+    worst_individual_indice = population_distances.index(max(population_distances))
+    
+    # Replace the given child with the least performing individual in the population.
+    population[worst_individual_indice] = child
+    population_distances[worst_individual_indice] = calculateFitness(child,distance_matrix)
+    return population,population_distances
+
+
+# A final function to perform a single iteration based on given inputs.
+# m, n, k: Every k generations m randomly selected individuals are improved with twoOptOperator (n random 2-opt tries) or,
+# if local_search is True, with localSearch until they are 2-opt/Or-opt local optima. (n is not used then.)
+# stopping: Optional StoppingCondition. The evaluations are the evaluated children. With a stopping condition
+# generation_count can be None, then the GA runs until the condition is reached.
+# The "time" column of df_best_rank_for_all_iterations is the wall clock time in seconds at the end of the generation.
+# history_interval: df_best_rank_for_all_iterations has a row for every history_interval th generation (and the last one).
+# The rows are kept in memory for the whole run, O(generation_count / history_interval), so a long run should stream
+# its convergence to a recorder instead. "auto" (default) is 1 without a recorder and None (only the last generation)
+# with a recorder. With history_interval=None the two returned tables are NumPy arrays instead of DataFrames (see
+# historyResults) and pandas is not imported.
+# The population is kept in a Population store, so the worst, the best and the average of a generation are not found by
+# scanning the population.
+# fitness_cache: Optional FitnessCache. The fitness of the children and of the 2-opt improved individuals is taken from it
+# and, if reject_duplicates is True, the children which are already in the population are dropped.
+# migration: Optional Migration of the island model (see islands.py). Every migration.interval generations the best
+# individuals are sent to the other islands and the received individuals replace the worst ones with survivorSelection.
+# profiler: Optional Profiler (see profiler.py) which times the selection, crossover, mutation, survivor and 2-opt phases
+# and gets an event for every improvement of the best solution.
+# recorder: Optional ConvergenceRecorder (see recorder.py) which gets the best and the average solution of every
+# recorder.interval th generation as a stream. The history is off then by default (history_interval="auto"), so the
+# memory of a long run stays constant.
+# rng: The random number source of the run, the random module (default) or a RandomStream (see rng.py).
+# return_route: If True the best route of the final population is returned too, as the last item.
+def generate_GA(population,population_distances,crossover_operator,mutation_operator,generation_count,distance_matrix,m=0,n=0,k=0,
+                mutation_probability=0.1,mating_pool_individuals_count=5,local_search=False,stopping=None,history_interval="auto",
+                fitness_cache=None,reject_duplicates=False,backend="numpy",migration=None,profiler=None,
+                recorder=None,rng=random,return_route=False):
+    if generation_count is None and stopping is None:
+        raise ValueError("generation_count can only be None with a stopping condition")
+    if history_interval == "auto":
+        history_interval = None if recorder is not None else 1
+    # backend: "numpy", "numba" or "auto". With "numba" the crossover and mutation operators below are the compiled
+    # kernels with the same names (see kernels.py).
+    if resolveBackend(backend,distance_matrix) == "numba":
+        seedKernels(rng.getrandbits(32))
+        orderedCrossover = kernels.orderedCrossover
+        sequentialConstructiveCrossover = kernels.sequentialConstructiveCrossover
+        insertionMutation = kernels.insertionMutation
+        swapMutation = kernels.swapMutation
+        inversionMutation = kernels.inversionMutation
+        randomMutation = kernels.randomMutation
+    else:
+        orderedCrossover = operators.orderedCrossover
+        sequentialConstructiveCrossover = operators.sequentialConstructiveCrossover
+        insertionMutation = operators.insertionMutation
+        swapMutation = operators.swapMutation
+        inversionMutation = operators.inversionMutation
+        randomMutation = operators.randomMutation
+        if rng is not random:
+            orderedCrossover = functools.partial(orderedCrossover,rng=rng)
+            insertionMutation = functools.partial(insertionMutation,rng=rng)
+            swapMutation = functools.partial(swapMutation,rng=rng)
+            inversionMutation = functools.partial(inversionMutation,rng=rng)
+            randomMutation = functools.partial(randomMutation,rng=rng)
+    selectParents,selectSurvivor,improveTwoOpt,improveLocalSearch = parentSelection,survivorSelection,twoOptOperator,localSearch
+    if rng is not random:
+        selectParents = functools.partial(selectParents,rng=rng)
+        improveTwoOpt = functools.partial(improveTwoOpt,rng=rng)
+    if profiler is not None:
+        selectParents = profiler.timed("selection",selectParents)
+        selectSurvivor = profiler.timed("survivor",selectSurvivor)
+        improveTwoOpt = profiler.timed("two_opt",improveTwoOpt)
+        improveLocalSearch = profiler.timed("two_opt",improveLocalSearch)
+        orderedCrossover = profiler.timed("crossover",orderedCrossover)
+        sequentialConstructiveCrossover = profiler.timed("crossover",sequentialConstructiveCrossover)
+        insertionMutation = profiler.timed("mutation",insertionMutation)
+        swapMutation = profiler.timed("mutation",swapMutation)
+        inversionMutation = profiler.timed("mutation",inversionMutation)
+        randomMutation = profiler.timed("mutation",randomMutation)
+    population = Population(population,population_distances,fitness_cache)
+    population_distances = population.distances
+    history = History(generation_count if history_interval is not None else 0,history_interval or 1)
+    checkpoints = []
+    t1 = time.perf_counter()
+    if stopping is not None:
+        stopping.start()
+    if recorder is not None:
+        recorder.start()
+    evaluations = 0
+    generations = itertools.count() if generation_count is None else range(generation_count+1)
+    for i in generations:
+        # The following control is to check if 2-opt operator will be applied to the population.
+        if k != 0:
+            if i % k == 0:
+                # Apply 2-Opt operator to the randomly selected m individuals from the population.
+                for j in range(m):
+                    individual_indice = int(rng.random() * len(population))
+                    if local_search:
+                        individual,individual_distance = improveLocalSearch(population[individual_indice],distance_matrix)
+                    else:
+                        # twoOptOperator performs 2-opt operation n times to the given individual.
+                        individual = improveTwoOpt(population[individual_indice],n,distance_matrix)
+                        if fitness_cache is None:
+                            individual_distance = calculateFitness(individual,distance_matrix)
+                        else:
+                            individual_distance = fitness_cache.fitness(individual)
+                    population.replace(individual_indice,individual,individual_distance)
+                    
+        if migration is not None and i > 0 and i % migration.interval == 0:
+            for migrant in migration.exchange(population):
+                population,population_distances = selectSurvivor(migrant,population,population_distances,distance_matrix,
+                                                                 reject_duplicates)
+
+        parent1,parent2 = selectParents(population,population_distances,mating_pool_individuals_count)
+        if crossover_operator == "OX":
+            child1,child2 = orderedCrossover(parent1,parent2)
+            if mutation_operator == "ISM":
+                mutated_child1 = insertionMutation(child1, mutation_probability)
+                mutated_child2 = insertionMutation(child2, mutation_probability)
+                population,population_distances = selectSurvivor(mutated_child1,population,population_distances,distance_matrix,
+                                                                 reject_duplicates)
+                population,population_distances = selectSurvivor(mutated_child2,population,population_distances,distance_matrix,
+                                                                 reject_duplicates)
+            elif mutation_operator == "IVM":
+                mutated_child1 = inversionMutation(child1, mutation_probability)
+                mutated_child2 = inversionMutation(child2, mutation_probability)
+                population,population_distances = selectSurvivor(mutated_child1,population,population_distances,distance_matrix,
+                                                                 reject_duplicates)
+                population,population_distances = selectSurvivor(mutated_child2,population,population_distances,distance_matrix,
+                                                                 reject_duplicates)
+            elif mutation_operator == "SM":
+                mutated_child1 = swapMutation(child1, mutation_probability)
+                mutated_child2 = swapMutation(child2, mutation_probability)
+                population,population_distances = selectSurvivor(mutated_child1,population,population_distances,distance_matrix,
+                                                                 reject_duplicates)
+                population,population_distances = selectSurvivor(mutated_child2,population,population_distances,distance_matrix,
+                                                                 reject_duplicates)
+            #elif mutation_operator == "RM":
+            else:
+                mutated_child1 = randomMutation(child1, mutation_probability)
+                mutated_child2 = randomMutation(child2, mutation_probability)
+                population,population_distances = selectSurvivor(mutated_child1,population,population_distances,distance_matrix,
+                                                                 reject_duplicates)
+                population,population_distances = selectSurvivor(mutated_child2,population,population_distances,distance_matrix,
+                                                                 reject_duplicates)
+        else:
+            child1 = sequentialConstructiveCrossover(parent1,parent2,distance_matrix)
+            if mutation_operator == "ISM":
+                mutated_child1 = insertionMutation(child1, mutation_probability)
+                population,population_distances = selectSurvivor(mutated_child1,population,population_distances,distance_matrix,
+                                                                 reject_duplicates)
+            elif mutation_operator == "IVM":
+                mutated_child1 = inversionMutation(child1, mutation_probability)
+                population,population_distances = selectSurvivor(mutated_child1,population,population_distances,distance_matrix,
+                                                                 reject_duplicates)
+            elif mutation_operator == "SM":
+                mutated_child1 = swapMutation(child1, mutation_probability)
+                population,population_distances = selectSurvivor(mutated_child1,population,population_distances,distance_matrix,
+                                                                 reject_duplicates)
+            #elif mutation_operator == "RM":
+            else:
+                mutated_child1 = randomMutation(child1, mutation_probability)
+                population,population_distances = selectSurvivor(mutated_child1,population,population_distances,distance_matrix,
+                                                                 reject_duplicates)
+        evaluations = evaluations + (2 if crossover_operator == "OX" else 1)
+        if history_interval is not None and i % history_interval == 0:
+            history.record(i,population.best(),population.average(),time.perf_counter() - t1)
+        if recorder is not None and i % recorder.interval == 0:
+            recorder.record(i,float("nan"),population.average(),population.best())
+        if profiler is not None:
+            profiler.improvement("GA",i,population.best())
+        if i == 1000 or i == 10000 or i == 20000:
+            checkpoints.append([i, population.best()])
+        if stopping is not None and stopping.should_stop(evaluations,population.best()):
+            break
+    history.finish(i,population.best(),population.average(),time.perf_counter() - t1)
+    if recorder is not None:
+        recorder.finish(i,float("nan"),population.average(),population.best())
+    if migration is not None:
+        migration.finish(population)
+    if profiler is not None:
+        profiler.finish("GA",i,time.perf_counter() - t1)
+    df,df_best_rank_for_all_iterations = historyResults(checkpoints,history,history_interval is not None)
+    if return_route:
+        return df,df_best_rank_for_all_iterations,population[population.best_indice()]
+    return df,df_best_rank_for_all_iterations
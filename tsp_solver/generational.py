@@ -0,0 +1,263 @@
+# Generational GA: generate_GA is steady-state, every iteration makes one or two children and the Python calls of the
+# operators dominate the time. generate_generational_GA makes a whole batch of offspring_count children per generation
+# with operators that work on the batch as a 2D array (one route per row):
+#   Selection : Tournaments of tournament_size random individuals for all parents of the batch at once, the shortest
+#               individual of a tournament wins.
+#   Crossover : "OX" (two children per pair of parents, both with the same cut points) or "SCX" (one child per pair). The
+#               OX children are made with array operations on the whole batch; SCX adds the cities of all children in
+#               lockstep, one city per step, and gives the same children as sequentialConstructiveCrossover.
+#   Mutation  : "ISM", "IVM", "SM" or "RM" on the children which are selected with mutation_probability, as index maps
+#               over the batch.
+#   Survivors : Truncation: the population_size shortest of the population and the children (np.argpartition).
+# The operator names are the same as in generate_GA, so the configurations of the experiments can be used with both.
+# The random numbers are drawn from a NumPy Generator: the one of a RandomStream, or one seeded from rng (so random.seed
+# gives the same run). The children are made in chunks of chunk_size pairs and every chunk gets its own seed; with
+# processes > 1 the chunks are made in a process pool (the distance matrix is shared as in parallel.py). The results do
+# not depend on the number of processes.
+
+import itertools
+import multiprocessing
+import random
+import time
+import numpy as np
+
+from .parallel import initWorker, shareDistanceMatrix, worker_state
+from .population import History, historyResults
+from .rng import RandomStream
+
+CROSSOVER_OPERATORS = ("OX", "SCX")
+MUTATION_OPERATORS = ("ISM", "IVM", "SM", "RM")
+
+
+def generationRandom(rng):
+    if isinstance(rng, RandomStream):
+        return rng.generator
+    return np.random.default_rng(rng.getrandbits(32))
+
+def tournamentSelection(distances,count,tournament_size,generator):
+    # Returns the indices of count tournament winners.
+    contestants = generator.integers(0, len(distances), (count, tournament_size))
+    return contestants[np.arange(count), np.argmin(distances[contestants], axis=1)]
+
+def routeLengths(routes,distance_matrix):
+    return distance_matrix.distances(routes, np.roll(routes, -1, axis=1)).sum(axis=1, dtype=np.int64)
+
+
+def orderedCrossoverChildren(parents1,parents2,start_orders,end_orders):
+    # orderedCrossoverChild for every row: the places start_order..end_order-1 are taken from parents1, the other places
+    # are filled from end_order on with the cities of parents2 (read from end_order on) which are not in the cut part.
+    count,n = parents1.shape
+    rows = np.arange(count)[:, None]
+    places = np.arange(n)
+    in_cut = (places >= start_orders[:, None]) & (places < end_orders[:, None])
+    visited = np.zeros((count, int(parents1.max()) + 1), dtype=bool)
+    visited[np.nonzero(in_cut)[0], parents1[in_cut]] = True
+    order = (places + end_orders[:, None]) % n
+    parent2_order = parents2[rows, order]
+    free = ~in_cut[rows, order]
+    children = parents1.copy()
+    # Every row has as many free places as not visited cities, so the row-major order of both sides matches.
+    children[np.nonzero(free)[0], order[free]] = parent2_order[~visited[rows, parent2_order]]
+    return children
+
+def batchOrderedCrossover(parents1,parents2,generator):
+    n = parents1.shape[1]
+    cuts = np.sort(generator.integers(0, n, (len(parents1), 2)), axis=1)
+    return np.concatenate((orderedCrossoverChildren(parents1,parents2,cuts[:, 0],cuts[:, 1]),
+                           orderedCrossoverChildren(parents2,parents1,cuts[:, 0],cuts[:, 1])))
+
+def batchSequentialConstructiveCrossover(parents1,parents2,distance_matrix):
+    count,n = parents1.shape
+    rows = np.arange(count)
+    size = int(parents1.max()) + 1
+    # The city after every city in the parents.
+    successors1 = np.empty((count, size), dtype=np.int32)
+    successors2 = np.empty((count, size), dtype=np.int32)
+    successors1[rows[:, None], parents1] = np.roll(parents1, -1, axis=1)
+    successors2[rows[:, None], parents2] = np.roll(parents2, -1, axis=1)
+    # All parents are permutations of the same cities. When a parent has no legitimate city, the not visited city with the
+    # smallest number is taken; sorted_indices points to it in every row.
+    sorted_nodes = np.sort(parents1[0])
+    sorted_indices = np.zeros(count, dtype=np.int64)
+    visited = np.zeros((count, size), dtype=bool)
+    children = np.empty((count, n), dtype=np.int32)
+    last_nodes = parents1[:, 0]
+    children[:, 0] = last_nodes
+    visited[rows, last_nodes] = True
+    for child_indice in range(1, n):
+        candidates1 = successors1[rows, last_nodes]
+        candidates2 = successors2[rows, last_nodes]
+        while True:
+            passed = visited[rows, sorted_nodes[sorted_indices]]
+            if not passed.any():
+                break
+            sorted_indices[passed] += 1
+        smallest = sorted_nodes[sorted_indices]
+        candidates1 = np.where(visited[rows, candidates1], smallest, candidates1)
+        candidates2 = np.where(visited[rows, candidates2], smallest, candidates2)
+        closer = distance_matrix.distances(last_nodes, candidates1) < distance_matrix.distances(last_nodes, candidates2)
+        last_nodes = np.where(closer, candidates1, candidates2)
+        children[:, child_indice] = last_nodes
+        visited[rows, last_nodes] = True
+    return children
+
+
+# Mutations of the rows of routes with the random places first and second (same meaning as the random indices of the
+# mutation operators in operators.py).
+
+def batchInsertionMutation(routes,first,second):
+    # The city at second is removed and inserted at first.
+    places = np.arange(routes.shape[1])[None, :]
+    first,second = first[:, None],second[:, None]
+    source = np.where(places < first, places, places - 1)
+    source = np.where(source >= second, source + 1, source)
+    source = np.where(places == first, second, source)
+    return np.take_along_axis(routes, source, axis=1)
+
+def batchSwapMutation(routes,first,second):
+    rows = np.arange(len(routes))
+    routes = routes.copy()
+    first_nodes = routes[rows, first]
+    routes[rows, first] = routes[rows, second]
+    routes[rows, second] = first_nodes
+    return routes
+
+def batchInversionMutation(routes,first,second):
+    # The places after the smaller place up to and including the bigger place are reversed.
+    places = np.arange(routes.shape[1])[None, :]
+    start = np.minimum(first, second)[:, None] + 1
+    end = np.maximum(first, second)[:, None] + 1
+    source = np.where((places >= start) & (places < end), start + end - 1 - places, places)
+    return np.take_along_axis(routes, source, axis=1)
+
+BATCH_MUTATIONS = {"ISM": batchInsertionMutation, "SM": batchSwapMutation, "IVM": batchInversionMutation}
+
+def batchMutation(children,mutation_operator,mutation_probability,generator):
+    # Mutates the selected rows of children in place. "RM" selects one of the three mutations for every mutated child.
+    n = children.shape[1]
+    mutated = np.flatnonzero(generator.random(len(children)) < mutation_probability)
+    if mutation_operator == "RM":
+        selections = generator.integers(0, 3, len(mutated))
+        groups = {"ISM": mutated[selections == 0], "SM": mutated[selections == 1], "IVM": mutated[selections == 2]}
+    else:
+        groups = {mutation_operator: mutated}
+    for operator, rows in groups.items():
+        if len(rows):
+            children[rows] = BATCH_MUTATIONS[operator](children[rows],generator.integers(0, n, len(rows)),
+                                                       generator.integers(0, n, len(rows)))
+    return children
+
+
+def createOffspring(parents1,parents2,crossover_operator,mutation_operator,mutation_probability,seed,distance_matrix):
+    # Children of one chunk of parent pairs and their lengths.
+    generator = np.random.default_rng(seed)
+    if crossover_operator == "OX":
+        children = batchOrderedCrossover(parents1,parents2,generator)
+    else:
+        children = batchSequentialConstructiveCrossover(parents1,parents2,distance_matrix)
+    batchMutation(children,mutation_operator,mutation_probability,generator)
+    return children,routeLengths(children,distance_matrix)
+
+def createOffspringTask(arguments):
+    return createOffspring(*arguments,worker_state["distance_matrix"])
+
+
+# mutation_probability: Probability of the mutation of a child.
+# tournament_size: Number of individuals in a tournament (the mating_pool_individuals_count of generate_GA).
+# offspring_count: Children per generation (default: the population size).
+# chunk_size: Parent pairs per chunk (one task of the process pool).
+# processes: Size of the process pool, with one process (default) the children are made in this process.
+# stopping, history_interval, profiler, recorder, rng and return_route as in generate_GA. The evaluations of the stopping
+# condition are the children. The profiler times the phases "selection", "offspring" (crossover, mutation and the lengths
+# of the children) and "survivor".
+# The return values are the same as the ones of generate_GA.
+def generate_generational_GA(population,population_distances,crossover_operator,mutation_operator,generation_count,distance_matrix,
+                             mutation_probability=0.1,tournament_size=5,offspring_count=None,chunk_size=64,processes=1,
+                             stopping=None,history_interval="auto",profiler=None,recorder=None,rng=random,return_route=False):
+    if generation_count is None and stopping is None:
+        raise ValueError("generation_count can only be None with a stopping condition")
+    if history_interval == "auto":
+        history_interval = None if recorder is not None else 1
+    if crossover_operator not in CROSSOVER_OPERATORS:
+        raise ValueError(f"Unknown crossover operator {crossover_operator}, supported: {', '.join(CROSSOVER_OPERATORS)}")
+    if mutation_operator not in MUTATION_OPERATORS:
+        raise ValueError(f"Unknown mutation operator {mutation_operator}, supported: {', '.join(MUTATION_OPERATORS)}")
+    routes = np.stack(population).astype(np.int32)
+    distances = np.array(population_distances, dtype=np.int64)
+    population_size = len(routes)
+    if offspring_count is None:
+        offspring_count = population_size
+    if offspring_count < 1:
+        raise ValueError(f"The offspring count must be at least 1, not {offspring_count}")
+    pair_count = (offspring_count + 1) // 2 if crossover_operator == "OX" else offspring_count
+    generator = generationRandom(rng)
+    history = History(generation_count if history_interval is not None else 0,history_interval or 1)
+    checkpoints = []
+    pool = None
+    blocks = []
+    if processes is not None and processes > 1:
+        blocks,descriptors = shareDistanceMatrix(distance_matrix)
+        pool = multiprocessing.Pool(processes, initializer=initWorker, initargs=(descriptors,distance_matrix.edge_weight_type))
+    t1 = time.perf_counter()
+    if stopping is not None:
+        stopping.start()
+    if recorder is not None:
+        recorder.start()
+    evaluations = 0
+    generations = itertools.count() if generation_count is None else range(generation_count+1)
+    try:
+        for i in generations:
+            phase_start = time.perf_counter()
+            parents = tournamentSelection(distances,2 * pair_count,tournament_size,generator)
+            parents1,parents2 = routes[parents[:pair_count]],routes[parents[pair_count:]]
+            starts = range(0, pair_count, chunk_size)
+            seeds = generator.integers(0, 2**32, len(starts)).tolist()
+            task_arguments = [(parents1[start:start+chunk_size],parents2[start:start+chunk_size],crossover_operator,
+                               mutation_operator,mutation_probability,seed) for start,seed in zip(starts, seeds)]
+            if profiler is not None:
+                profiler.add_time("selection",time.perf_counter() - phase_start)
+                phase_start = time.perf_counter()
+            if pool is None:
+                offspring = [createOffspring(*arguments,distance_matrix) for arguments in task_arguments]
+            else:
+                offspring = pool.map(createOffspringTask, task_arguments, chunksize=1)
+            children = np.concatenate([chunk_children for chunk_children,chunk_distances in offspring])[:offspring_count]
+            children_distances = np.concatenate([chunk_distances for chunk_children,chunk_distances in offspring])[:offspring_count]
+            if profiler is not None:
+                profiler.add_time("offspring",time.perf_counter() - phase_start,len(children))
+                phase_start = time.perf_counter()
+            # Truncation selection over the population and the children.
+            routes = np.concatenate((routes, children))
+            distances = np.concatenate((distances, children_distances))
+            survivors = np.argpartition(distances, population_size - 1)[:population_size]
+            routes,distances = routes[survivors],distances[survivors]
+            if profiler is not None:
+                profiler.add_time("survivor",time.perf_counter() - phase_start)
+            evaluations = evaluations + len(children)
+            best_result = int(distances.min())
+            if history_interval is not None and i % history_interval == 0:
+                history.record(i,best_result,distances.mean(),time.perf_counter() - t1)
+            if recorder is not None and i % recorder.interval == 0:
+                recorder.record(i,float("nan"),distances.mean(),best_result)
+            if profiler is not None:
+                profiler.improvement("GA",i,best_result)
+            if i == 1000 or i == 10000 or i == 20000:
+                checkpoints.append([i, best_result])
+            if stopping is not None and stopping.should_stop(evaluations,best_result):
+                break
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        for block in blocks:
+            block.close()
+            block.unlink()
+    history.finish(i,int(distances.min()),distances.mean(),time.perf_counter() - t1)
+    if recorder is not None:
+        recorder.finish(i,float("nan"),distances.mean(),int(distances.min()))
+    if profiler is not None:
+        profiler.finish("GA",i,time.perf_counter() - t1)
+    df,df_best_rank_for_all_iterations = historyResults(checkpoints,history,history_interval is not None)
+    if return_route:
+        return df,df_best_rank_for_all_iterations,routes[np.argmin(distances)]
+    return df,df_best_rank_for_all_iterations
@@ -0,0 +1,138 @@
+# Island model GA: island_count populations evolve with generate_GA in separate worker processes. Every
+# migration_interval generations each island sends copies of its migration_size best individuals to its neighbors and
+# the received individuals replace the worst individuals of the island (survivorSelection). The topology is
+#   "ring" : island i sends to island i+1 (the last one to the first one).
+#   "all"  : every island sends to all other islands.
+# The migrants of an island are sent as one (migration_size, N) int32 array. Every island has an inbox queue; a message
+# is (sender, routes) and an island that has finished sends (sender, None) so its neighbors don't wait for it anymore.
+# The migration is synchronous: in every migration an island waits for the migrants of all its (still running)
+# senders, so with a fixed generation_count the results only depend on the seed.
+# The distance matrix is shared with the workers in shared memory, same as the parallel restarts (parallel.py).
+
+import collections
+import multiprocessing
+import queue
+import time
+import numpy as np
+
+from .ga import generate_GA, initiatePopulation
+from .parallel import createRestartSeeds, initWorker, restartRandom, shareDistanceMatrix, worker_state
+
+TOPOLOGIES = ("ring", "all")
+
+def migrationTargets(island,island_count,topology):
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown migration topology {topology}, supported: {', '.join(TOPOLOGIES)}")
+    if island_count == 1:
+        return []
+    if topology == "ring":
+        return [(island + 1) % island_count]
+    return [target for target in range(island_count) if target != island]
+
+def migrationSources(island,island_count,topology):
+    return [source for source in range(island_count) if island in migrationTargets(source,island_count,topology)]
+
+
+class Migration:
+    def __init__(self, island, inboxes, targets, sources, interval, migration_size):
+        self.island = island
+        self.inboxes = inboxes
+        self.targets = targets
+        self.sources = list(sources)
+        self.interval = interval
+        self.migration_size = migration_size
+        # Messages which arrived from a sender before they were needed (the sender is already a migration ahead).
+        self.pending = collections.defaultdict(collections.deque)
+        self.best_route = None
+
+    def exchange(self, population):
+        # Sends the best individuals and returns the received ones.
+        best_indices = np.argsort(population.distances, kind="stable")[:self.migration_size]
+        routes = np.stack([population[indice] for indice in best_indices]).astype(np.int32)
+        for target in self.targets:
+            self.inboxes[target].put((self.island, routes))
+        migrants = []
+        for source in list(self.sources):
+            while not self.pending[source]:
+                sender,received_routes = self.inboxes[self.island].get()
+                self.pending[sender].append(received_routes)
+            received_routes = self.pending[source].popleft()
+            if received_routes is None:
+                self.sources.remove(source)
+            else:
+                migrants.extend(received_routes)
+        return migrants
+
+    def finish(self, population):
+        self.best_route = population[population.best_indice()]
+        for target in self.targets:
+            self.inboxes[target].put((self.island, None))
+
+
+def runIsland(island,island_seed,inboxes,results,descriptors,edge_weight_type,ga_arguments):
+    (island_count,topology,migration_interval,migration_size,nearest_neighbor_routes_rate,population_size,crossover_operator,
+     mutation_operator,generation_count,mutation_probability,mating_pool_individuals_count,stopping,rng_streams) = ga_arguments
+    initWorker(descriptors,edge_weight_type)
+    rng = restartRandom(island_seed,rng_streams)
+    migration = Migration(island,inboxes,migrationTargets(island,island_count,topology),
+                          migrationSources(island,island_count,topology),migration_interval,migration_size)
+    population,population_distances = initiatePopulation(nearest_neighbor_routes_rate,population_size,worker_state["node_list"],
+                                                         worker_state["distance_matrix"],rng=rng)
+    df,df_best_rank_for_all_iterations = generate_GA(population,population_distances,crossover_operator,mutation_operator,
+                                                     generation_count,worker_state["distance_matrix"],
+                                                     mutation_probability=mutation_probability,
+                                                     mating_pool_individuals_count=mating_pool_individuals_count,
+                                                     stopping=stopping,migration=migration,rng=rng)
+    results.put((island,int(df_best_rank_for_all_iterations["best_solution"].iloc[-1]),migration.best_route))
+
+def runIslandGA(distance_matrix,nearest_neighbor_routes_rate,population_size,crossover_operator,mutation_operator,
+                generation_count,mutation_probability,mating_pool_individuals_count,island_count=None,topology="ring",
+                migration_interval=100,migration_size=2,seed=1,stopping=None,rng_streams=False):
+    # Runs one island per process (island_count = None uses all cores). Returns the best result, the best route, the best
+    # results of the islands and the wall clock run time. rng_streams: see parallel.py.
+    if island_count is None:
+        island_count = multiprocessing.cpu_count()
+    migrationTargets(0,island_count,topology)
+    t1 = time.perf_counter()
+    ga_arguments = (island_count,topology,migration_interval,migration_size,nearest_neighbor_routes_rate,population_size,
+                    crossover_operator,mutation_operator,generation_count,mutation_probability,mating_pool_individuals_count,
+                    stopping,rng_streams)
+    inboxes = [multiprocessing.Queue() for island in range(island_count)]
+    results = multiprocessing.Queue()
+    blocks,descriptors = shareDistanceMatrix(distance_matrix)
+    workers = [multiprocessing.Process(target=runIsland, args=(island,island_seed,inboxes,results,descriptors,
+                                                                distance_matrix.edge_weight_type,ga_arguments))
+               for island,island_seed in enumerate(createRestartSeeds(seed,island_count))]
+    try:
+        for worker in workers:
+            worker.start()
+        island_results = [None] * island_count
+        while None in island_results:
+            try:
+                island,best_result,best_route = results.get(timeout=1)
+                island_results[island] = (best_result,best_route)
+            except queue.Empty:
+                if any(worker.exitcode not in (None, 0) for worker in workers):
+                    raise RuntimeError("An island worker process failed")
+        # The last messages of the islands are never read. They are drained, so the workers can flush their queues and
+        # exit.
+        while any(worker.is_alive() for worker in workers):
+            for inbox in inboxes:
+                try:
+                    while True:
+                        inbox.get_nowait()
+                except queue.Empty:
+                    pass
+            for worker in workers:
+                worker.join(timeout=0.01)
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        for block in blocks:
+            block.close()
+            block.unlink()
+    best_island = min(range(island_count), key=lambda island: island_results[island][0])
+    t2 = time.perf_counter()
+    return (island_results[best_island][0],island_results[best_island][1],
+            [best_result for best_result,best_route in island_results],t2-t1)
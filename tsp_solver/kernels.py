@@ -0,0 +1,245 @@
+# Compiled backend: The SA inner loop, the mutation operators and the crossovers compiled with Numba (nopython mode).
+# The backend is selected with the backend parameter of generate_SA and generate_GA:
+#   "numpy" : The Python / NumPy implementation. (default)
+#   "numba" : The compiled kernels of this module. If Numba is not installed a warning is given and "numpy" is used.
+#   "auto"  : "numba" if Numba is installed, "numpy" otherwise.
+# The kernels work on the full distance matrix, so DistanceMatrix objects without a matrix (more cities than
+# max_matrix_cities) always use "numpy".
+# The kernels draw their random numbers from the random number generator of Numba, which is seeded from the random
+# module at the start of every run (seedKernels). So a seed gives the same results again within a backend, but the
+# results of the two backends are different.
+# The kernels follow the Python operators step by step: same moves, same order of the random draws.
+
+import warnings
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+BACKENDS = ("numpy", "numba", "auto")
+
+def resolveBackend(backend,distance_matrix=None):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend}, supported: {', '.join(BACKENDS)}")
+    if backend == "numpy":
+        return "numpy"
+    if numba is None:
+        if backend == "numba":
+            warnings.warn("Numba is not installed, the numpy backend is used", RuntimeWarning)
+        return "numpy"
+    if distance_matrix is not None and distance_matrix.matrix is None:
+        return "numpy"
+    return "numba"
+
+def jit(function):
+    # Without Numba the kernels stay plain Python functions. They are not used then, but the module can be imported.
+    if numba is None:
+        return function
+    return numba.njit(cache=True)(function)
+
+
+@jit
+def seedKernels(seed):
+    np.random.seed(seed)
+
+@jit
+def randomIndice(n):
+    return int(np.random.random() * n)
+
+
+# SA
+
+@jit
+def swapDeltaKernel(route,i,j,matrix):
+    # Same as swapDelta: the edges which start at the places i-1, i, j-1 and j are replaced. An edge which appears twice
+    # (when i and j are neighbors) is counted once.
+    n = len(route)
+    if i == j:
+        return 0
+    edges = ((i-1) % n, i, (j-1) % n, j)
+    delta = 0
+    for e in range(4):
+        k = edges[e]
+        counted = True
+        for f in range(e):
+            if edges[f] == k:
+                counted = False
+        if not counted:
+            continue
+        k_next = (k+1) % n
+        a = route[k]
+        b = route[k_next]
+        a_swapped = route[j] if k == i else (route[i] if k == j else a)
+        b_swapped = route[j] if k_next == i else (route[i] if k_next == j else b)
+        delta = delta + matrix[a_swapped, b_swapped] - matrix[a, b]
+    return delta
+
+@jit
+def annealLevelKernel(route,positions,neighbor_lists,matrix,T,moves_per_temperature,fitness,best_result):
+    # The moves of one temperature level of generate_SA. When neighbor_lists has no columns the swap moves are random
+    # (generate_neighbor_move), otherwise they are candidate moves (generate_neighbor_candidate_move) and positions is
+    # kept up to date. Returns the fitness, the best result and the number of accepted moves.
+    n = len(route)
+    neighbor_count = neighbor_lists.shape[1]
+    accepted_moves = 0
+    for move in range(moves_per_temperature):
+        if neighbor_count:
+            indice = randomIndice(n)
+            neighbor = neighbor_lists[route[indice], randomIndice(neighbor_count)]
+            first = (indice+1) % n
+            second = positions[neighbor]
+        else:
+            np.random.random()
+            first = randomIndice(n)
+            second = randomIndice(n)
+        delta_E = swapDeltaKernel(route,first,second,matrix)
+        if delta_E < 0 or np.random.random() < np.exp(-delta_E/T):
+            accepted_moves = accepted_moves + 1
+            if fitness < best_result:
+                best_result = fitness
+            node = route[first]
+            route[first] = route[second]
+            route[second] = node
+            fitness = fitness + delta_E
+            if neighbor_count:
+                positions[route[first]] = first
+                positions[route[second]] = second
+    return fitness,best_result,accepted_moves
+
+
+# Mutation operators
+
+@jit
+def insertionMutationKernel(route,mutation_probability):
+    if np.random.random() < mutation_probability:
+        n = len(route)
+        insertion_indice = randomIndice(n)
+        insert_node_indice = randomIndice(n)
+        new_route = np.empty_like(route)
+        reduced_indice = 0
+        for k in range(n):
+            if k == insert_node_indice:
+                continue
+            if reduced_indice == insertion_indice:
+                reduced_indice = reduced_indice + 1
+            new_route[reduced_indice] = route[k]
+            reduced_indice = reduced_indice + 1
+        new_route[insertion_indice] = route[insert_node_indice]
+        return new_route
+    return route
+
+@jit
+def swapMutationKernel(route,mutation_probability):
+    if np.random.random() < mutation_probability:
+        new_route = route.copy()
+        first_node_indice = randomIndice(len(route))
+        second_node_indice = randomIndice(len(route))
+        new_route[first_node_indice] = route[second_node_indice]
+        new_route[second_node_indice] = route[first_node_indice]
+        return new_route
+    return route
+
+@jit
+def inversionMutationKernel(route,mutation_probability):
+    if np.random.random() < mutation_probability:
+        first_node_indice = randomIndice(len(route))
+        second_node_indice = randomIndice(len(route))
+        start_indice = min(first_node_indice,second_node_indice) + 1
+        end_indice = max(first_node_indice,second_node_indice) + 1
+        new_route = route.copy()
+        new_route[start_indice:end_indice] = route[start_indice:end_indice][::-1]
+        return new_route
+    return route
+
+@jit
+def randomMutationKernel(route,mutation_probability):
+    selection = randomIndice(3)
+    if selection == 0:
+        return insertionMutationKernel(route,mutation_probability)
+    if selection == 1:
+        return swapMutationKernel(route,mutation_probability)
+    return inversionMutationKernel(route,mutation_probability)
+
+
+# Crossover operators
+
+@jit
+def orderedCrossoverChildKernel(parent1,parent2,start_order,end_order):
+    n = len(parent1)
+    child = np.empty(n, dtype=parent1.dtype)
+    visited = np.zeros(parent1.max()+1, dtype=np.bool_)
+    for k in range(start_order,end_order):
+        child[k] = parent1[k]
+        visited[parent1[k]] = True
+    child_indice = end_order % n if n else 0
+    for k in range(n):
+        node = parent2[(end_order+k) % n]
+        if not visited[node]:
+            child[child_indice] = node
+            child_indice = (child_indice+1) % n
+    return child
+
+@jit
+def orderedCrossoverKernel(parent1,parent2):
+    orderA = randomIndice(len(parent1))
+    orderB = randomIndice(len(parent1))
+    start_order = min(orderA,orderB)
+    end_order = max(orderA,orderB)
+    return (orderedCrossoverChildKernel(parent1,parent2,start_order,end_order),
+            orderedCrossoverChildKernel(parent2,parent1,start_order,end_order))
+
+@jit
+def sequentialConstructiveCrossoverKernel(parent1,parent2,matrix):
+    n = len(parent1)
+    parent1_positions = np.empty(parent1.max()+1, dtype=np.int64)
+    parent2_positions = np.empty(parent2.max()+1, dtype=np.int64)
+    for k in range(n):
+        parent1_positions[parent1[k]] = k
+        parent2_positions[parent2[k]] = k
+    sorted_nodes = np.sort(parent1)
+    sorted_indice = 0
+    visited = np.zeros(parent1.max()+1, dtype=np.bool_)
+    child = np.empty(n, dtype=parent1.dtype)
+    last_node = parent1[0]
+    child[0] = last_node
+    visited[last_node] = True
+    for child_indice in range(1, n):
+        candidate1 = parent1[(parent1_positions[last_node]+1) % n]
+        candidate2 = parent2[(parent2_positions[last_node]+1) % n]
+        if visited[candidate1] or visited[candidate2]:
+            while visited[sorted_nodes[sorted_indice]]:
+                sorted_indice = sorted_indice + 1
+            if visited[candidate1]:
+                candidate1 = sorted_nodes[sorted_indice]
+            if visited[candidate2]:
+                candidate2 = sorted_nodes[sorted_indice]
+        if matrix[last_node, candidate1] < matrix[last_node, candidate2]:
+            last_node = candidate1
+        else:
+            last_node = candidate2
+        child[child_indice] = last_node
+        visited[last_node] = True
+    return child
+
+
+# The kernels with the signatures of the Python operators, so generate_GA can use either of them.
+
+def orderedCrossover(parent1,parent2):
+    return orderedCrossoverKernel(parent1,parent2)
+
+def sequentialConstructiveCrossover(parent1,parent2,distance_matrix):
+    return sequentialConstructiveCrossoverKernel(parent1,parent2,distance_matrix.matrix)
+
+def insertionMutation(route,mutation_probability):
+    return insertionMutationKernel(route,mutation_probability)
+
+def swapMutation(route,mutation_probability):
+    return swapMutationKernel(route,mutation_probability)
+
+def inversionMutation(route,mutation_probability):
+    return inversionMutationKernel(route,mutation_probability)
+
+def randomMutation(route,mutation_probability):
+    return randomMutationKernel(route,mutation_probability)
@@ -0,0 +1,195 @@
+# Reading the TSPLIB files.
+
+import os
+import numpy as np
+
+from .distance import DistanceMatrix
+
+# Each node is being represented with a Node class. Nodes are only used for reading the tsp file and for the output, the
+# routes themselves are int32 NumPy arrays of city indices.
+# The index is the compact city ID (0..N-1) that is used to address the rows and columns of the DistanceMatrix.
+class Node:
+    __slots__ = ("x", "y", "node_id", "index")
+
+    def __init__(self, node_id, x, y, index=None):
+        self.x = x
+        self.y = y
+        self.node_id = node_id
+        self.index = node_id - 1 if index is None else index
+    
+    # The distance function calculates EUC_2D distance between the existing node to a given node. EUC_2D is the
+    # 2D Euclidean distance. Round operation is used to round the float number to the nearest integer.(It has same
+    # functionality with NINT() in C.)
+    def distance(self, node):
+        xDis = abs(self.x - node.x)
+        yDis = abs(self.y - node.y)
+        distance = round(np.sqrt((xDis ** 2) + (yDis ** 2)))
+        return distance
+    
+    def __repr__(self):
+        #return "(" + str(self.x) + "," + str(self.y) + ")"
+        return str(self.node_id)
+
+
+# The tsp file is parsed directly into NumPy arrays. The header lines (KEY : VALUE) are read until the first section. The
+# numbers of NODE_COORD_SECTION, DISPLAY_DATA_SECTION and EDGE_WEIGHT_SECTION are read chunk by chunk into preallocated
+# arrays, so also very large files are read with a constant amount of Python objects. The supported EDGE_WEIGHT_TYPEs
+# are EUC_2D, CEIL_2D, GEO, ATT and EXPLICIT (with all EDGE_WEIGHT_FORMATs of symmetric matrices).
+# The parsed array (the coordinates, or the matrix for EXPLICIT) is saved as a .npy file next to the tsp file. In the next
+# loads this file is memory-mapped if it is newer than the tsp file, so only the header of the tsp file is read again.
+# The DISPLAY_DATA_SECTION of an EXPLICIT file is saved as a second .npy file (.DISPLAY.npy).
+
+SUPPORTED_EDGE_WEIGHT_TYPES = ("EUC_2D", "CEIL_2D", "GEO", "ATT", "EXPLICIT")
+
+def read_tsp_header(file):
+    # Reads the KEY : VALUE lines until the first section. Returns the header dictionary and the section keyword.
+    header = {}
+    for line in file:
+        line = line.strip()
+        if not line:
+            continue
+        keyword = line.split(":")[0].strip().upper()
+        if keyword.endswith("_SECTION") or keyword == "EOF":
+            return header,keyword
+        header[keyword] = line.partition(":")[2].strip()
+    return header,"EOF"
+
+def read_section_numbers(file,count,chunk_size=65536):
+    # Reads the next count numbers of a section into a float64 array. The tokens are converted chunk by chunk.
+    numbers = np.empty(count, dtype=np.float64)
+    filled = 0
+    tokens = []
+    for line in file:
+        tokens.extend(line.split())
+        if len(tokens) >= chunk_size or filled + len(tokens) >= count:
+            take = min(len(tokens), count - filled)
+            numbers[filled:filled+take] = np.array(tokens[:take], dtype=np.float64)
+            filled = filled + take
+            tokens = []
+            if filled == count:
+                break
+    if filled < count:
+        raise ValueError(f"{file.name}: expected {count} numbers in the section but found {filled}")
+    return numbers
+
+def read_coordinates_section(file,dimension):
+    # Every line of the section is: node_id x y. The node ids are 1..DIMENSION.
+    values = read_section_numbers(file,3*dimension).reshape(dimension, 3)
+    coordinates = np.zeros((dimension, 2), dtype=np.float64)
+    coordinates[values[:, 0].astype(np.int64) - 1] = values[:, 1:]
+    return coordinates
+
+def read_explicit_matrix(file,dimension,edge_weight_format):
+    # Builds the symmetric matrix from the EDGE_WEIGHT_SECTION. A column-wise upper triangle has the same order as a
+    # row-wise lower triangle (and the other way around) for a symmetric matrix.
+    triangles = {"UPPER_ROW": (np.triu_indices, 1), "LOWER_ROW": (np.tril_indices, -1),
+                 "UPPER_DIAG_ROW": (np.triu_indices, 0), "LOWER_DIAG_ROW": (np.tril_indices, 0),
+                 "UPPER_COL": (np.tril_indices, -1), "LOWER_COL": (np.triu_indices, 1),
+                 "UPPER_DIAG_COL": (np.tril_indices, 0), "LOWER_DIAG_COL": (np.triu_indices, 0)}
+    if edge_weight_format == "FULL_MATRIX":
+        values = read_section_numbers(file,dimension*dimension).reshape(dimension, dimension)
+    elif edge_weight_format in triangles:
+        triangle_indices,diagonal_offset = triangles[edge_weight_format]
+        rows,columns = triangle_indices(dimension, diagonal_offset)
+        values = np.zeros((dimension, dimension), dtype=np.float64)
+        values[rows, columns] = read_section_numbers(file,len(rows))
+        values[columns, rows] = values[rows, columns]
+    else:
+        raise ValueError(f"{file.name}: EDGE_WEIGHT_FORMAT {edge_weight_format} is not supported")
+    dtype = np.int32 if values.max() < np.iinfo(np.int32).max else np.int64
+    return values.astype(dtype)
+
+def parse_tsp(file_name):
+    # Returns the header, the coordinates (None for EXPLICIT files without display data) and the explicit matrix (None if
+    # the distances are calculated from the coordinates).
+    coordinates = None
+    explicit_matrix = None
+    with open(file_name) as file:
+        header,keyword = read_tsp_header(file)
+        while keyword != "EOF":
+            dimension = int(header["DIMENSION"])
+            if keyword == "NODE_COORD_SECTION" or (keyword == "DISPLAY_DATA_SECTION" and coordinates is None):
+                coordinates = read_coordinates_section(file,dimension)
+            elif keyword == "DISPLAY_DATA_SECTION":
+                # The display data of a file with node coordinates is not used. It has DIMENSION lines and no -1.
+                read_coordinates_section(file,dimension)
+            elif keyword == "EDGE_WEIGHT_SECTION":
+                explicit_matrix = read_explicit_matrix(file,dimension,header.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX"))
+            else:
+                # The other sections (e.g. FIXED_EDGES_SECTION, TOUR_SECTION) are not used. They end with -1.
+                for line in file:
+                    if line.strip() == "-1":
+                        break
+            more_header,keyword = read_tsp_header(file)
+            header.update(more_header)
+    return header,coordinates,explicit_matrix
+
+def isFreshCache(cache_file,file_name):
+    return os.path.exists(cache_file) and os.path.getmtime(cache_file) >= os.path.getmtime(file_name)
+
+def saveCache(cache_file,array):
+    # The cache is written to a temporary file first so a reader never sees a half written cache.
+    try:
+        temporary_file = cache_file + "." + str(os.getpid()) + ".tmp"
+        with open(temporary_file, "wb") as file:
+            np.save(file, array)
+        os.replace(temporary_file, cache_file)
+    except OSError:
+        pass
+
+def load_tsp_arrays(file_name,use_cache=True):
+    # Returns the edge weight type, the coordinates and the explicit matrix of the tsp file, from the .npy cache if possible.
+    # The display coordinates of an EXPLICIT file are cached in a second file, which is written before the matrix.
+    with open(file_name) as file:
+        header,keyword = read_tsp_header(file)
+    edge_weight_type = header.get("EDGE_WEIGHT_TYPE", "EUC_2D").upper()
+    if edge_weight_type not in SUPPORTED_EDGE_WEIGHT_TYPES:
+        raise ValueError(f"{file_name}: EDGE_WEIGHT_TYPE {edge_weight_type} is not supported")
+    cache_file = file_name + "." + edge_weight_type + ".npy"
+    display_cache_file = file_name + ".DISPLAY.npy"
+    if use_cache and isFreshCache(cache_file,file_name):
+        cached = np.load(cache_file, mmap_mode="r")
+        if edge_weight_type == "EXPLICIT":
+            if isFreshCache(display_cache_file,file_name):
+                return edge_weight_type,np.load(display_cache_file),cached
+            return edge_weight_type,np.zeros((len(cached), 2)),cached
+        return edge_weight_type,cached,None
+    header,coordinates,explicit_matrix = parse_tsp(file_name)
+    if edge_weight_type == "EXPLICIT":
+        if coordinates is None:
+            coordinates = np.zeros((len(explicit_matrix), 2))
+        elif use_cache:
+            saveCache(display_cache_file,coordinates)
+        cached = explicit_matrix
+    else:
+        cached = coordinates
+    if use_cache:
+        saveCache(cache_file,cached)
+    return edge_weight_type,coordinates,explicit_matrix
+
+def nodesFromCoordinates(coordinates):
+    # The Node list of an (N, 2) coordinate array, the node IDs are 1..N and the indices 0..N-1.
+    return [Node(node_id = i+1, x=x, y=y, index = i)
+            for i,(x,y) in enumerate(np.asarray(coordinates, dtype=np.float64).tolist())]
+
+# All nodes of the tsp file are placed in a list. The type of the list is a Node list. If city_count is not given all
+# DIMENSION nodes are read, otherwise the first city_count nodes.
+
+def read_tsp(file_name,city_count=None):
+    edge_weight_type,coordinates,explicit_matrix = load_tsp_arrays(file_name)
+    if city_count is None:
+        city_count = len(coordinates)
+    return nodesFromCoordinates(coordinates[:city_count])
+
+def load_tsp(file_name,city_count=None,max_matrix_cities=10000):
+    # Reads the node list and creates the distance matrix of the tsp file with its own edge weight type.
+    edge_weight_type,coordinates,explicit_matrix = load_tsp_arrays(file_name)
+    if city_count is None:
+        city_count = len(coordinates)
+    node_list = read_tsp(file_name,city_count)
+    if explicit_matrix is not None:
+        explicit_matrix = np.asarray(explicit_matrix[:city_count, :city_count])
+    distance_matrix = DistanceMatrix.from_coordinates(np.asarray(coordinates[:city_count], dtype=np.float64),
+                                                      max_matrix_cities=max_matrix_cities,
+                                                      edge_weight_type=edge_weight_type,explicit_matrix=explicit_matrix)
+    return node_list,distance_matrix
@@ -0,0 +1,170 @@
+# 2-opt / Or-opt local search.
+
+import collections
+import numpy as np
+
+from .routes import calculateFitness, createPositionIndex
+from .tour import TwoLevelTour
+
+# Above this number of cities localSearch keeps the tour in a TwoLevelTour (tour_structure="auto"), where a 2-opt move
+# costs O(sqrt(N)) instead of O(N).
+TWO_LEVEL_MIN_CITIES = 5000
+
+# Local search: 2-opt and Or-opt moves are applied until no improving move is left (a local optimum of both). For every
+# node only the moves that connect the node to one of its neighbor_count nearest nodes are tried, and the moves are
+# evaluated with their delta. Don't-look bits: the nodes are kept in a queue, a node is taken from the queue and if no
+# improving move is found for it, it is not looked at again until one of its adjacent edges is changed by a move. A move can
+# also create an improving move for a node whose edges are not changed, so when the queue is empty all nodes are queued
+# again. The search ends when a full pass over all nodes does not find any improving move.
+# first_improvement: If True the first improving move of a node is applied, otherwise the best move of the node.
+# tour_structure: "array" (ArrayTour), "two_level" (TwoLevelTour, see tour.py) or "auto". The search only uses positions,
+# the cities at positions and the two moves below, so it runs on either of them. The Or-opt move of the TwoLevelTour is
+# done with 2-opt moves.
+
+def reverseSegment(route,positions,start_indice,end_indice):
+    # Reverses the cyclic path route[start_indice..end_indice] (both included). If the path is longer than half of the
+    # route the rest of the route is reversed instead, which gives the same cyclic tour.
+    n = len(route)
+    length = (end_indice - start_indice) % n + 1
+    if 2 * length > n:
+        start_indice, end_indice = (end_indice + 1) % n, (start_indice - 1) % n
+        length = n - length
+    if length < 2:
+        return
+    indices = (start_indice + np.arange(length)) % n
+    reversed_nodes = route[indices[::-1]]
+    route[indices] = reversed_nodes
+    positions[reversed_nodes] = indices
+
+def moveSegment(route,positions,segment_indice,segment_length,target_node,reverse):
+    # Or-opt move: The path of segment_length nodes starting at segment_indice is removed and inserted after target_node
+    # (reversed if reverse is True).
+    rotated = np.roll(route, -segment_indice)
+    segment = rotated[:segment_length]
+    rest = rotated[segment_length:]
+    target_indice = (positions[target_node] - segment_indice) % len(route) - segment_length
+    if reverse:
+        segment = segment[::-1]
+    route[:] = np.concatenate((rest[:target_indice+1], segment, rest[target_indice+1:]))
+    positions[route] = np.arange(len(route), dtype=np.int32)
+
+class ArrayTour:
+    # The route array and its position index.
+    def __init__(self, route):
+        self.array = route
+        self.positions = createPositionIndex(route)
+        self.position = self.positions.__getitem__
+        self.city = route.__getitem__
+
+    def route(self):
+        return self.array
+
+    def reverse(self, start_position, end_position):
+        reverseSegment(self.array,self.positions,start_position,end_position)
+
+    def move_segment(self, segment_position, segment_length, target, reverse):
+        moveSegment(self.array,self.positions,segment_position,segment_length,target,reverse)
+
+def createTour(route,tour_structure="auto"):
+    if tour_structure == "auto":
+        tour_structure = "two_level" if len(route) > TWO_LEVEL_MIN_CITIES else "array"
+    if tour_structure == "array":
+        return ArrayTour(route)
+    if tour_structure == "two_level":
+        return TwoLevelTour(route)
+    raise ValueError(f"Unknown tour structure {tour_structure}, supported: array, two_level, auto")
+
+def localSearch(route,distance_matrix,neighbor_count=10,or_opt=True,first_improvement=True,max_segment_length=3,
+                tour_structure="auto",nodes=None):
+    # nodes : If given, only these nodes are queued at the start and at the start of every pass (the nodes at the ends of
+    # the changed edges are queued too), e.g. the nodes at the borders of the clusters of a decomposed tour.
+    route = route.copy()
+    n = len(route)
+    if n < 5:
+        return route,calculateFitness(route,distance_matrix)
+    tour = createTour(route,tour_structure)
+    position = tour.position
+    city = tour.city
+    neighbor_lists = distance_matrix.neighbor_lists(neighbor_count).tolist()
+    dist = distance_matrix.distance
+    start_nodes = route.tolist() if nodes is None else [int(node) for node in nodes]
+    queue = collections.deque(start_nodes)
+    in_queue = np.zeros(int(route.max()) + 1, dtype=bool)
+    in_queue[start_nodes] = True
+    applied_moves = 0
+    
+    while True:
+        if not queue:
+            if applied_moves == 0:
+                break
+            applied_moves = 0
+            if nodes is None:
+                start_nodes = tour.route().tolist()
+            queue.extend(start_nodes)
+            in_queue[start_nodes] = True
+        a = queue.popleft()
+        in_queue[a] = False
+        best_move = None
+        best_delta = 0
+        a_indice = int(position(a))
+        a_next = int(city((a_indice+1) % n))
+        a_prev = int(city((a_indice-1) % n))
+        for c in neighbor_lists[a]:
+            c_indice = int(position(c))
+            # 2-opt with the successors: edges (a,a_next),(c,c_next) are replaced with (a,c),(a_next,c_next).
+            c_next = int(city((c_indice+1) % n))
+            if c != a_next and c_next != a:
+                delta = dist(a, c) + dist(a_next, c_next) - dist(a, a_next) - dist(c, c_next)
+                if delta < best_delta:
+                    best_delta = delta
+                    best_move = ("2-opt", (a_indice+1) % n, c_indice)
+            # 2-opt with the predecessors: edges (a_prev,a),(c_prev,c) are replaced with (a,c),(a_prev,c_prev).
+            c_prev = int(city((c_indice-1) % n))
+            if c != a_prev and c_prev != a:
+                delta = dist(a, c) + dist(a_prev, c_prev) - dist(a_prev, a) - dist(c_prev, c)
+                if delta < best_delta:
+                    best_delta = delta
+                    best_move = ("2-opt", c_indice, (a_indice-1) % n)
+            if or_opt:
+                # Or-opt: the path of 1..max_segment_length nodes starting at a is moved next to c, between c and
+                # c_next or between c_prev and c, in both orientations.
+                for segment_length in range(1, min(max_segment_length, n-3) + 1):
+                    if (c_indice - a_indice) % n < segment_length:
+                        # c is in the segment, so it is also in the longer segments.
+                        break
+                    segment_end = int(city((a_indice+segment_length-1) % n))
+                    after_segment = int(city((a_indice+segment_length) % n))
+                    removal_gain = dist(a_prev, a) + dist(segment_end, after_segment) - dist(a_prev, after_segment)
+                    for gap_start, gap_end in ((c, c_next), (c_prev, c)):
+                        # The gap can not touch the segment. (The gap (a_prev, a) is the place of the segment itself.)
+                        if gap_start == a_prev or (position(gap_start) - a_indice) % n < segment_length:
+                            continue
+                        gap_distance = dist(gap_start, gap_end)
+                        for reverse in (False, True):
+                            first_node, last_node = (segment_end, a) if reverse else (a, segment_end)
+                            delta = dist(gap_start, first_node) + dist(last_node, gap_end) - gap_distance - removal_gain
+                            if delta < best_delta:
+                                best_delta = delta
+                                best_move = ("or-opt", a_indice, segment_length, gap_start, reverse)
+            if first_improvement and best_move is not None:
+                break
+        
+        if best_move is None:
+            continue
+        applied_moves = applied_moves + 1
+        # The nodes at the ends of the changed edges are looked at again.
+        if best_move[0] == "2-opt":
+            start_indice, end_indice = best_move[1], best_move[2]
+            changed = [city((start_indice-1) % n), city(start_indice), city(end_indice), city((end_indice+1) % n)]
+            tour.reverse(start_indice,end_indice)
+        else:
+            segment_indice, segment_length, gap_start, reverse = best_move[1:]
+            changed = [city((segment_indice-1) % n), city((segment_indice+segment_length) % n), gap_start,
+                       city((position(gap_start)+1) % n), a, city((segment_indice+segment_length-1) % n)]
+            tour.move_segment(segment_indice,segment_length,gap_start,reverse)
+        for node in changed:
+            if not in_queue[node]:
+                queue.append(int(node))
+                in_queue[node] = True
+    route = tour.route()
+    return route,calculateFitness(route,distance_matrix)
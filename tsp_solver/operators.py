@@ -0,0 +1,192 @@
+# Crossover, mutation and 2-opt operators of the GA.
+
+import random
+import numpy as np
+
+from .routes import createPositionIndex, twoOptDelta
+
+# Crossover Operator: Two different crossover operators will be implemented:  
+# Order Crossover (OX) and Sequential Constructive Crossover (SCX).
+# The operators draw their random numbers from rng: the random module by default or a RandomStream (see rng.py).
+
+def orderedCrossover(parent1,parent2,rng=random):
+    # This function performs ordered crossover for given two parents. The output is a tuple of two children. 
+    
+    # First and the second cut orders are selected randomly.
+    orderA = int(rng.random() * len(parent1))
+    orderB = int(rng.random() * len(parent1))
+    start_order = min(orderA, orderB)
+    end_order = max(orderA, orderB)
+    
+    # The nodes between the start_order and end_order of parent1 are copied to child1 in same order. Also perform this
+    # operation with parent2 and child2.
+    child1 = orderedCrossoverChild(parent1,parent2,start_order,end_order)
+    child2 = orderedCrossoverChild(parent2,parent1,start_order,end_order)
+    return (child1,child2)
+
+def orderedCrossoverChild(parent1,parent2,start_order,end_order):
+    # After copying the parent1's cut part to the child, the remainder places of the child is filled with parent2's nodes.
+    # parent2 is read starting from end_order (and wrapped to the beginning) and the nodes that already exist in the child
+    # are skipped. The child is filled in the same way starting from end_order. The existing nodes are marked in a visited
+    # array so the child is created in O(N) without searching the child.
+    n = len(parent1)
+    child = np.empty(n, dtype=np.int32)
+    child[start_order:end_order] = parent1[start_order:end_order]
+    visited = np.zeros(int(parent1.max())+1, dtype=bool)
+    visited[parent1[start_order:end_order]] = True
+    parent2_order = np.roll(parent2, -end_order)
+    child_order = np.roll(np.arange(n), -end_order)[:n-(end_order-start_order)]
+    child[child_order] = parent2_order[~visited[parent2_order]]
+    return child
+
+def sequentialConstructiveCrossover(parent1,parent2,distance_matrix):
+    # Literature reference: "Genetic Algorithm for the Traveling Salesman Problem using Sequential Constructive Crossover 
+    # Operator." (Zakir H. Ahmed)
+    
+    # This function performs Sequential Constructive Crossover operation with the given two parents. And produces
+    # one child. 
+    
+    # The places of the nodes in the parents are taken from the position indexes and the nodes that are already in the
+    # child are marked in the visited array, so the child is created in O(N).
+    n = len(parent1)
+    parent1_positions = createPositionIndex(parent1).tolist()
+    parent2_positions = createPositionIndex(parent2).tolist()
+    # When there is no legitimate node in a parent, the not visited node with the smallest number is selected. The nodes
+    # are visited in increasing order by this rule so the search continues from where it stopped last time.
+    sorted_nodes = np.sort(parent1).tolist()
+    sorted_indice = 0
+    parent1 = parent1.tolist()
+    parent2 = parent2.tolist()
+    visited = [False] * (max(parent1)+1)
+    child = np.empty(n, dtype=np.int32)
+    
+    # First, the first node of parent1 is taken to child as first node.
+    last_node = parent1[0]
+    child[0] = last_node
+    visited[last_node] = True
+    
+    # Finds the next node of the last selected node of child in both parents. Then calculate the distences between the last
+    # node of the child and the next nodes in both parents. Keep the nearest node as the next node in child. Iterate this
+    # operation until the child is completed.
+    
+    for child_indice in range(1, n):
+        # Find the legitimate node for parent1 and parent2 which comes after childs last node.
+        candidate1 = parent1[(parent1_positions[last_node]+1) % n]
+        candidate2 = parent2[(parent2_positions[last_node]+1) % n]
+        if visited[candidate1] or visited[candidate2]:
+            while visited[sorted_nodes[sorted_indice]]:
+                sorted_indice = sorted_indice + 1
+            # There is no legitimate node in the parent so the candidate will be selected sequentially.
+            if visited[candidate1]:
+                candidate1 = sorted_nodes[sorted_indice]
+            if visited[candidate2]:
+                candidate2 = sorted_nodes[sorted_indice]
+                            
+        # Calculate the distances between the last node of child and the legitimate nodes selected in both parent1 and parent2.
+        dist1 = distance_matrix.distance(last_node, candidate1)
+        dist2 = distance_matrix.distance(last_node, candidate2)
+        
+        # If distance between child last node and parent1's candidate is less than child's last node and parent2's candidate
+        # then choose parent1's candidate.And choose parent2's candidate in reverse condition.
+        if dist1 < dist2:
+            last_node = candidate1
+        else:
+            last_node = candidate2
+        child[child_indice] = last_node
+        visited[last_node] = True
+    
+    return child
+
+
+# Literature reference: "Combined Mutation Operators of Genetic Algorithm for the Travelling Salesman problem"
+# (Kusum Deep, Hadush Mebrahtu) 
+
+# There will be four types of mutation operators which are the insertion mutation (ISM), 
+# the inversion mutation (IVM) and the swap mutation (SM), and the random mutation (RM).
+
+def insertionMutation(route, mutation_probability, rng=random):
+    # The insertion mutation is applied based on insertion mutation probability with first if check. 
+    if(rng.random() < mutation_probability):
+        # Both the node that is to be inserted and its place indice to be inserted is selected randomly(insertion_indice,
+        # insert_node_indice).
+        insertion_indice = int(rng.random() * len(route))
+        insert_node_indice = int(rng.random() * len(route))
+        # The insertion operation is performed based on the randomly selected values and the indexes shifted accordingly:
+        # the node is removed from the route and the remaining nodes keep their order around insertion_indice.
+        new_route = np.insert(np.delete(route, insert_node_indice), insertion_indice, route[insert_node_indice])
+        return new_route
+    return route
+                    
+
+def swapMutation(route, mutation_probability, rng=random):
+    # The swap mutation operator simply select two nodes randomly and swaps them in place.
+    if(rng.random() < mutation_probability):
+        new_route = route.copy()
+        first_node_indice = int(rng.random() * len(route))
+        second_node_indice = int(rng.random() * len(route))
+            
+        node1 = route[first_node_indice]
+        node2 = route[second_node_indice]
+
+        new_route[first_node_indice] = node2
+        new_route[second_node_indice] = node1
+
+        return new_route
+    return route
+
+def inversionMutation(route, mutation_probability, rng=random):
+    # The inversion operator randomly selects two nodes and replace the all nodes in between two random nodes in inverse 
+    # order. All remainder nodes stays as input order.
+    if(rng.random() < mutation_probability):
+        first_node_indice = int(rng.random() * len(route))
+        second_node_indice = int(rng.random() * len(route))
+        # The nodes after the smaller indice up to and including the bigger indice are placed in inverse order. All remained
+        # nodes keep their places.
+        start_indice = min(first_node_indice,second_node_indice) + 1
+        end_indice = max(first_node_indice,second_node_indice) + 1
+        new_route = route.copy()
+        new_route[start_indice:end_indice] = route[start_indice:end_indice][::-1]
+        return new_route
+    return route
+
+def randomMutation(route, mutation_probability, rng=random):
+    # Random mutation operator selects a random mutation operator among Inversion, Swap and Insertion Mutation.
+    selection = int(rng.random() * 3)
+    if selection == 0:
+        new_route = insertionMutation(route, mutation_probability, rng)
+    elif selection == 1:
+        new_route = swapMutation(route, mutation_probability, rng)
+    else:
+        new_route = inversionMutation(route, mutation_probability, rng)
+    return new_route
+
+
+def twoOptOperator(individual,n,distance_matrix,neighbor_count=0,rng=random):
+    # This function applies 2-opt on the given individual n times. 2
+    # n : 2-opt operator is applied on the selected individual n times. 
+    # neighbor_count : If it is not 0, the second node is selected among the neighbor_count nearest nodes of the first
+    # node and the path between them is reversed so that the two nodes become adjacent.
+    # The reversals are evaluated with twoOptDelta and the improving ones are applied to a copy of the individual.
+    individual = individual.copy()
+    if neighbor_count:
+        neighbor_lists = distance_matrix.neighbor_lists(neighbor_count)
+        positions = createPositionIndex(individual)
+    
+    for i in range(n):
+        if neighbor_count:
+            indice1 = int(rng.random() * len(individual))
+            candidates = neighbor_lists[individual[indice1]]
+            indice2 = positions[candidates[int(rng.random() * len(candidates))]]
+            first_node_indice = min(indice1,indice2)+1
+            second_node_indice = max(indice1,indice2)+1
+        else:
+            indice1 = int(rng.random() * len(individual))
+            indice2 = int(rng.random() * len(individual))
+            first_node_indice = min(indice1,indice2)
+            second_node_indice = max(indice1,indice2)
+        if twoOptDelta(individual,first_node_indice,second_node_indice,distance_matrix) < 0:
+            path_to_be_reversed = individual[first_node_indice:second_node_indice]
+            individual[first_node_indice:second_node_indice] = path_to_be_reversed[::-1]
+            if neighbor_count:
+                positions[path_to_be_reversed] = np.arange(first_node_indice, second_node_indice)
+    return individual
@@ -0,0 +1,124 @@
+# Process pool runner for the independent restarts of the experiments.
+
+import multiprocessing
+import random
+import time
+from multiprocessing import shared_memory
+import numpy as np
+
+from .distance import DistanceMatrix
+from .ga import generate_GA, initiatePopulation
+from .loader import nodesFromCoordinates
+from .rng import RandomStream
+from .sa import generate_SA
+
+# Parallel restarts: The experiments repeat generate_SA and generate_GA many times with independent restarts. The restarts
+# are distributed to a process pool. Every restart gets its own seed derived from the experiment seed with a NumPy
+# SeedSequence, so the results of a restart do not depend on the number of worker processes or on the order in which the
+# workers pick the restarts. The coordinates and the distance matrix are placed in shared memory once and all workers
+# attach to them, instead of pickling them for every task.
+# rng_streams: If True every restart draws from its own RandomStream (see rng.py) seeded with the restart seed, otherwise
+# the random module is seeded with it.
+
+worker_state = {}
+
+def shareDistanceMatrix(distance_matrix):
+    # Copies the arrays of the distance matrix to shared memory blocks. Returns the blocks (to be closed and unlinked by the
+    # owner) and the descriptors (name, shape, dtype) which are sent to the workers.
+    arrays = {"coordinates": distance_matrix.coordinates}
+    if distance_matrix.matrix is not None:
+        arrays["matrix"] = distance_matrix.matrix
+    blocks = []
+    descriptors = {}
+    for array_name, array in arrays.items():
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+        blocks.append(block)
+        descriptors[array_name] = (block.name, array.shape, array.dtype.str)
+    return blocks,descriptors
+
+def initWorker(descriptors,edge_weight_type):
+    # Attaches the worker process to the shared arrays and rebuilds the distance matrix and the node list on them.
+    arrays = {}
+    blocks = []
+    for array_name, (block_name, shape, dtype) in descriptors.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[array_name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    setWorkerState(DistanceMatrix.from_arrays(arrays["coordinates"], arrays.get("matrix"), edge_weight_type=edge_weight_type))
+    worker_state["blocks"] = blocks
+
+def setWorkerState(distance_matrix):
+    worker_state["distance_matrix"] = distance_matrix
+    worker_state["node_list"] = nodesFromCoordinates(distance_matrix.coordinates)
+
+def createRestartSeeds(seed,run_count):
+    # Derives one independent seed per restart from the experiment seed.
+    return [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(run_count)]
+
+def restartRandom(restart_seed,rng_streams):
+    if rng_streams:
+        return RandomStream(restart_seed)
+    random.seed(restart_seed)
+    return random
+
+def runSARestart(arguments):
+    restart_seed,Tmax,Tmin,moves_per_temperature,cooling_rate,cooling_schedule,stopping,rng_streams = arguments
+    rng = restartRandom(restart_seed,rng_streams)
+    return generate_SA(worker_state["node_list"],Tmax,Tmin,moves_per_temperature,cooling_rate,worker_state["distance_matrix"],
+                       cooling_schedule=cooling_schedule,stopping=stopping,rng=rng)
+
+def runGARestart(arguments):
+    (restart_seed,nearest_neighbor_routes_rate,population_size,crossover_operator,mutation_operator,generation_count,
+     mutation_probability,mating_pool_individuals_count,stopping,rng_streams) = arguments
+    rng = restartRandom(restart_seed,rng_streams)
+    population,population_distances = initiatePopulation(nearest_neighbor_routes_rate,population_size,worker_state["node_list"],
+                                                         worker_state["distance_matrix"],rng=rng)
+    df,df_best_rank_for_all_iterations = generate_GA(population,population_distances,crossover_operator,mutation_operator,
+                                                     generation_count,worker_state["distance_matrix"],
+                                                     mutation_probability=mutation_probability,
+                                                     mating_pool_individuals_count=mating_pool_individuals_count,
+                                                     stopping=stopping,rng=rng)
+    return int(df_best_rank_for_all_iterations["best_solution"].min())
+
+def runRestarts(task,task_arguments,distance_matrix,processes=None):
+    # Runs the task for every item of task_arguments and returns the results in the same order. With one process the
+    # restarts run in this process without a pool.
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    processes = min(processes, len(task_arguments))
+    if processes <= 1:
+        setWorkerState(distance_matrix)
+        return [task(arguments) for arguments in task_arguments]
+    blocks,descriptors = shareDistanceMatrix(distance_matrix)
+    try:
+        with multiprocessing.Pool(processes, initializer=initWorker, initargs=(descriptors,distance_matrix.edge_weight_type)) as pool:
+            return pool.map(task, task_arguments, chunksize=1)
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+def runParallelSA(distance_matrix,Tmax,Tmin,moves_per_temperature,cooling_rate,run_count=100,seed=1,processes=None,
+                  cooling_schedule="geometric",stopping=None,rng_streams=False):
+    # Returns the best result, the average result and the total run time (sum of the run times of all restarts) of
+    # run_count restarts of generate_SA. The stopping condition applies to every restart separately.
+    task_arguments = [(restart_seed,Tmax,Tmin,moves_per_temperature,cooling_rate,cooling_schedule,stopping,rng_streams)
+                      for restart_seed in createRestartSeeds(seed,run_count)]
+    results = runRestarts(runSARestart,task_arguments,distance_matrix,processes)
+    best_results = [best_result for best_result,total_num_of_generations,running_time in results]
+    total_run_time = sum(running_time for best_result,total_num_of_generations,running_time in results)
+    return min(best_results),sum(best_results)/run_count,total_run_time
+
+def runParallelGA(distance_matrix,nearest_neighbor_routes_rate,population_size,crossover_operator,mutation_operator,
+                  generation_count,mutation_probability,mating_pool_individuals_count,run_count=100,seed=1,processes=None,
+                  stopping=None,rng_streams=False):
+    # Returns the best result, the average result and the total run time (wall clock time of all restarts) of run_count
+    # restarts of generate_GA. The stopping condition applies to every restart separately.
+    t1 = time.perf_counter()
+    task_arguments = [(restart_seed,nearest_neighbor_routes_rate,population_size,crossover_operator,mutation_operator,
+                       generation_count,mutation_probability,mating_pool_individuals_count,stopping,rng_streams)
+                      for restart_seed in createRestartSeeds(seed,run_count)]
+    best_solutions = runRestarts(runGARestart,task_arguments,distance_matrix,processes)
+    t2 = time.perf_counter()
+    return min(best_solutions),sum(best_solutions)/run_count,t2-t1
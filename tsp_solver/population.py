@@ -0,0 +1,114 @@
+# Population store of the GA: The routes are kept in a list and their distances in a NumPy array. The worst and the best
+# individuals are found with a max-heap and a min-heap of (distance, indice) pairs and the average with a running sum,
+# so a generation does not scan the whole population.
+# An individual that is replaced leaves a stale entry in the heaps. Stale entries are dropped when they come to the top
+# (their distance is not the distance of the individual anymore) and the heaps are rebuilt when they grow too large.
+# Ties are broken with the smaller indice, same as population_distances.index(max(population_distances)).
+# With a FitnessCache the tour hashes of the individuals are counted too, so a duplicate of an individual can be found
+# without comparing the routes.
+
+import collections
+import heapq
+import numpy as np
+
+
+class Population:
+    def __init__(self, routes, distances, fitness_cache=None):
+        self.routes = list(routes)
+        self.distances = np.array(distances, dtype=np.int64)
+        self.total_distance = int(self.distances.sum())
+        self.fitness_cache = fitness_cache
+        if fitness_cache is not None:
+            self.hashes = [fitness_cache.tour_hash(route) for route in self.routes]
+            self.hash_counts = collections.Counter(self.hashes)
+        self.rebuild()
+
+    def rebuild(self):
+        self.worst_heap = [(-int(distance), indice) for indice,distance in enumerate(self.distances)]
+        self.best_heap = [(int(distance), indice) for indice,distance in enumerate(self.distances)]
+        heapq.heapify(self.worst_heap)
+        heapq.heapify(self.best_heap)
+
+    def __len__(self):
+        return len(self.routes)
+
+    def __getitem__(self, indice):
+        return self.routes[indice]
+
+    def contains(self, route_hash):
+        return self.hash_counts[route_hash] > 0
+
+    def replace(self, indice, route, distance, route_hash=None):
+        distance = int(distance)
+        self.total_distance = self.total_distance + distance - int(self.distances[indice])
+        if self.fitness_cache is not None:
+            if route_hash is None:
+                route_hash = self.fitness_cache.tour_hash(route)
+            self.hash_counts[self.hashes[indice]] -= 1
+            self.hash_counts[route_hash] += 1
+            self.hashes[indice] = route_hash
+        self.routes[indice] = route
+        self.distances[indice] = distance
+        if len(self.worst_heap) > 4 * len(self.routes):
+            self.rebuild()
+        else:
+            heapq.heappush(self.worst_heap, (-distance, indice))
+            heapq.heappush(self.best_heap, (distance, indice))
+
+    def worst_indice(self):
+        while -self.worst_heap[0][0] != self.distances[self.worst_heap[0][1]]:
+            heapq.heappop(self.worst_heap)
+        return self.worst_heap[0][1]
+
+    def best_indice(self):
+        while self.best_heap[0][0] != self.distances[self.best_heap[0][1]]:
+            heapq.heappop(self.best_heap)
+        return self.best_heap[0][1]
+
+    def best(self):
+        return int(self.distances[self.best_indice()])
+
+    def average(self):
+        return self.total_distance / len(self.routes)
+
+
+class History:
+    # Convergence history: One row (iteration, best, average, time) is recorded every interval iterations into a
+    # preallocated array. When the number of iterations is not known in advance the array is doubled when it is full.
+    columns = ("iteration", "best_solution", "average_solution", "time")
+
+    def __init__(self, iteration_count=None, interval=1):
+        self.interval = interval
+        capacity = 1024 if iteration_count is None else iteration_count // interval + 2
+        self.rows = np.empty((capacity, len(self.columns)))
+        self.size = 0
+        self.last_iteration = None
+
+    def record(self, iteration, best, average, time):
+        if self.size == len(self.rows):
+            self.rows = np.concatenate((self.rows, np.empty_like(self.rows)))
+        self.rows[self.size] = (iteration, best, average, time)
+        self.size = self.size + 1
+        self.last_iteration = iteration
+
+    def finish(self, iteration, best, average, time):
+        # The last iteration is always recorded.
+        if self.last_iteration != iteration:
+            self.record(iteration, best, average, time)
+
+    def array(self):
+        return self.rows[:self.size]
+
+
+def historyResults(checkpoints,history,data_frames=True):
+    # The two result tables of a GA run: the best solution at the generations 1000, 10000 and 20000 and the history. With
+    # data_frames they are pandas DataFrames (pandas is only imported here), otherwise NumPy arrays with the same columns
+    # (Generation, Best Solution and History.columns), so a run without a history report does not need pandas.
+    if not data_frames:
+        return np.array(checkpoints, dtype=np.int64).reshape(-1, 2),history.array().copy()
+    import pandas as pd
+    # The checkpoint rows are in the same order and have the same index as the rows which were inserted one by one.
+    df = pd.DataFrame(checkpoints,columns=["Generation","Best Solution"],index=range(len(checkpoints)-1,-1,-1))
+    df_best_rank_for_all_iterations = pd.DataFrame(history.array(),columns=History.columns)
+    df_best_rank_for_all_iterations = df_best_rank_for_all_iterations.astype({"iteration":int,"best_solution":int})
+    return df,df_best_rank_for_all_iterations
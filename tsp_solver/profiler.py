@@ -0,0 +1,92 @@
+# Instrumentation of the SA and GA loops. A Profiler is given to generate_SA or generate_GA with the profiler parameter.
+# Without it (the default) the loops call the plain functions; the only cost is one test per temperature level (SA) or
+# generation (GA). With a profiler the functions of the phases are replaced with wrappers (Profiler.timed) which count the
+# calls and sum their time:
+#   SA : "neighbor"     : Generation of the swap move.
+#        "evaluation"   : Delta of the move.
+#        "acceptance"   : The rest of the level: the Metropolis test and the update of the route. It is the time of the
+#                         level minus the two phases above, so it includes the overhead of the wrappers.
+#        "kernel"       : The compiled level (backend="numba"), the phases above are not separated then.
+#        "local_search" : The final localSearch.
+#   GA : "selection", "crossover", "mutation", "survivor" (fitness evaluation and replacement of the worst individual)
+#        and "two_opt" (twoOptOperator or localSearch of the k/m/n improvement).
+#   Generational GA (generational.py) : "selection", "offspring" (crossover, mutation and the lengths of the children of
+#        a generation) and "survivor".
+# The profiler also makes events, dicts with a "type":
+#   "level"       : SA temperature level: level, temperature, moves, accepted, acceptance_rate, fitness, best.
+#   "improvement" : A better best result: algorithm, iteration (SA: moves, GA: generation), best.
+#   "finish"      : End of the run: algorithm, iterations, running_time.
+# Every event is given to the callback (if any) and kept in the events list (if keep_events). summary() returns a report.
+
+import collections
+import time
+
+
+class Profiler:
+    def __init__(self, callback=None, keep_events=True):
+        self.callback = callback
+        self.keep_events = keep_events
+        self.events = []
+        self.calls = collections.defaultdict(int)
+        self.times = collections.defaultdict(float)
+        self.best_result = None
+        self.running_time = 0.0
+
+    def timed(self, phase, function):
+        calls = self.calls
+        times = self.times
+        def timed_function(*args, **kwargs):
+            t1 = time.perf_counter()
+            result = function(*args, **kwargs)
+            times[phase] = times[phase] + time.perf_counter() - t1
+            calls[phase] = calls[phase] + 1
+            return result
+        return timed_function
+
+    def add_time(self, phase, seconds, calls=1):
+        self.times[phase] = self.times[phase] + seconds
+        self.calls[phase] = self.calls[phase] + calls
+
+    def emit(self, event):
+        if self.keep_events:
+            self.events.append(event)
+        if self.callback is not None:
+            self.callback(event)
+
+    def improvement(self, algorithm, iteration, best_result):
+        # Makes an improvement event if best_result is better than the best result seen so far.
+        if self.best_result is None or best_result < self.best_result:
+            self.best_result = best_result
+            self.emit({"type": "improvement", "algorithm": algorithm, "iteration": iteration, "best": int(best_result)})
+
+    def level(self, level, temperature, moves, accepted_moves, fitness, best_result, iteration):
+        self.emit({"type": "level", "level": level, "temperature": float(temperature), "moves": moves,
+                   "accepted": int(accepted_moves), "acceptance_rate": accepted_moves / moves if moves else 0.0,
+                   "fitness": int(fitness), "best": int(best_result)})
+        self.improvement("SA", iteration, min(best_result, fitness))
+
+    def finish(self, algorithm, iterations, running_time):
+        self.running_time = self.running_time + running_time
+        self.emit({"type": "finish", "algorithm": algorithm, "iterations": iterations, "running_time": running_time})
+
+    def acceptance_rates(self):
+        # (temperature, acceptance rate) of every SA level.
+        return [(event["temperature"], event["acceptance_rate"]) for event in self.events if event["type"] == "level"]
+
+    def summary(self):
+        lines = [f"{'phase':<14} {'calls':>12} {'time (s)':>10} {'us/call':>10} {'share':>7}"]
+        for phase in sorted(self.times, key=self.times.get, reverse=True):
+            calls = self.calls[phase]
+            share = self.times[phase] / self.running_time if self.running_time else 0.0
+            lines.append(f"{phase:<14} {calls:>12} {self.times[phase]:>10.4f} {1e6 * self.times[phase] / max(calls, 1):>10.3f}"
+                         f" {100 * share:>6.1f}%")
+        lines.append(f"running time: {self.running_time:.4f} s")
+        rates = self.acceptance_rates()
+        if rates:
+            lines.append(f"levels: {len(rates)}, acceptance rate: first {rates[0][1]:.3f}, last {rates[-1][1]:.3f}, "
+                         f"mean {sum(rate for temperature,rate in rates) / len(rates):.3f}")
+        improvements = [event for event in self.events if event["type"] == "improvement"]
+        if improvements:
+            lines.append(f"improvements: {len(improvements)}, best: {improvements[-1]['best']} "
+                         f"(iteration {improvements[-1]['iteration']})")
+        return "\n".join(lines)
@@ -0,0 +1,147 @@
+# Streaming convergence output of SA and GA. A ConvergenceRecorder is given to generate_SA or generate_GA with the
+# recorder parameter. Every interval th iteration (SA: move, GA: generation) it makes a record
+#     (iteration, temperature, current, best, time)
+# current is the length of the current route (SA) or the average length of the population (GA), the temperature of the
+# GA is nan and time is the wall clock time in seconds since the start of the run. The last iteration is always recorded.
+# The records are not kept in memory: they are given to the callback and written to the sink, so the memory does not
+# grow with the length of the run.
+# Sinks (append only; the buffered records are written every flush_interval records, so the file can be followed while
+# the run goes on):
+#   CSVSink    : Text lines "iteration,temperature,current,best,time" after a header line.
+#   BinarySink : Fixed size records of RECORD_DTYPE, they can be read with np.fromfile(file_name, RECORD_DTYPE).
+# readRecords reads a whole file and followRecords is a generator which yields the records of a file as they are written
+# (e.g. for a live dashboard).
+
+import os
+import time
+import numpy as np
+
+FIELDS = ("iteration", "temperature", "current", "best", "time")
+RECORD_DTYPE = np.dtype([("iteration", "<i8"), ("temperature", "<f8"), ("current", "<f8"), ("best", "<i8"),
+                         ("time", "<f8")])
+
+
+class CSVSink:
+    def __init__(self, file_name, flush_interval=1000, append=False):
+        self.file = open(file_name, "a" if append else "w")
+        self.flush_interval = flush_interval
+        self.buffer = []
+        if self.file.tell() == 0:
+            self.file.write(",".join(FIELDS) + "\n")
+
+    def write(self, record):
+        iteration,temperature,current,best,elapsed = record
+        self.buffer.append(f"{iteration},{temperature:.6g},{current:.6g},{best},{elapsed:.6f}\n")
+        if len(self.buffer) >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        self.file.write("".join(self.buffer))
+        self.file.flush()
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+class BinarySink:
+    def __init__(self, file_name, flush_interval=1000, append=False):
+        self.file = open(file_name, "ab" if append else "wb")
+        self.buffer = np.empty(flush_interval, dtype=RECORD_DTYPE)
+        self.size = 0
+
+    def write(self, record):
+        self.buffer[self.size] = record
+        self.size = self.size + 1
+        if self.size == len(self.buffer):
+            self.flush()
+
+    def flush(self):
+        self.buffer[:self.size].tofile(self.file)
+        self.file.flush()
+        self.size = 0
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+class ConvergenceRecorder:
+    def __init__(self, sink=None, callback=None, interval=1):
+        # sink : CSVSink, BinarySink or None. callback : Called with every record. interval : Decimation, every interval th
+        # iteration is recorded.
+        if interval < 1:
+            raise ValueError(f"The recording interval must be at least 1, not {interval}")
+        self.sink = sink
+        self.callback = callback
+        self.interval = interval
+        self.start()
+
+    def start(self):
+        # Called at the start of every run.
+        self.start_time = time.perf_counter()
+        self.last_iteration = None
+        self.record_count = 0
+
+    def record(self, iteration, temperature, current, best):
+        record = (int(iteration), float(temperature), float(current), int(best), time.perf_counter() - self.start_time)
+        self.last_iteration = iteration
+        self.record_count = self.record_count + 1
+        if self.sink is not None:
+            self.sink.write(record)
+        if self.callback is not None:
+            self.callback(record)
+
+    def finish(self, iteration, temperature, current, best):
+        if self.last_iteration != iteration:
+            self.record(iteration, temperature, current, best)
+        if self.sink is not None:
+            self.sink.flush()
+
+    def close(self):
+        if self.sink is not None:
+            self.sink.close()
+
+
+def isCSV(file_name):
+    return os.path.splitext(file_name)[1].lower() == ".csv"
+
+def readRecords(file_name):
+    # Returns the records of a CSV or binary file as a structured array of RECORD_DTYPE.
+    if not isCSV(file_name):
+        return np.fromfile(file_name, dtype=RECORD_DTYPE)
+    rows = np.loadtxt(file_name, delimiter=",", skiprows=1, ndmin=2)
+    records = np.empty(len(rows), dtype=RECORD_DTYPE)
+    for column,field in enumerate(FIELDS):
+        records[field] = rows[:, column]
+    return records
+
+def followRecords(file_name, poll_interval=0.5, timeout=None):
+    # Yields the records of a CSV or binary file as tuples, also the ones which are written after the call. The generator
+    # ends when no new record came in timeout seconds (timeout = None waits forever). Partly written records are kept
+    # until the rest comes.
+    csv = isCSV(file_name)
+    with open(file_name, "r" if csv else "rb") as file:
+        if csv:
+            file.readline()
+        partial = "" if csv else b""
+        last_record_time = time.monotonic()
+        while True:
+            data = partial + file.read()
+            if csv:
+                lines = data.split("\n")
+                partial = lines.pop()
+                records = [tuple(converter(value) for converter,value in zip((int, float, float, int, float), line.split(",")))
+                           for line in lines if line]
+            else:
+                whole = len(data) - len(data) % RECORD_DTYPE.itemsize
+                partial = data[whole:]
+                records = np.frombuffer(data[:whole], dtype=RECORD_DTYPE).tolist()
+            if records:
+                last_record_time = time.monotonic()
+                yield from records
+            elif timeout is not None and time.monotonic() - last_record_time >= timeout:
+                return
+            else:
+                time.sleep(poll_interval)
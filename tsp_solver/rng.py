@@ -0,0 +1,36 @@
+# Random number streams. By default the operators and the solvers draw their random numbers from the global random module
+# (random.seed gives the same results as before). They also take an rng parameter: a RandomStream is an independent stream
+# of a NumPy Generator with the part of the interface of the random module which is used here (random, sample,
+# getrandbits). The uniform numbers are drawn from the Generator in blocks of buffer_size and random() takes the next
+# number of the block, so a draw is one C call (the __next__ of an iterator over the blocks) and the Generator is only called
+# once per block. The bounded integers are taken from the uniforms as int(random() * n), same as with the random module.
+# This is how the hot paths (the operators, parentSelection, the SA moves and the acceptance test) use the buffer: each of
+# their draws is a random() call which takes the next number of the current block.
+# Parallel runs get their own streams with spawnStreams (SeedSequence.spawn), so the results of every chain or worker
+# only depend on the seed and on its index, not on the order in which the workers run.
+
+import itertools
+import numpy as np
+
+
+class RandomStream:
+    def __init__(self, seed=None, buffer_size=65536):
+        # seed : int, SeedSequence or None.
+        self.generator = np.random.default_rng(seed)
+        self.buffer_size = buffer_size
+        self.random = itertools.chain.from_iterable(self.blocks()).__next__
+
+    def blocks(self):
+        while True:
+            yield self.generator.random(self.buffer_size).tolist()
+
+    def sample(self, population, k):
+        # k different elements of population in random order, like random.sample.
+        return [population[i] for i in self.generator.choice(len(population), k, replace=False).tolist()]
+
+    def getrandbits(self, k):
+        return int(self.generator.integers(0, 1 << k))
+
+
+def spawnStreams(seed, count, buffer_size=65536):
+    return [RandomStream(child, buffer_size) for child in np.random.SeedSequence(seed).spawn(count)]
@@ -0,0 +1,135 @@
+# Route representation, route construction, fitness and delta evaluation of the moves.
+
+import random
+import numpy as np
+
+# A route is an int32 NumPy array which holds the city indices (Node.index) in the visiting order. The position index of a
+# route is its inverse permutation: positions[city] gives the place of the city in the route.
+# The random routes are drawn from rng: the random module by default or a RandomStream (see rng.py).
+
+def createNodeIndices(nodeList):
+    return np.fromiter((node.index for node in nodeList), dtype=np.int32, count=len(nodeList))
+
+def createPositionIndex(route):
+    positions = np.empty(len(route), dtype=np.int32)
+    positions[route] = np.arange(len(route), dtype=np.int32)
+    return positions
+
+def routeToNodes(route,nodeList):
+    # Converts a route back to a Node list for the output. nodeList is expected to be in index order as read_tsp returns it.
+    return [nodeList[city] for city in route]
+
+def createRandomRoute(nodeList,rng=random):
+    # Route is created with selecting random nodes from the list. The permutation is drawn over the list positions so it is
+    # the same permutation that random.sample(nodeList, len(nodeList)) gives.
+    permutation = rng.sample(range(len(nodeList)), len(nodeList))
+    route = createNodeIndices(nodeList)[permutation]
+    return route
+
+def createNearestNeighborRoute(nodeList,distance_matrix,neighbor_count=10,rng=random):
+    node_indices = createNodeIndices(nodeList)
+    route = np.empty(len(nodeList), dtype=np.int32)
+    # The visited cities are marked in a boolean array instead of removing them from a copy of the node list. The number
+    # of not visited cities in every cell of the spatial grid is also kept for the grid search.
+    visited = np.ones(distance_matrix.city_count, dtype=bool)
+    visited[node_indices] = False
+    grid = distance_matrix.spatial_grid()
+    cell_unvisited = None
+    if grid is not None:
+        cell_unvisited = np.bincount(grid.cell_of_point[node_indices], minlength=grid.cell_count)
+    neighbor_lists = distance_matrix.neighbor_lists(neighbor_count).tolist()
+    # First select a random node from the list. And append it to the route.
+    route[0] = node_indices[rng.sample(range(len(nodeList)),1)[0]]
+    visited[route[0]] = True
+    if grid is not None:
+        cell_unvisited[grid.cell_of_point[route[0]]] -= 1
+    # Find the nearest neigbor to the last appended node in the route. And append the nearest node to the route.
+    # Iterate this until all nodes exhausted.
+    for i in range(1, len(nodeList)):
+        nearest_node = findNearestNeighbor(visited,route[i-1],distance_matrix,neighbor_lists,cell_unvisited)
+        route[i] = nearest_node
+        visited[nearest_node] = True
+        if grid is not None:
+            cell_unvisited[grid.cell_of_point[nearest_node]] -= 1
+    return route
+
+def findNearestNeighbor(visited,init_node,distance_matrix,neighbor_lists,cell_unvisited):
+    # Find the nearest not visited city to the selected init_node. The candidate list of init_node is sorted by distance
+    # (and by the city index for the same distance) so the first not visited candidate is the nearest one. If all
+    # candidates are visited, the spatial grid is searched around init_node (or the distance row for the edge weight types
+    # without a grid). In all cases the nearest city with the smallest index is selected, which is the same city that an
+    # argmin over the distance row selects.
+    for candidate in neighbor_lists[init_node]:
+        if not visited[candidate]:
+            return candidate
+    if cell_unvisited is not None:
+        return distance_matrix.spatial_grid().nearest_unvisited(init_node,visited,cell_unvisited)
+    row = distance_matrix.row(init_node)
+    return int(np.argmin(np.where(visited, np.iinfo(row.dtype).max, row)))
+
+
+def calculateFitness(route,distance_matrix):
+    # Calculates total distance of the route. The distance between the last element and the first element is also added because
+    # of the route is cyclic. All edges are looked up from the distance matrix at once.
+    return distance_matrix.tour_length(route)
+        
+def find_node(route,city):
+    # Returns the place of the given city in the route.
+    return int(np.flatnonzero(route == city)[0])
+
+
+# Delta evaluation: A move changes only a few edges of the route. The following functions return the change of the total
+# distance (new distance - old distance) of a move by looking at the affected edges only, so the cost of a move is O(1)
+# instead of the O(N) calculateFitness call. The route itself is not modified.
+
+def swapDelta(route,i,j,distance_matrix):
+    # Delta of swapping the nodes at the indices i and j. (swapMutation) Edge k is the edge between the indices k and k+1.
+    n = len(route)
+    if i == j:
+        return 0
+    def node_after_swap(k):
+        if k == i:
+            return route[j]
+        if k == j:
+            return route[i]
+        return route[k]
+    delta = 0
+    for k in {(i-1) % n, i, (j-1) % n, j}:
+        delta = delta + distance_matrix.distance(node_after_swap(k), node_after_swap((k+1) % n))
+        delta = delta - distance_matrix.distance(route[k], route[(k+1) % n])
+    return delta
+
+def twoOptDelta(route,i,j,distance_matrix):
+    # Delta of reversing the path route[i:j]. (twoOptOperator, inversionMutation) The edges (i-1,i) and (j-1,j) are
+    # replaced with (i-1,j-1) and (i,j). Reversing the whole route or a path shorter than two nodes changes nothing.
+    n = len(route)
+    if j - i < 2 or (i == 0 and j == n):
+        return 0
+    a = route[i-1]
+    b = route[i]
+    c = route[j-1]
+    d = route[j % n]
+    return (distance_matrix.distance(a, c) + distance_matrix.distance(b, d)
+            - distance_matrix.distance(a, b) - distance_matrix.distance(c, d))
+
+def insertionDelta(route,node_indice,insertion_indice,distance_matrix):
+    # Delta of removing the node at node_indice and inserting it so that it is placed at insertion_indice in the new
+    # route. (insertionMutation)
+    n = len(route)
+    if node_indice == insertion_indice or n < 3:
+        return 0
+    node = route[node_indice]
+    prev_node = route[node_indice-1]
+    next_node = route[(node_indice+1) % n]
+    delta = (distance_matrix.distance(prev_node, next_node)
+             - distance_matrix.distance(prev_node, node) - distance_matrix.distance(node, next_node))
+    # After the removal the route has n-1 nodes. The node is inserted between the (insertion_indice-1)th and the
+    # insertion_indice th nodes of this shorter route.
+    def reduced_node(k):
+        k = k % (n-1)
+        return route[k if k < node_indice else k+1]
+    before = reduced_node(insertion_indice-1)
+    after = reduced_node(insertion_indice)
+    delta = delta + (distance_matrix.distance(before, node) + distance_matrix.distance(node, after)
+                     - distance_matrix.distance(before, after))
+    return delta
@@ -0,0 +1,341 @@
+# Simulated annealing: the single chain generate_SA and the batch of chains in lockstep generate_batch_SA.
+
+import functools
+import random
+import time
+import numpy as np
+
+from .acceptance import acceptanceTable, acceptanceTableSize, calculate_acceptance_probability
+from .calibration import Calibration
+from .cooling import createCoolingSchedule
+from .distance import DistanceMatrix
+from .loader import nodesFromCoordinates
+from .kernels import annealLevelKernel, resolveBackend, seedKernels
+from .local_search import localSearch
+from .operators import swapMutation
+from .routes import calculateFitness, createNodeIndices, createPositionIndex, createRandomRoute, swapDelta
+from .tour import TwoLevelTour
+
+MOVES = ("swap", "two_opt")
+
+def generate_neighbor(route,rng=random):
+    return swapMutation(route, mutation_probability = 1, rng = rng)
+
+def generate_neighbor_move(route,rng=random):
+    # Draws the two indices of a swap move without copying the route. The random numbers are drawn in the same order as
+    # generate_neighbor (the first one is the mutation probability check of swapMutation) so the same seed gives the same
+    # results.
+    rng.random()
+    first_node_indice = int(rng.random() * len(route))
+    second_node_indice = int(rng.random() * len(route))
+    return first_node_indice,second_node_indice
+
+def generate_neighbor_candidate_move(route,positions,neighbor_lists,rng=random):
+    # Neighbor biased swap move: A random node and one of its candidate neighbors are selected. The node which comes after
+    # the selected node is swapped with the neighbor, so the selected node and its neighbor become adjacent in the route.
+    first_node_indice = int(rng.random() * len(route))
+    candidates = neighbor_lists[route[first_node_indice]]
+    neighbor = candidates[int(rng.random() * len(candidates))]
+    return (first_node_indice+1) % len(route),positions[neighbor]
+
+# 2-opt moves (move="two_opt"): the moves are given with two cities a and c instead of two places. The edges (a,next(a))
+# and (c,next(c)) are replaced with (a,c) and (next(a),next(c)) in a TwoLevelTour. route is only used as the list of the
+# cities to draw from.
+
+def generate_two_opt_move(route,rng=random):
+    first_city = route[int(rng.random() * len(route))]
+    second_city = route[int(rng.random() * len(route))]
+    return int(first_city),int(second_city)
+
+def generate_two_opt_candidate_move(route,positions,neighbor_lists,rng=random):
+    first_city = int(route[int(rng.random() * len(route))])
+    candidates = neighbor_lists[first_city]
+    return first_city,candidates[int(rng.random() * len(candidates))]
+
+def twoOptMoveDelta(tour,a,c,distance_matrix):
+    b = tour.next(a)
+    d = tour.next(c)
+    if a == c or b == c or a == d:
+        return 0
+    dist = distance_matrix.distance
+    return dist(a, c) + dist(b, d) - dist(a, b) - dist(c, d)
+
+def generate_SA(node_list,Tmax,Tmin,moves_per_temperature,cooling_rate,distance_matrix=None,neighbor_count=0,local_search=False,
+                cooling_schedule="geometric",stopping=None,backend="numpy",profiler=None,
+                recorder=None,move="swap",rng=random,return_route=False,calibration=None,initial_route=None):
+    # Tmax, Tmin, moves_per_temperature : A number or "auto". The "auto" ones are calibrated from calibration.samples
+    # sampled moves of the initial route (see calibration.py); with moves_per_temperature="auto" a level also ends when
+    # calibration.accepted_limit moves were accepted.
+    # neighbor_count : If it is not 0, the swap moves are generated from the candidate lists of the neighbor_count nearest
+    # nodes (generate_neighbor_candidate_move) instead of two uniformly random places.
+    # local_search : If True the final route is polished with localSearch (2-opt and Or-opt) after the annealing.
+    # cooling_schedule : Name of the cooling schedule (see cooling.py) or a schedule object. cooling_rate is the parameter
+    # of the named schedules.
+    # stopping : Optional StoppingCondition (time, evaluation, target length and stagnation limits). The search also stops
+    # when it is reached; stopping.reason tells which limit it was.
+    # backend : "numpy", "numba" or "auto". With "numba" the moves are done by the compiled annealLevelKernel (see
+    # kernels.py).
+    # profiler : Optional Profiler (see profiler.py) which times the phases of the moves and gets an event for every
+    # temperature level.
+    # recorder : Optional ConvergenceRecorder (see recorder.py). Every recorder.interval th move is recorded with the
+    # temperature, the current and the best length. With the numba backend the levels are recorded instead of the moves
+    # (a level which reaches a multiple of recorder.interval moves).
+    # move : "swap" or "two_opt". The 2-opt moves reverse a path of the tour; the route is kept in a TwoLevelTour (see
+    # tour.py) so a move costs O(sqrt(N)) for large instances. The numba backend only has the swap moves, "two_opt"
+    # always uses "numpy".
+    # rng : The random number source, the random module (default) or a RandomStream (see rng.py).
+    # return_route : If True the final route is returned too, as the last item. (best_result is the best length seen
+    # during the search, the final route can be longer.)
+    # calibration : Optional Calibration (see calibration.py) with the parameters of the "auto" values, after the run it
+    # has the calibrated values.
+    # initial_route : Optional start route (e.g. a local optimum to anneal at a low temperature), random by default.
+    # The running time is the wall clock time in seconds.
+    if move not in MOVES:
+        raise ValueError(f"Unknown move {move}, supported: {', '.join(MOVES)}")
+    if distance_matrix is None:
+        distance_matrix = DistanceMatrix(node_list)
+    best_result = 100000000
+    total_num_of_generations = 0
+    t1 = time.perf_counter()
+    if stopping is not None:
+        stopping.start()
+    if recorder is not None:
+        recorder.start()
+    stopped = False
+    if initial_route is None:
+        individual = createRandomRoute(node_list,rng)   # Random initiation.
+    else:
+        individual = np.array(initial_route, dtype=np.int32)
+    # The tour length is calculated once and then kept up to date with the delta of every accepted move.
+    individual_fitness = calculateFitness(individual,distance_matrix)
+    if neighbor_count:
+        neighbor_lists = distance_matrix.neighbor_lists(neighbor_count).tolist()
+        positions = createPositionIndex(individual)
+    two_opt = move == "two_opt"
+    if two_opt:
+        tour = TwoLevelTour(individual)
+    backend = resolveBackend(backend,distance_matrix) if not two_opt else "numpy"
+    if backend == "numba":
+        seedKernels(rng.getrandbits(32))
+        if neighbor_count:
+            kernel_neighbor_lists = distance_matrix.neighbor_lists(neighbor_count)
+            kernel_positions = positions
+        else:
+            kernel_neighbor_lists = np.empty((0, 0), dtype=np.int32)
+            kernel_positions = np.empty(0, dtype=np.int32)
+    neighborMove,candidateMove,moveDelta,polish = generate_neighbor_move,generate_neighbor_candidate_move,swapDelta,localSearch
+    move_route = individual
+    if two_opt:
+        neighborMove,candidateMove,moveDelta = generate_two_opt_move,generate_two_opt_candidate_move,twoOptMoveDelta
+        move_route = tour
+    if rng is not random:
+        neighborMove = functools.partial(neighborMove,rng=rng)
+        candidateMove = functools.partial(candidateMove,rng=rng)
+    # A level ends when accepted_limit moves are accepted, without the adaptive level length it is never reached.
+    accepted_limit = None
+    if "auto" in (Tmax, Tmin, moves_per_temperature):
+        if calibration is None:
+            calibration = Calibration()
+        deltas = []
+        for i in range(calibration.samples):
+            if neighbor_count:
+                first,second = candidateMove(individual,positions,neighbor_lists)
+            else:
+                first,second = neighborMove(individual)
+            deltas.append(moveDelta(move_route,first,second,distance_matrix))
+        Tmax,Tmin,moves_per_temperature = calibration.calibrate(deltas,len(individual),Tmax,Tmin,moves_per_temperature)
+        accepted_limit = calibration.accepted_limit
+    if accepted_limit is None:
+        accepted_limit = moves_per_temperature + 1
+    if profiler is not None:
+        neighborMove = profiler.timed("neighbor",neighborMove)
+        candidateMove = profiler.timed("neighbor",candidateMove)
+        moveDelta = profiler.timed("evaluation",moveDelta)
+        polish = profiler.timed("local_search",polish)
+    schedule = createCoolingSchedule(cooling_schedule,cooling_rate)
+    table_size = acceptanceTableSize(moves_per_temperature)
+    level = 0
+    T = schedule.start(Tmax)
+    while T > Tmin and not stopped:
+        level_first_move = total_num_of_generations
+        # The last level is cut at the evaluation budget, so the run stops at exactly max_evaluations moves.
+        level_move_count = moves_per_temperature
+        if stopping is not None and stopping.max_evaluations is not None:
+            level_move_count = max(min(level_move_count, stopping.max_evaluations - total_num_of_generations), 0)
+        if profiler is not None:
+            level_start = time.perf_counter()
+            level_moves = total_num_of_generations
+            measured_time = profiler.times.get("neighbor",0.0) + profiler.times.get("evaluation",0.0)
+        if backend == "numba":
+            # The moves of the level are done by the compiled kernel, the stopping condition is checked after the level.
+            individual_fitness,best_result,accepted_moves = annealLevelKernel(individual,kernel_positions,kernel_neighbor_lists,
+                                                                              distance_matrix.matrix,T,level_move_count,
+                                                                              individual_fitness,best_result)
+            total_num_of_generations = total_num_of_generations + level_move_count
+            if recorder is not None and total_num_of_generations % recorder.interval < level_move_count:
+                recorder.record(total_num_of_generations,T,individual_fitness,min(best_result,individual_fitness))
+        else:
+            acceptance_table,complete_table = acceptanceTable(T,table_size)
+            accepted_moves = 0
+            for i in range(level_move_count):
+                if neighbor_count:
+                    first,second = candidateMove(individual,positions,neighbor_lists)
+                else:
+                    first,second = neighborMove(individual) # Generate a random neighbor (swap move).
+                total_num_of_generations = total_num_of_generations + 1
+                delta_E = moveDelta(move_route,first,second,distance_matrix)
+                if delta_E < 0:               # Accept the neighbor solution. 
+                    accept = True
+                else:
+                    if delta_E < len(acceptance_table):
+                        probability = acceptance_table[delta_E]
+                    elif complete_table:
+                        probability = 0.0
+                    else:
+                        probability = calculate_acceptance_probability(delta_E,temperature = T)
+                    accept = rng.random() < probability # Accept if the calculated probability.
+                if accept:
+                    accepted_moves = accepted_moves + 1
+                    if individual_fitness < best_result: best_result = individual_fitness
+                    if two_opt:
+                        tour.two_opt_move(first,tour.next(first),second,tour.next(second))
+                    else:
+                        individual[[first,second]] = individual[[second,first]]
+                    individual_fitness = individual_fitness + delta_E
+                    if neighbor_count and not two_opt:
+                        positions[individual[first]] = first
+                        positions[individual[second]] = second
+                #print("Temp: ",T,"Move: ",i,"Fitness: ",individual_fitness)
+                if recorder is not None and total_num_of_generations % recorder.interval == 0:
+                    recorder.record(total_num_of_generations,T,individual_fitness,min(best_result,individual_fitness))
+                if stopping is not None and total_num_of_generations % stopping.check_interval == 0:
+                    if stopping.should_stop(total_num_of_generations,min(best_result,individual_fitness)):
+                        stopped = True
+                        break
+                if accepted_moves == accepted_limit:
+                    break
+        if stopping is not None and not stopped:
+            stopped = stopping.should_stop(total_num_of_generations,min(best_result,individual_fitness))
+        if profiler is not None:
+            level_time = time.perf_counter() - level_start
+            level_moves = total_num_of_generations - level_moves
+            if backend == "numba":
+                profiler.add_time("kernel",level_time)
+            else:
+                measured_time = profiler.times.get("neighbor",0.0) + profiler.times.get("evaluation",0.0) - measured_time
+                profiler.add_time("acceptance",level_time - measured_time,level_moves)
+            profiler.level(level,T,level_moves,accepted_moves,individual_fitness,best_result,total_num_of_generations)
+        level = level + 1
+        T = schedule.next_temperature(T,level,accepted_moves/max(total_num_of_generations-level_first_move,1))   # For Cooling Schedule.
+    # best_result is updated with the length before an accepted move, so the route after the last accepted move is only
+    # counted here, with both backends and whether the run was stopped or cooled down.
+    best_result = min(best_result, individual_fitness)
+    if two_opt:
+        individual = tour.route()
+    if local_search:
+        individual,individual_fitness = polish(individual,distance_matrix)
+        if individual_fitness < best_result: best_result = individual_fitness
+    if recorder is not None:
+        recorder.finish(total_num_of_generations,T,individual_fitness,best_result)
+    t2 = time.perf_counter()
+    running_time = t2-t1
+    if profiler is not None:
+        profiler.improvement("SA",total_num_of_generations,best_result)
+        profiler.finish("SA",total_num_of_generations,running_time)
+    if return_route:
+        return best_result,total_num_of_generations,running_time,individual
+    return best_result,total_num_of_generations,running_time
+
+
+# Batch SA: chain_count independent SA chains are run in lockstep. The routes of all chains are kept in a
+# (chain_count, N) array. In every step one swap move is drawn for every chain, the deltas of all moves are calculated
+# with one vectorized lookup and the Metropolis acceptance is done for all chains at once. All chains share the same
+# cooling schedule; the acceptance rate of a level is averaged over the chains. The random numbers are drawn from a NumPy Generator.
+
+def swapDeltaBatch(routes,first,second,distance_matrix):
+    # Vectorized swapDelta for all chains. The affected edges are the edges which start at the places first-1, first,
+    # second-1 and second. An edge that appears twice (when the swapped places are neighbors) is counted once.
+    chain_count,n = routes.shape
+    rows = np.arange(chain_count)[:, np.newaxis]
+    edges = np.stack(((first-1) % n, first, (second-1) % n, second), axis=1)
+    counted = np.ones(edges.shape, dtype=bool)
+    for k in range(1, 4):
+        counted[:, k] = (edges[:, k, np.newaxis] != edges[:, :k]).all(axis=1)
+    edge_ends = (edges+1) % n
+    def city_after_swap(places):
+        cities = routes[rows, places]
+        cities = np.where(places == first[:, np.newaxis], routes[rows, second[:, np.newaxis]], cities)
+        cities = np.where(places == second[:, np.newaxis], routes[rows, first[:, np.newaxis]], cities)
+        return cities
+    old_distances = distance_matrix.distances(routes[rows, edges], routes[rows, edge_ends])
+    new_distances = distance_matrix.distances(city_after_swap(edges), city_after_swap(edge_ends))
+    return ((new_distances.astype(np.int64) - old_distances) * counted).sum(axis=1)
+
+def generate_batch_SA(node_list,Tmax,Tmin,moves_per_temperature,cooling_rate,chain_count,distance_matrix=None,seed=None,
+                      cooling_schedule="geometric",stopping=None):
+    # stopping : Optional StoppingCondition. The evaluations are the steps of the batch (one move of every chain) and the
+    # best length is the best of all chains.
+    if distance_matrix is None:
+        distance_matrix = DistanceMatrix(node_list)
+    rng = np.random.default_rng(seed)
+    n = len(node_list)
+    total_num_of_generations = 0
+    t1 = time.perf_counter()
+    if stopping is not None:
+        stopping.start()
+    stopped = False
+    chains = np.arange(chain_count)
+    # Random initiation of all chains.
+    routes = createNodeIndices(node_list)[np.argsort(rng.random((chain_count, n)), axis=1)].astype(np.int32)
+    fitness = np.array([calculateFitness(route,distance_matrix) for route in routes], dtype=np.int64)
+    best_results = fitness.copy()
+    best_routes = routes.copy()
+    schedule = createCoolingSchedule(cooling_schedule,cooling_rate)
+    level = 0
+    T = schedule.start(Tmax)
+    while T > Tmin and not stopped:
+        accepted_moves = 0
+        level_first_move = total_num_of_generations
+        # As in generate_SA the last level is cut at the evaluation budget.
+        level_move_count = moves_per_temperature
+        if stopping is not None and stopping.max_evaluations is not None:
+            level_move_count = max(min(level_move_count, stopping.max_evaluations - total_num_of_generations), 0)
+        for i in range(level_move_count):
+            first = rng.integers(0, n, chain_count)
+            second = rng.integers(0, n, chain_count)
+            total_num_of_generations = total_num_of_generations + 1
+            delta_E = swapDeltaBatch(routes,first,second,distance_matrix)
+            # Downhill moves are always accepted, uphill moves with the probability e^(-delta_E / temperature).
+            accept = (delta_E < 0) | (rng.random(chain_count) < np.exp(-np.maximum(delta_E, 0) / T))
+            accepted = chains[accept]
+            accepted_moves = accepted_moves + len(accepted)
+            first_cities = routes[accepted, first[accept]]
+            routes[accepted, first[accept]] = routes[accepted, second[accept]]
+            routes[accepted, second[accept]] = first_cities
+            fitness[accept] = fitness[accept] + delta_E[accept]
+            improved = fitness < best_results
+            best_results[improved] = fitness[improved]
+            best_routes[improved] = routes[improved]
+            if stopping is not None and total_num_of_generations % stopping.check_interval == 0:
+                if stopping.should_stop(total_num_of_generations,best_results.min()):
+                    stopped = True
+                    break
+        if stopping is not None and not stopped:
+            stopped = stopping.should_stop(total_num_of_generations,best_results.min())
+        level = level + 1
+        level_moves = max(total_num_of_generations-level_first_move,1)
+        T = schedule.next_temperature(T,level,accepted_moves/(level_moves*chain_count))   # For Cooling Schedule.
+    t2 = time.perf_counter()
+    running_time = t2-t1
+    return best_results,best_routes,total_num_of_generations,running_time
+
+def runBatchSA(distance_matrix,Tmax,Tmin,moves_per_temperature,cooling_rate,run_count=100,seed=1,cooling_schedule="geometric",
+               stopping=None):
+    # Runs run_count restarts as the chains of one generate_batch_SA call. Returns the best result, the average result and
+    # the run time of the batch, in the same form as runParallelSA.
+    node_list = nodesFromCoordinates(distance_matrix.coordinates)
+    best_results,best_routes,total_num_of_generations,running_time = generate_batch_SA(node_list,Tmax,Tmin,
+                                                                                       moves_per_temperature,cooling_rate,
+                                                                                       run_count,distance_matrix,seed,
+                                                                                       cooling_schedule,stopping)
+    return int(best_results.min()),float(best_results.mean()),running_time
@@ -0,0 +1,51 @@
+# Stopping conditions of SA and GA in addition to their own end (Tmin for SA, generation_count for GA). Any of the limits
+# can be set, a run stops as soon as one of them is reached:
+#   time_limit       : Wall clock budget in seconds.
+#   max_evaluations  : Budget of evaluated moves (SA) or children (GA).
+#   target_length    : Stop when a tour at least this short is found. Instead of the length, the known optimum and the
+#                      allowed gap can be given: optimum=2579, target_gap=0.05 stops within 5% of the optimum.
+#   stagnation_limit : Stop when the best tour did not improve in this many evaluations.
+# The reason of the stop is kept in the reason attribute ("time", "evaluations", "target", "stagnation" or None).
+
+import time
+
+
+class StoppingCondition:
+    def __init__(self, time_limit=None, max_evaluations=None, target_length=None, optimum=None, target_gap=0.0,
+                 stagnation_limit=None, check_interval=256):
+        # check_interval : The inner loops of SA and batch SA check the conditions once every check_interval moves, so the
+        # clock is not read for every move. max_evaluations is still exact for them: their last level is cut at the budget.
+        # The GAs check after every generation, so they can go over it by the children of one generation (one OX child
+        # in generate_GA, up to offspring_count-1 in generate_generational_GA).
+        self.time_limit = time_limit
+        self.max_evaluations = max_evaluations
+        if target_length is None and optimum is not None:
+            target_length = optimum * (1 + target_gap)
+        self.target_length = target_length
+        self.stagnation_limit = stagnation_limit
+        self.check_interval = check_interval
+        self.start()
+
+    def start(self):
+        # Called at the start of every run, so a stopping condition object can be reused.
+        self.start_time = time.perf_counter()
+        self.best_length = None
+        self.last_improvement = 0
+        self.reason = None
+
+    def elapsed(self):
+        return time.perf_counter() - self.start_time
+
+    def should_stop(self, evaluations, best_length):
+        if self.best_length is None or best_length < self.best_length:
+            self.best_length = best_length
+            self.last_improvement = evaluations
+        if self.target_length is not None and best_length <= self.target_length:
+            self.reason = "target"
+        elif self.max_evaluations is not None and evaluations >= self.max_evaluations:
+            self.reason = "evaluations"
+        elif self.stagnation_limit is not None and evaluations - self.last_improvement >= self.stagnation_limit:
+            self.reason = "stagnation"
+        elif self.time_limit is not None and self.elapsed() >= self.time_limit:
+            self.reason = "time"
+        return self.reason is not None
@@ -0,0 +1,93 @@
+# Parallel tempering (replica exchange) SA: replica_count replicas are run at a fixed ladder of temperatures from Tmax
+# down to Tmin (geometric steps) instead of cooling one chain. The replicas are run in lockstep as a vectorized batch, the
+# same way as generate_batch_SA: in every step one swap move is drawn for every replica and accepted with the Metropolis
+# criterion at the temperature of the replica.
+# Every moves_per_exchange steps the neighbor replicas of the ladder try to exchange their routes. The exchange of the
+# replicas at the temperatures Ti and Tj (with the tour lengths Li and Lj) is accepted with the probability
+# min(1, e^((1/Ti - 1/Tj) * (Li - Lj))), so a good route found at a hot temperature moves down to the cold replicas.
+# The even pairs (0-1, 2-3, ...) and the odd pairs (1-2, 3-4, ...) try in turns.
+#
+# Literature reference: "Replica Monte Carlo Simulation of Spin-Glasses", R. H. Swendsen, J. S. Wang, Physical Review
+# Letters 57, 1986.
+
+import time
+import numpy as np
+
+from .acceptance import calculate_acceptance_probability
+from .distance import DistanceMatrix
+from .routes import calculateFitness, createNodeIndices
+from .sa import swapDeltaBatch
+
+def temperatureLadder(Tmax,Tmin,replica_count):
+    # Geometric ladder, the first replica is the hottest one.
+    if replica_count == 1:
+        return np.array([Tmin], dtype=float)
+    return Tmax * (Tmin / Tmax) ** (np.arange(replica_count) / (replica_count - 1))
+
+def generate_parallel_tempering(node_list,Tmax,Tmin,replica_count,exchange_count,moves_per_exchange,distance_matrix=None,
+                                seed=None,stopping=None):
+    # exchange_count : Number of exchange rounds. moves_per_exchange moves are done by every replica between two rounds.
+    # stopping : Optional StoppingCondition. The evaluations are the steps (one move of every replica).
+    # Returns the best result, the best route, the exchange acceptance rate of every neighbor pair of the ladder
+    # (replica_count-1 rates, hottest pair first), the number of steps and the running time.
+    if distance_matrix is None:
+        distance_matrix = DistanceMatrix(node_list)
+    rng = np.random.default_rng(seed)
+    n = len(node_list)
+    temperatures = temperatureLadder(Tmax,Tmin,replica_count)
+    total_num_of_generations = 0
+    t1 = time.perf_counter()
+    if stopping is not None:
+        stopping.start()
+    replicas = np.arange(replica_count)
+    # Random initiation of all replicas. routes[k] is the route of the replica at temperatures[k].
+    routes = createNodeIndices(node_list)[np.argsort(rng.random((replica_count, n)), axis=1)].astype(np.int32)
+    fitness = np.array([calculateFitness(route,distance_matrix) for route in routes], dtype=np.int64)
+    best_indice = int(fitness.argmin())
+    best_result = int(fitness[best_indice])
+    best_route = routes[best_indice].copy()
+    exchange_attempts = np.zeros(max(replica_count - 1, 0), dtype=np.int64)
+    exchange_accepts = np.zeros(max(replica_count - 1, 0), dtype=np.int64)
+    stopped = False
+    for exchange in range(exchange_count):
+        for i in range(moves_per_exchange):
+            first = rng.integers(0, n, replica_count)
+            second = rng.integers(0, n, replica_count)
+            total_num_of_generations = total_num_of_generations + 1
+            delta_E = swapDeltaBatch(routes,first,second,distance_matrix)
+            # Downhill moves are always accepted, uphill moves with the probability e^(-delta_E / temperature).
+            accept = (delta_E < 0) | (rng.random(replica_count) <
+                                      calculate_acceptance_probability(np.maximum(delta_E, 0),temperatures))
+            accepted = replicas[accept]
+            first_cities = routes[accepted, first[accept]]
+            routes[accepted, first[accept]] = routes[accepted, second[accept]]
+            routes[accepted, second[accept]] = first_cities
+            fitness[accept] = fitness[accept] + delta_E[accept]
+            if fitness.min() < best_result:
+                best_indice = int(fitness.argmin())
+                best_result = int(fitness[best_indice])
+                best_route = routes[best_indice].copy()
+            if stopping is not None and stopping.should_stop(total_num_of_generations,best_result):
+                stopped = True
+                break
+        if stopped:
+            break
+        # Exchange round: the pairs (k, k+1) with k = exchange % 2, exchange % 2 + 2, ...
+        pairs = np.arange(exchange % 2, replica_count - 1, 2)
+        hot = pairs
+        cold = pairs + 1
+        # (1/T_hot - 1/T_cold) * (L_hot - L_cold) >= 0 when the hot replica has the shorter route; the exchange is
+        # accepted then. Otherwise it is an uphill "move" of size -(...) at temperature 1.
+        exchange_delta = -(1 / temperatures[hot] - 1 / temperatures[cold]) * (fitness[hot] - fitness[cold])
+        exchanged = (exchange_delta <= 0) | (rng.random(len(pairs)) <
+                                             calculate_acceptance_probability(np.maximum(exchange_delta, 0),1))
+        exchange_attempts[pairs] = exchange_attempts[pairs] + 1
+        exchange_accepts[pairs[exchanged]] = exchange_accepts[pairs[exchanged]] + 1
+        swapped_hot = hot[exchanged]
+        swapped_cold = cold[exchanged]
+        routes[swapped_hot], routes[swapped_cold] = routes[swapped_cold], routes[swapped_hot]
+        fitness[swapped_hot], fitness[swapped_cold] = fitness[swapped_cold], fitness[swapped_hot]
+    exchange_rates = exchange_accepts / np.maximum(exchange_attempts, 1)
+    t2 = time.perf_counter()
+    running_time = t2-t1
+    return best_result,best_route,exchange_rates,total_num_of_generations,running_time
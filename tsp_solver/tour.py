@@ -0,0 +1,205 @@
+# Two-level doubly-linked list tour (Fredman, Johnson, McGeoch, Ostheimer, "Data Structures for Traveling Salesmen",
+# Journal of Algorithms 18, 1995). The tour is cut into segments of about sqrt(N) cities. A segment keeps its cities in a
+# list and has a reverse bit: when it is set, the segment is read backwards. The segments are kept in tour order.
+# Reversing a path of the tour splits the segments at the two ends of the path, reverses the order of the segments in
+# between and flips their reverse bits, so a reversal costs O(sqrt(N)) instead of O(N) for an array. The shorter one of
+# the path and the rest of the tour is reversed (both give the same cyclic tour). The splits make the segments smaller,
+# so the segments are rebuilt when there are more than twice as many as at the start.
+# Positions: position(city) is the place of the city in the tour read from the first segment, city(position) is the
+# inverse. The start positions of the segments are kept in tour order (starts), the rank of a segment in the tour is found
+# with a binary search on them. position and between are O(1), next, prev and city are O(log(sqrt(N))).
+
+import bisect
+import math
+import numpy as np
+
+
+class TwoLevelTour:
+    def __init__(self, route, segment_size=None):
+        self.n = len(route)
+        if segment_size is None:
+            segment_size = max(int(math.sqrt(self.n)), 8)
+        self.segment_size = segment_size
+        self.city_segment = np.zeros(int(max(route)) + 1 if self.n else 0, dtype=np.int64).tolist()
+        self.city_local = list(self.city_segment)
+        self.rebuild(route)
+
+    def rebuild(self, route):
+        route = np.asarray(route)
+        route_list = route.tolist()
+        self.segment_cities = [route_list[start:start+self.segment_size] for start in range(0, self.n, self.segment_size)]
+        self.segment_reversed = [False] * len(self.segment_cities)
+        self.segment_start = [0] * len(self.segment_cities)
+        self.order = list(range(len(self.segment_cities)))
+        self.starts = [0] * len(self.order)
+        self.max_segments = 2 * len(self.order) + 2
+        places = np.arange(self.n)
+        city_segment = np.zeros(len(self.city_segment), dtype=np.int64)
+        city_local = np.zeros(len(self.city_local), dtype=np.int64)
+        city_segment[route] = places // self.segment_size
+        city_local[route] = places % self.segment_size
+        self.city_segment = city_segment.tolist()
+        self.city_local = city_local.tolist()
+        self.update_starts()
+
+    def update_starts(self, ranks=None, start=0):
+        # Sets the start positions of the segments at the given consecutive ranks (all segments by default), the first
+        # one starts at start.
+        segment_cities = self.segment_cities
+        segment_start = self.segment_start
+        order = self.order
+        starts = self.starts
+        for rank in (range(len(order)) if ranks is None else ranks):
+            segment = order[rank]
+            segment_start[segment] = start
+            starts[rank] = start
+            start = start + len(segment_cities[segment])
+
+    def rank(self, segment):
+        return bisect.bisect_right(self.starts, self.segment_start[segment]) - 1
+
+    def route(self):
+        route = []
+        for segment in self.order:
+            route.extend(reversed(self.segment_cities[segment]) if self.segment_reversed[segment] else self.segment_cities[segment])
+        return np.array(route, dtype=np.int32)
+
+    def position(self, city):
+        segment = self.city_segment[city]
+        if self.segment_reversed[segment]:
+            return self.segment_start[segment] + len(self.segment_cities[segment]) - 1 - self.city_local[city]
+        return self.segment_start[segment] + self.city_local[city]
+
+    def city(self, position):
+        rank = bisect.bisect_right(self.starts, position) - 1
+        segment = self.order[rank]
+        cities = self.segment_cities[segment]
+        offset = position - self.segment_start[segment]
+        return cities[len(cities) - 1 - offset] if self.segment_reversed[segment] else cities[offset]
+
+    def first(self, segment):
+        return self.segment_cities[segment][-1] if self.segment_reversed[segment] else self.segment_cities[segment][0]
+
+    def last(self, segment):
+        return self.segment_cities[segment][0] if self.segment_reversed[segment] else self.segment_cities[segment][-1]
+
+    def next(self, city):
+        segment = self.city_segment[city]
+        local = self.city_local[city]
+        if self.segment_reversed[segment]:
+            if local > 0:
+                return self.segment_cities[segment][local-1]
+        elif local + 1 < len(self.segment_cities[segment]):
+            return self.segment_cities[segment][local+1]
+        return self.first(self.order[(self.rank(segment)+1) % len(self.order)])
+
+    def prev(self, city):
+        segment = self.city_segment[city]
+        local = self.city_local[city]
+        if self.segment_reversed[segment]:
+            if local + 1 < len(self.segment_cities[segment]):
+                return self.segment_cities[segment][local+1]
+        elif local > 0:
+            return self.segment_cities[segment][local-1]
+        return self.last(self.order[self.rank(segment)-1])
+
+    def between(self, a, b, c):
+        # True if b is on the path from a forward to c (a and c included).
+        return (self.position(b) - self.position(a)) % self.n <= (self.position(c) - self.position(a)) % self.n
+
+    def split(self, position):
+        # Makes position the start of a segment.
+        rank = bisect.bisect_right(self.starts, position) - 1
+        segment = self.order[rank]
+        offset = position - self.segment_start[segment]
+        if offset == 0:
+            return
+        cities = self.segment_cities[segment]
+        reversed_segment = self.segment_reversed[segment]
+        # The cities which keep their local indices stay in the segment, the others are moved to a new segment.
+        if reversed_segment:
+            kept, moved = cities[:len(cities)-offset], cities[len(cities)-offset:]
+        else:
+            kept, moved = cities[:offset], cities[offset:]
+        new_segment = len(self.segment_cities)
+        self.segment_cities[segment] = kept
+        self.segment_cities.append(moved)
+        self.segment_reversed.append(reversed_segment)
+        for local,city in enumerate(moved):
+            self.city_segment[city] = new_segment
+            self.city_local[city] = local
+        # Read forwards the moved cities come after the kept ones, read backwards before them.
+        start = self.segment_start[segment]
+        if reversed_segment:
+            self.order.insert(rank, new_segment)
+            self.segment_start.append(start)
+            self.segment_start[segment] = position
+        else:
+            self.order.insert(rank + 1, new_segment)
+            self.segment_start.append(position)
+        self.starts.insert(rank + 1, position)
+
+    def reverse(self, start_position, end_position):
+        # Reverses the cyclic path from start_position to end_position (both included).
+        n = self.n
+        length = (end_position - start_position) % n + 1
+        if 2 * length > n:
+            start_position, end_position = (end_position + 1) % n, (start_position - 1) % n
+            length = n - length
+        if length < 2:
+            return
+        self.split(start_position)
+        self.split((end_position + 1) % n)
+        first_rank = bisect.bisect_right(self.starts, start_position) - 1
+        end_rank = bisect.bisect_right(self.starts, (end_position + 1) % n) - 1
+        if first_rank < end_rank:
+            ranks = range(first_rank, end_rank)
+        else:
+            ranks = list(range(first_rank, len(self.order))) + list(range(end_rank))
+        segments = [self.order[rank] for rank in ranks]
+        for rank,segment in zip(ranks, reversed(segments)):
+            self.order[rank] = segment
+            self.segment_reversed[segment] = not self.segment_reversed[segment]
+        if len(self.order) > self.max_segments:
+            self.rebuild(self.route())
+        elif first_rank < end_rank:
+            # The path has the same length after the reversal, only the segments in it get new start positions.
+            self.update_starts(ranks,start_position)
+        else:
+            # The path goes over the first position, the segments which come after it get new start positions too.
+            self.update_starts()
+
+    def reverse_path(self, first, last):
+        # Reverses the path from the city first forward to the city last.
+        self.reverse(self.position(first), self.position(last))
+
+    def two_opt_move(self, a, b, c, d):
+        # Replaces the edges (a,b) and (c,d) with (a,c) and (b,d). b and d are the successors of a and c, or (when the
+        # tour was reversed by an earlier move) both are the predecessors.
+        if a == c or b == c or a == d:
+            return
+        if self.next(a) == b:
+            self.reverse_path(b, c)
+        else:
+            self.reverse_path(a, d)
+
+    def move_segment(self, segment_position, segment_length, target, reverse):
+        # Or-opt move: The path of segment_length cities starting at segment_position is moved between target and its
+        # successor (reversed if reverse is True). Done with three 2-opt moves: the path from the segment to target is
+        # reversed, which puts the reversed segment after target, then the path between them is reversed back and, if
+        # needed, the segment itself.
+        first = self.city(segment_position)
+        last = self.city((segment_position + segment_length - 1) % self.n)
+        before = self.prev(first)
+        after = self.next(last)
+        target_next = self.next(target)
+        if target_next == before:
+            # target, before, segment: before and the segment change places.
+            self.two_opt_move(target, before, last, after)
+            if not reverse:
+                self.two_opt_move(target, last, first, before)
+            return
+        self.two_opt_move(before, first, target, target_next)
+        self.two_opt_move(before, target, after, last)
+        if not reverse:
+            self.two_opt_move(target, last, first, target_next)